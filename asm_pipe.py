@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ASMPipe em Python - Buffer Circular de E/S
+Contraparte de asmpipe.asm (pipe_buffer, read_ptr, write_ptr, data_count)
+com cópias em bloco: cada escrita ou leitura faz no máximo duas cópias de
+fatia, uma de cada lado da volta do buffer. SharedPipe compartilha o mesmo
+buffer entre um processo produtor e um consumidor, sem locks
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+from dma_memory import PhysicalMemory
+
+# Mesmo tamanho de BUFFER_SIZE em asmpipe.asm
+BUFFER_SIZE = 256
+
+
+class ASMPipe:
+    """Buffer circular com a semântica de pipe_write/pipe_read
+
+    - write com o pipe cheio retorna -1 (como .buffer_full); com espaço
+      parcial, escreve apenas o que cabe e retorna a quantidade escrita
+    - readinto com o pipe vazio retorna 0 (como .buffer_empty); senão lê
+      até o tamanho do destino e retorna a quantidade lida
+
+    A capacidade deve ser potência de dois para que a volta dos ponteiros
+    seja uma máscara de bits.
+    """
+
+    def __init__(self, capacity: int = BUFFER_SIZE):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("A capacidade deve ser uma potência de dois")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self.read_ptr = 0
+        self.write_ptr = 0
+        self.data_count = 0
+
+    def write(self, data) -> int:
+        """Escreve `data` (qualquer objeto com buffer protocol) no pipe"""
+        count = self.data_count
+        if count >= self.capacity:
+            return -1  # Pipe cheio
+        source = memoryview(data).cast("B")
+        size = min(len(source), self.capacity - count)
+
+        start = self.write_ptr
+        first = min(size, self.capacity - start)
+        view = self._view
+        view[start : start + first] = source[:first]
+        if size > first:
+            view[: size - first] = source[first:size]
+
+        self.write_ptr = (start + size) & self._mask
+        self.data_count = count + size
+        return size
+
+    def readinto(self, buffer) -> int:
+        """Lê para `buffer` (memoryview, bytearray, ...) sem cópias extras"""
+        count = self.data_count
+        if count == 0:
+            return 0  # Pipe vazio
+        destination = memoryview(buffer).cast("B")
+        size = min(len(destination), count)
+
+        start = self.read_ptr
+        first = min(size, self.capacity - start)
+        view = self._view
+        destination[:first] = view[start : start + first]
+        if size > first:
+            destination[first:size] = view[: size - first]
+
+        self.read_ptr = (start + size) & self._mask
+        self.data_count = count - size
+        return size
+
+    def read(self, size: Optional[int] = None) -> bytes:
+        """Lê até `size` bytes (todos os disponíveis se omitido)"""
+        if size is None or size > self.data_count:
+            size = self.data_count
+        data = bytearray(size)
+        self.readinto(data)
+        return bytes(data)
+
+    def fill_from(self, memory: PhysicalMemory, address: int, length: int) -> int:
+        """Escreve no pipe uma região da memória simulada (origem de DMA)"""
+        return self.write(memory.read(address, length))
+
+    def drain_to(
+        self, memory: PhysicalMemory, address: int, length: Optional[int] = None
+    ) -> int:
+        """Lê do pipe diretamente para a memória simulada (destino de DMA)"""
+        if length is None:
+            length = self.data_count
+        return self.readinto(memory.read(address, length))
+
+    def clear(self):
+        """Descarta os dados e reinicia os ponteiros"""
+        self.read_ptr = 0
+        self.write_ptr = 0
+        self.data_count = 0
+
+    @property
+    def free_space(self) -> int:
+        """Bytes que ainda cabem no pipe"""
+        return self.capacity - self.data_count
+
+    def is_empty(self) -> bool:
+        """Verifica se o pipe está vazio"""
+        return self.data_count == 0
+
+    def is_full(self) -> bool:
+        """Verifica se o pipe está cheio"""
+        return self.data_count >= self.capacity
+
+    def __len__(self) -> int:
+        return self.data_count
+
+
+# Layout do segmento compartilhado: cada índice em sua própria linha de cache
+_CACHE_LINE = 64
+_HEAD_SLOT = 0  # Total de bytes escritos (só o produtor altera)
+_TAIL_SLOT = _CACHE_LINE // 8  # Total de bytes lidos (só o consumidor altera)
+_CAPACITY_SLOT = 2 * _CACHE_LINE // 8
+_HEADER_SIZE = 3 * _CACHE_LINE
+
+
+class SharedPipe:
+    """Buffer circular SPSC em multiprocessing.shared_memory
+
+    Os índices de escrita (head) e de leitura (tail) ficam no próprio
+    segmento como contadores de 64 bits que só crescem: o produtor altera
+    apenas head e o consumidor apenas tail, então nenhum lado precisa de
+    lock. data_count é head - tail e os ponteiros de asmpipe.asm são os
+    contadores mascarados pela capacidade. Cada índice é publicado com uma
+    única escrita alinhada de 8 bytes, depois da cópia dos dados.
+
+    A semântica de cheio/vazio é a mesma de ASMPipe. O processo que cria o
+    pipe chama unlink() no fim; os demais usam attach() e close().
+    """
+
+    def __init__(self, capacity: int = BUFFER_SIZE, name: Optional[str] = None):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("A capacidade deve ser uma potência de dois")
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_HEADER_SIZE + capacity
+        )
+        self._map(capacity)
+        self._indices[_HEAD_SLOT] = 0
+        self._indices[_TAIL_SLOT] = 0
+        self._indices[_CAPACITY_SLOT] = capacity
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedPipe":
+        """Conecta a um pipe criado por outro processo"""
+        pipe = cls.__new__(cls)
+        pipe._shm = shared_memory.SharedMemory(name=name)
+        capacity = pipe._shm.buf[:_HEADER_SIZE].cast("Q")[_CAPACITY_SLOT]
+        pipe._map(capacity)
+        return pipe
+
+    def _map(self, capacity: int):
+        self.capacity = capacity
+        self._mask = capacity - 1
+        buffer = self._shm.buf
+        self._indices = buffer[:_HEADER_SIZE].cast("Q")
+        self._view = buffer[_HEADER_SIZE : _HEADER_SIZE + capacity]
+
+    @property
+    def name(self) -> str:
+        """Nome do segmento, usado por attach() no outro processo"""
+        return self._shm.name
+
+    def __reduce__(self):
+        # Enviado a outro processo, o pipe é reaberto pelo nome
+        return (SharedPipe.attach, (self.name,))
+
+    def write(self, data) -> int:
+        """Escreve `data` no pipe (apenas no processo produtor)"""
+        indices = self._indices
+        head = indices[_HEAD_SLOT]
+        count = head - indices[_TAIL_SLOT]
+        if count >= self.capacity:
+            return -1  # Pipe cheio
+        source = memoryview(data).cast("B")
+        size = min(len(source), self.capacity - count)
+
+        start = head & self._mask
+        first = min(size, self.capacity - start)
+        view = self._view
+        view[start : start + first] = source[:first]
+        if size > first:
+            view[: size - first] = source[first:size]
+
+        indices[_HEAD_SLOT] = head + size  # Publica os dados ao consumidor
+        return size
+
+    def readinto(self, buffer) -> int:
+        """Lê para `buffer` (apenas no processo consumidor)"""
+        indices = self._indices
+        tail = indices[_TAIL_SLOT]
+        count = indices[_HEAD_SLOT] - tail
+        if count == 0:
+            return 0  # Pipe vazio
+        destination = memoryview(buffer).cast("B")
+        size = min(len(destination), count)
+
+        start = tail & self._mask
+        first = min(size, self.capacity - start)
+        view = self._view
+        destination[:first] = view[start : start + first]
+        if size > first:
+            destination[first:size] = view[: size - first]
+
+        indices[_TAIL_SLOT] = tail + size  # Libera o espaço ao produtor
+        return size
+
+    @property
+    def data_count(self) -> int:
+        """Bytes disponíveis para leitura"""
+        return self._indices[_HEAD_SLOT] - self._indices[_TAIL_SLOT]
+
+    @property
+    def read_ptr(self) -> int:
+        """Posição de leitura no buffer (como read_ptr de asmpipe.asm)"""
+        return self._indices[_TAIL_SLOT] & self._mask
+
+    @property
+    def write_ptr(self) -> int:
+        """Posição de escrita no buffer (como write_ptr de asmpipe.asm)"""
+        return self._indices[_HEAD_SLOT] & self._mask
+
+    @property
+    def free_space(self) -> int:
+        """Bytes que ainda cabem no pipe"""
+        return self.capacity - self.data_count
+
+    def is_empty(self) -> bool:
+        """Verifica se o pipe está vazio"""
+        return self.data_count == 0
+
+    def is_full(self) -> bool:
+        """Verifica se o pipe está cheio"""
+        return self.data_count >= self.capacity
+
+    def __len__(self) -> int:
+        return self.data_count
+
+    def close(self):
+        """Libera as visões e desconecta deste processo"""
+        self._view.release()
+        self._indices.release()
+        self._shm.close()
+
+    def unlink(self):
+        """Remove o segmento (no processo que criou o pipe)"""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedPipe":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Espera ativa educada: em máquinas com poucos núcleos, girar sem ceder a
+# CPU impede o outro lado de avançar
+_yield_cpu = getattr(os, "sched_yield", lambda: time.sleep(0))
+
+
+def _consume(pipe: SharedPipe, total: int, chunk_size: int, verify: bool, result):
+    """Consumidor do teste de vazão: lê `total` bytes do pipe"""
+    buffer = memoryview(bytearray(chunk_size))
+    received = 0
+    checksum = 0
+    while received < total:
+        size = pipe.readinto(buffer[: min(chunk_size, total - received)])
+        if size:
+            received += size
+            if verify:
+                checksum = zlib.crc32(buffer[:size], checksum)
+        else:
+            _yield_cpu()  # Pipe vazio: cede a CPU ao produtor
+    result.value = checksum
+    pipe.close()
+
+
+def measure_throughput(
+    total_bytes: int = 1 << 30,
+    chunk_size: int = 1 << 20,
+    capacity: int = 1 << 22,
+    verify: bool = False,
+) -> Dict[str, float]:
+    """Mede a vazão de um produtor para um consumidor em outro processo
+
+    O produtor (este processo) escreve blocos de `chunk_size` bytes até
+    completar `total_bytes`; o tempo vai do início da escrita até o
+    consumidor terminar de ler. Com `verify`, os dois lados calculam o CRC32
+    do fluxo (o que reduz a vazão medida). Levanta RuntimeError se o
+    consumidor terminar antes de ler tudo.
+    """
+    pipe = SharedPipe(capacity)
+    result = multiprocessing.Value("Q", 0, lock=False)
+    consumer = multiprocessing.Process(
+        target=_consume, args=(pipe, total_bytes, chunk_size, verify, result)
+    )
+    consumer.start()
+    data = memoryview(bytes(range(256)) * (chunk_size // 256 + 1))[:chunk_size]
+    checksum = 0
+    try:
+        start = time.perf_counter()
+        sent = 0
+        while sent < total_bytes:
+            size = pipe.write(data[: min(chunk_size, total_bytes - sent)])
+            if size > 0:
+                sent += size
+                if verify:
+                    checksum = zlib.crc32(data[:size], checksum)
+            elif not consumer.is_alive():
+                raise RuntimeError(
+                    f"O consumidor terminou antes do fim (código {consumer.exitcode})"
+                )
+            else:
+                _yield_cpu()  # Pipe cheio: cede a CPU ao consumidor
+        consumer.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if consumer.is_alive():
+            consumer.terminate()
+        pipe.close()
+        pipe.unlink()
+
+    return {
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "gb_per_second": total_bytes / elapsed / 1e9 if elapsed > 0 else 0.0,
+        "verified": consumer.exitcode == 0 and result.value == checksum,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando: vazão entre processos"""
+    parser = argparse.ArgumentParser(description="Vazão do SharedPipe")
+    parser.add_argument("--megabytes", type=int, default=1024)
+    parser.add_argument("--chunk-kb", type=int, default=1024)
+    parser.add_argument("--capacity-kb", type=int, default=4096)
+    parser.add_argument("--verify", action="store_true", help="confere o CRC32")
+    args = parser.parse_args(argv)
+
+    report = measure_throughput(
+        args.megabytes << 20, args.chunk_kb << 10, args.capacity_kb << 10, args.verify
+    )
+    print(
+        f"{report['bytes'] / (1 << 20):,.0f} MiB em {report['seconds']:.3f} s: "
+        f"{report['gb_per_second']:.2f} GB/s"
+    )
+    if args.verify:
+        print("Fluxo verificado" if report["verified"] else "FALHA NA VERIFICAÇÃO")
+    return 0 if report["verified"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Executor dos Binários Assembly - bin/asmpipe e bin/asmpipe_dma
+Lança várias execuções em paralelo, lê a saída de cada processo em fluxo
+contínuo e a converte em resultados estruturados, agregando os tempos de
+centenas de execuções
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from bus_metrics import LogLinearHistogram
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BINARIES = {
+    "asmpipe": os.path.join(BASE_DIR, "bin", "asmpipe"),
+    "asmpipe_dma": os.path.join(BASE_DIR, "bin", "asmpipe_dma"),
+}
+
+READ_CHUNK = 65536
+DEFAULT_TIMEOUT = 10.0
+
+# Os binários gravam as mensagens com comprimentos fixos, às vezes menores
+# que o texto (e sem a quebra de linha), então várias mensagens podem sair
+# na mesma linha: os eventos são contados por prefixo em qualquer posição
+EVENT_PATTERNS = {
+    "transfers_started": re.compile("Transferência DMA iniciada"),
+    "transfers_completed": re.compile("Transferência DMA complet"),
+    "bus_grants": re.compile("Barramento concedido"),
+    "bus_conflicts": re.compile("Conflito de barramento"),
+    "arbitrations": re.compile("Arbitragem de barramento"),
+    "bursts": re.compile("Iniciando transferência burst"),
+    "errors": re.compile("ERRO:"),
+}
+# print_number ainda não converte para ASCII: o número pode estar ausente
+PIO_CYCLES = re.compile(r"Teste E/S Programada:\s*(\d+)?\s*ciclos")
+DMA_CYCLES = re.compile(r"Teste DMA:\s*(\d+)?\s*ciclos")
+WINNERS = (
+    ("dma", re.compile("DMA é mais eficiente")),
+    ("pio", re.compile("E/S Programada é mais eficiente")),
+)
+PIPE_DATA = re.compile(r"Dados: ([^\x00\n]*)")
+
+
+class AsmRunResult(NamedTuple):
+    """Resultado de uma execução de um binário Assembly"""
+
+    binary: str
+    returncode: int
+    wall_time_ns: int
+    output_bytes: int
+    events: Dict[str, int]
+    pio_cycles: Optional[int]
+    dma_cycles: Optional[int]
+    winner: Optional[str]
+    pipe_data: Optional[str]
+
+
+class OutputParser:
+    """Interpreta a saída dos binários em fluxo, linha a linha
+
+    `feed` recebe blocos de bytes na ordem em que o processo os grava; as
+    linhas incompletas ficam no buffer até a próxima quebra de linha ou até
+    `close`. Bytes nulos e UTF-8 truncado são tolerados.
+    """
+
+    def __init__(self):
+        self.events = {name: 0 for name in EVENT_PATTERNS}
+        self.pio_cycles: Optional[int] = None
+        self.dma_cycles: Optional[int] = None
+        self.winner: Optional[str] = None
+        self.pipe_data: Optional[str] = None
+        self.output_bytes = 0
+        self._pending = b""
+
+    def feed(self, data: bytes):
+        """Processa um bloco de saída"""
+        self.output_bytes += len(data)
+        lines = (self._pending + data).split(b"\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._parse_line(line.decode("utf-8", errors="replace"))
+
+    def close(self):
+        """Processa o restante do buffer (saída sem quebra de linha final)"""
+        if self._pending:
+            self._parse_line(self._pending.decode("utf-8", errors="replace"))
+            self._pending = b""
+
+    def _parse_line(self, line: str):
+        events = self.events
+        for name, pattern in EVENT_PATTERNS.items():
+            events[name] += len(pattern.findall(line))
+        match = PIO_CYCLES.search(line)
+        if match and match.group(1):
+            self.pio_cycles = int(match.group(1))
+        match = DMA_CYCLES.search(line)
+        if match and match.group(1):
+            self.dma_cycles = int(match.group(1))
+        for winner, pattern in WINNERS:
+            if pattern.search(line):
+                self.winner = winner
+        match = PIPE_DATA.search(line)
+        if match:
+            self.pipe_data = match.group(1)
+
+    def result(self, binary: str, returncode: int, wall_time_ns: int) -> AsmRunResult:
+        """Monta o resultado estruturado da execução"""
+        return AsmRunResult(
+            binary,
+            returncode,
+            wall_time_ns,
+            self.output_bytes,
+            dict(self.events),
+            self.pio_cycles,
+            self.dma_cycles,
+            self.winner,
+            self.pipe_data,
+        )
+
+
+def available_binaries(names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Binários existentes e executáveis (os ausentes são ignorados)"""
+    names = BINARIES if names is None else names
+    return {
+        name: BINARIES.get(name, name)
+        for name in names
+        if os.access(BINARIES.get(name, name), os.X_OK)
+    }
+
+
+def run_binary(
+    name: str, path: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT
+) -> AsmRunResult:
+    """Executa um binário uma vez e interpreta a saída enquanto ela chega
+
+    Execuções que excedem `timeout` segundos são encerradas e retornam o
+    código de saída do sinal (negativo).
+    """
+    path = path or BINARIES[name]
+    parser = OutputParser()
+    start = time.perf_counter_ns()
+    with subprocess.Popen(
+        [path], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, cwd=BASE_DIR
+    ) as process:
+        # A leitura bloqueia: o temporizador encerra um processo travado
+        watchdog = threading.Timer(timeout, process.kill)
+        watchdog.start()
+        try:
+            read = process.stdout.read1
+            for data in iter(lambda: read(READ_CHUNK), b""):
+                parser.feed(data)
+            returncode = process.wait()
+        finally:
+            watchdog.cancel()
+    wall_time_ns = time.perf_counter_ns() - start
+    parser.close()
+    return parser.result(name, returncode, wall_time_ns)
+
+
+def run_many(
+    runs: int,
+    names: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Dict[str, object]:
+    """Executa cada binário disponível `runs` vezes em um pool de processos
+
+    Cada thread do pool apenas espera o seu processo filho, então as
+    execuções avançam em paralelo. Binários ausentes aparecem em "skipped"
+    e não interrompem os demais.
+    """
+    names = list(BINARIES if names is None else names)
+    binaries = available_binaries(names)
+    skipped = [name for name in names if name not in binaries]
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+
+    wall_start = time.perf_counter()
+    jobs = [(name, path) for name, path in binaries.items() for _ in range(runs)]
+    results: List[AsmRunResult] = []
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(run_binary, name, path, timeout) for name, path in jobs
+            ]
+            results = [future.result() for future in futures]
+
+    return {
+        "runs": runs,
+        "skipped": skipped,
+        "binaries": aggregate_results(results),
+        "wall_time": time.perf_counter() - wall_start,
+    }
+
+
+def aggregate_results(results: Iterable[AsmRunResult]) -> Dict[str, Dict]:
+    """Agrega as execuções por binário: tempos, falhas, eventos e ciclos"""
+    groups: Dict[str, List[AsmRunResult]] = {}
+    for result in results:
+        groups.setdefault(result.binary, []).append(result)
+
+    summary = {}
+    for name, group in groups.items():
+        histogram = LogLinearHistogram()
+        events = {event: 0 for event in EVENT_PATTERNS}
+        winners: Dict[str, int] = {}
+        for result in group:
+            histogram.record(result.wall_time_ns)
+            for event, count in result.events.items():
+                events[event] += count
+            if result.winner:
+                winners[result.winner] = winners.get(result.winner, 0) + 1
+        pio = [r.pio_cycles for r in group if r.pio_cycles is not None]
+        dma = [r.dma_cycles for r in group if r.dma_cycles is not None]
+        summary[name] = {
+            "runs": len(group),
+            "failures": sum(1 for result in group if result.returncode != 0),
+            "wall_time_ns": histogram.snapshot(),
+            "events": events,
+            "winners": winners,
+            "pio_cycles": sum(pio) / len(pio) if pio else None,
+            "dma_cycles": sum(dma) / len(dma) if dma else None,
+            "output_bytes": sum(result.output_bytes for result in group),
+        }
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando"""
+    parser = argparse.ArgumentParser(description="Execuções dos binários Assembly")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument(
+        "--binary", action="append", choices=sorted(BINARIES), dest="binaries"
+    )
+    args = parser.parse_args(argv)
+
+    report = run_many(
+        args.runs, args.binaries, max_workers=args.workers, timeout=args.timeout
+    )
+    for name in report["skipped"]:
+        print(f"{name}: binário não encontrado (execute make all)")
+    for name, summary in report["binaries"].items():
+        times = summary["wall_time_ns"]
+        print(f"{name}: {summary['runs']} execuções, {summary['failures']} falhas")
+        print(
+            f"  tempo p50 {times['p50'] / 1e6:.2f} ms  p99 {times['p99'] / 1e6:.2f} ms"
+            f"  máx {times['max'] / 1e6:.2f} ms"
+        )
+        events = ", ".join(f"{k}={v}" for k, v in summary["events"].items() if v)
+        if events:
+            print(f"  eventos: {events}")
+        for label, key in (("E/S programada", "pio_cycles"), ("DMA", "dma_cycles")):
+            if summary[key] is not None:
+                print(f"  ciclos {label}: {summary[key]:.0f}")
+    print(f"Tempo total: {report['wall_time']:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
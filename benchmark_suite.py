@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite de Benchmarks - Caminhos Críticos do DMA e do Barramento
+Mede vazão, latência (p50/p99) e pico de memória de request_bus,
+release_bus, setup_channel/start_transfer e das políticas de arbitragem,
+salvando os resultados em JSON para comparação entre commits
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Callable, Dict, List, Optional
+
+from bus_controller import ARBITRATION_POLICIES, BusController, BusPriority
+from dma_simulator import DMAController
+from simulation_clock import SimulationClock
+
+SIZE_DISTRIBUTIONS = ("uniform", "small", "large", "bimodal")
+
+
+def draw_sizes(distribution: str, count: int, rng: random.Random) -> List[int]:
+    """Gera `count` tamanhos de transferência segundo a distribuição"""
+    if distribution == "uniform":
+        return [rng.randint(64, 4096) for _ in range(count)]
+    if distribution == "small":
+        return [rng.randint(16, 256) for _ in range(count)]
+    if distribution == "large":
+        return [rng.randint(16384, 65536) for _ in range(count)]
+    if distribution == "bimodal":
+        return [64 if rng.random() < 0.9 else 65536 for _ in range(count)]
+    raise ValueError(f"Distribuição de tamanhos desconhecida: {distribution}")
+
+
+def percentile(sorted_values, fraction: float) -> int:
+    """Percentil por posição em uma sequência já ordenada"""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def bench_bus(params: Dict) -> Dict[str, array]:
+    """request_bus com o barramento saturado e release_bus até esvaziar"""
+    rng = random.Random(params["seed"])
+    count = params["requests"]
+    priorities = list(BusPriority)
+    request_priorities = [rng.choice(priorities) for _ in range(count)]
+    sizes = draw_sizes(params["sizes"], count, rng)
+    bus = BusController(
+        params["max_concurrent"], policy=ARBITRATION_POLICIES[params["policy"]]()
+    )
+    clock = time.perf_counter_ns
+    request_latency = array("Q")
+    release_latency = array("Q")
+
+    for requester_id in range(count):
+        start = clock()
+        bus.request_bus(
+            requester_id, request_priorities[requester_id], sizes[requester_id]
+        )
+        request_latency.append(clock() - start)
+
+    while len(bus.active_transfers):
+        requester_id = next(iter(bus.active_transfers)).requester_id
+        start = clock()
+        bus.release_bus(requester_id)
+        release_latency.append(clock() - start)
+
+    return {"request_bus": request_latency, "release_bus": release_latency}
+
+
+def bench_dma(params: Dict) -> Dict[str, array]:
+    """setup_channel/start_transfer em tempo virtual (sem time.sleep)"""
+    rng = random.Random(params["seed"])
+    count = params["requests"]
+    sizes = draw_sizes(params["sizes"], count, rng)
+    sim_clock = SimulationClock()
+    dma = DMAController(params["channels"], clock=sim_clock)
+    dma.initialize()
+    num_channels = params["channels"]
+    clock = time.perf_counter_ns
+    setup_latency = array("Q")
+    start_latency = array("Q")
+
+    for i in range(count):
+        channel_id = i % num_channels
+        if channel_id == 0:
+            sim_clock.run()  # Conclui a rodada anterior fora da medição
+        start = clock()
+        dma.setup_channel(channel_id, i * 64, (i + count) * 64, sizes[i])
+        setup_latency.append(clock() - start)
+        start = clock()
+        dma.start_transfer(channel_id)
+        start_latency.append(clock() - start)
+    sim_clock.run()
+
+    return {"setup_channel": setup_latency, "start_transfer": start_latency}
+
+
+def bench_policy(params: Dict) -> Dict[str, array]:
+    """push/pop diretos na estrutura de cada política de arbitragem"""
+    from bus_controller import BusRequest
+
+    rng = random.Random(params["seed"])
+    count = params["requests"]
+    priorities = list(BusPriority)
+    sizes = draw_sizes(params["sizes"], count, rng)
+    requests = [
+        BusRequest(rng.randrange(64), rng.choice(priorities), sizes[i], float(i))
+        for i in range(count)
+    ]
+    policy = ARBITRATION_POLICIES[params["policy"]]()
+    clock = time.perf_counter_ns
+    push_latency = array("Q")
+    pop_latency = array("Q")
+
+    for request in requests:
+        start = clock()
+        policy.push(request)
+        push_latency.append(clock() - start)
+    for _ in range(count):
+        start = clock()
+        policy.pop()
+        pop_latency.append(clock() - start)
+
+    return {"push": push_latency, "pop": pop_latency}
+
+
+def bench_pending(params: Dict) -> Dict[str, array]:
+    """Fila cheia: request_bus pendente e troca liberação + nova solicitação
+
+    O pico de memória dividido por `requests` aproxima o custo de cada
+    solicitação pendente; com `pool` as solicitações liberadas são
+    recicladas por BusRequestPool.
+    """
+    from bus_controller import BusRequestPool
+
+    rng = random.Random(params["seed"])
+    count = params["requests"]
+    priorities = [rng.choice(list(BusPriority)) for _ in range(count)]
+    bus = BusController(
+        1,
+        clock=SimulationClock(),
+        policy=ARBITRATION_POLICIES[params["policy"]](),
+        request_pool=BusRequestPool() if params["pool"] else None,
+    )
+    clock = time.perf_counter_ns
+    request_latency = array("Q")
+    churn_latency = array("Q")
+
+    for i in range(count):
+        start = clock()
+        bus.request_bus(i % 64, priorities[i], 64)
+        request_latency.append(clock() - start)
+    # Regime permanente: cada liberação concede a próxima e entra uma nova
+    for i in range(count):
+        start = clock()
+        bus.release_request(next(iter(bus.active_transfers)))
+        bus.request_bus(i % 64, priorities[i], 64)
+        churn_latency.append(clock() - start)
+    while len(bus.active_transfers):
+        bus.release_request(next(iter(bus.active_transfers)))
+
+    return {"request_bus": request_latency, "churn": churn_latency}
+
+
+BENCHMARKS: Dict[str, Callable[[Dict], Dict[str, array]]] = {
+    "bus": bench_bus,
+    "dma": bench_dma,
+    "policy": bench_policy,
+    "pending": bench_pending,
+}
+
+# Parâmetros relevantes para cada benchmark (os demais são ignorados)
+BENCHMARK_PARAMS = {
+    "bus": ("policy", "max_concurrent", "requests", "sizes", "seed"),
+    "dma": ("channels", "requests", "sizes", "seed"),
+    "policy": ("policy", "requests", "sizes", "seed"),
+    "pending": ("policy", "requests", "pool", "seed"),
+}
+
+# Valores usados quando a grade não traz o eixo
+PARAM_DEFAULTS = {"pool": False}
+
+
+def run_case(name: str, params: Dict, repetitions: int, warmup: int) -> List[Dict]:
+    """Executa um caso com aquecimento e repetições; um resultado por operação"""
+    benchmark = BENCHMARKS[name]
+    for _ in range(warmup):
+        benchmark(params)
+
+    # Como no timeit, o coletor de lixo fica desligado durante a medição
+    merged: Dict[str, array] = {}
+    for _ in range(repetitions):
+        gc.collect()
+        gc.disable()
+        try:
+            measured = benchmark(params)
+        finally:
+            gc.enable()
+        for operation, latencies in measured.items():
+            merged.setdefault(operation, array("Q")).extend(latencies)
+
+    # Pico de memória em uma execução separada (tracemalloc distorce tempos)
+    tracemalloc.start()
+    benchmark(params)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = []
+    for operation, latencies in merged.items():
+        ordered = sorted(latencies)
+        total_ns = sum(ordered)
+        results.append(
+            {
+                "benchmark": name,
+                "operation": operation,
+                "params": params,
+                "operations": len(ordered),
+                "ops_per_sec": len(ordered) * 1e9 / total_ns if total_ns else 0.0,
+                "latency_ns": {
+                    "mean": total_ns / len(ordered) if ordered else 0,
+                    "p50": percentile(ordered, 0.50),
+                    "p99": percentile(ordered, 0.99),
+                    "max": ordered[-1] if ordered else 0,
+                },
+                "peak_memory_bytes": peak_memory,
+                "peak_memory_per_request": peak_memory / params["requests"],
+            }
+        )
+    return results
+
+
+def expand_grid(name: str, grid: Dict[str, list]) -> List[Dict]:
+    """Produto cartesiano dos eixos relevantes para o benchmark"""
+    keys = BENCHMARK_PARAMS[name]
+    unique = []
+    axes = [grid.get(key, [PARAM_DEFAULTS.get(key)]) for key in keys]
+    for values in itertools.product(*axes):
+        params = dict(zip(keys, values))
+        if params not in unique:
+            unique.append(params)
+    return unique
+
+
+def run_suite(
+    grid: Dict[str, list],
+    benchmarks=tuple(BENCHMARKS),
+    repetitions: int = 5,
+    warmup: int = 1,
+) -> Dict:
+    """Executa todos os casos da grade e retorna o documento de resultados"""
+    results = []
+    for name in benchmarks:
+        for params in expand_grid(name, grid):
+            results.extend(run_case(name, params, repetitions, warmup))
+    return {"metadata": _metadata(repetitions, warmup), "results": results}
+
+
+def _metadata(repetitions: int, warmup: int) -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repetitions": repetitions,
+        "warmup": warmup,
+    }
+
+
+def _result_key(result: Dict) -> str:
+    return json.dumps(
+        [result["benchmark"], result["operation"], result["params"]], sort_keys=True
+    )
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float = 0.10
+) -> List[Dict]:
+    """Compara ops/s com um arquivo anterior e aponta regressões"""
+    previous = {_result_key(result): result for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        old = previous.get(_result_key(result))
+        if old is None or not old["ops_per_sec"]:
+            continue
+        ratio = result["ops_per_sec"] / old["ops_per_sec"]
+        comparisons.append(
+            {
+                "benchmark": result["benchmark"],
+                "operation": result["operation"],
+                "params": result["params"],
+                "ratio": ratio,
+                "regression": ratio < 1 - threshold,
+            }
+        )
+    return comparisons
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmarks do simulador DMA")
+    parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS))
+    parser.add_argument("--channels", nargs="+", type=int, default=[4, 64])
+    parser.add_argument("--requests", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--sizes", nargs="+", default=["uniform"])
+    parser.add_argument("--max-concurrent", nargs="+", type=int, default=[2, 8])
+    parser.add_argument(
+        "--policy", nargs="+", default=sorted(ARBITRATION_POLICIES), dest="policies"
+    )
+    parser.add_argument("--pool", nargs="+", type=int, choices=(0, 1), default=[0, 1])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="arquivo JSON para salvar os resultados")
+    parser.add_argument("--compare", help="arquivo JSON anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    grid = {
+        "channels": args.channels,
+        "requests": args.requests,
+        "sizes": args.sizes,
+        "max_concurrent": args.max_concurrent,
+        "policy": args.policies,
+        "pool": [bool(value) for value in args.pool],
+        "seed": [args.seed],
+    }
+    document = run_suite(grid, args.benchmarks, args.repeat, args.warmup)
+
+    for result in document["results"]:
+        latency = result["latency_ns"]
+        print(
+            f"{result['benchmark']:>6} {result['operation']:<15} "
+            f"{result['ops_per_sec']:>12,.0f} ops/s  "
+            f"p50 {latency['p50']:>7} ns  p99 {latency['p99']:>8} ns  "
+            f"pico {result['peak_memory_bytes'] / 1024:,.0f} KiB  {result['params']}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(document, output, indent=2)
+        print(f"\nResultados salvos em {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = 0
+        for comparison in compare_results(baseline, document, args.threshold):
+            marker = "REGRESSÃO" if comparison["regression"] else "ok"
+            regressions += comparison["regression"]
+            print(
+                f"{marker:>9} {comparison['ratio']:6.2f}x "
+                f"{comparison['benchmark']}/{comparison['operation']} "
+                f"{comparison['params']}"
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,33 @@ Simula o comportamento de arbitragem de barramento para DMA
 """
 
 import time
+import asyncio
+import heapq
+import itertools
 import threading
-from typing import List, Dict, Optional
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional
 from enum import Enum
 
+from bus_metrics import LogLinearHistogram, UtilizationTracker
+from simulation_clock import (
+    DEFAULT_BUS_BANDWIDTH,
+    NANOSECONDS_PER_SECOND,
+    SimulationClock,
+    transfer_duration_ns,
+)
+from workload_generator import WorkloadGenerator
+
+# Espera (segundos) que vale um nível de prioridade em AgingPriorityQueue
+DEFAULT_AGING_INTERVAL = 0.001
+
+# O que fazer quando a fila de pendentes atinge max_pending
+OVERFLOW_POLICIES = ("reject_new", "drop_lowest", "drop_oldest")
+
+
+class BusRequestDropped(Exception):
+    """Solicitação descartada da fila sem concessão (excesso, prazo ou reset)"""
+
 
 class BusPriority(Enum):
     """Níveis de prioridade do barramento"""
@@ -20,86 +43,1012 @@ class BusPriority(Enum):
     CRITICAL = 3
 
 
+# BusPriority por valor inteiro (BusRequest guarda só o inteiro)
+_PRIORITIES = tuple(BusPriority)
+
+
 class BusRequest:
-    """Representa uma solicitação de barramento"""
+    """Representa uma solicitação de barramento
 
-    def __init__(self, requester_id: int, priority: BusPriority, data_size: int):
+    Registro compacto com __slots__ e prioridade inteira (priority_value);
+    `priority` devolve o BusPriority correspondente. Sem o __dict__, o
+    registro ocupa ~172 bytes em vez de ~244 no Python 3.9 (a diferença é
+    menor a partir do 3.11, que já compacta os atributos); o benchmark
+    "pending" de benchmark_suite.py mede o custo total por solicitação
+    pendente, incluindo a entrada da fila.
+    """
+
+    __slots__ = (
+        "requester_id",
+        "priority_value",
+        "data_size",
+        "timestamp",
+        "granted",
+        "grant_time",
+        "grant_callbacks",
+        "deadline",
+        "drop_reason",
+        "drop_callbacks",
+        "sequence",
+        "queued",
+    )
+
+    def __init__(
+        self,
+        requester_id: int,
+        priority: BusPriority,
+        data_size: int,
+        timestamp: Optional[float] = None,
+    ):
         self.requester_id = requester_id
-        self.priority = priority
+        self.priority_value = getattr(priority, "value", priority)
         self.data_size = data_size
-        self.timestamp = time.time()
+        self.timestamp = time.time() if timestamp is None else timestamp
         self.granted = False
+        self.grant_time: Optional[float] = None
+        self.grant_callbacks: Optional[List[Callable]] = None
+        # Instante (mesma base de timestamp) após o qual a espera expira
+        self.deadline: Optional[float] = None
+        # "shed", "expired" ou "reset" quando sai da fila sem concessão
+        self.drop_reason: Optional[str] = None
+        self.drop_callbacks: Optional[List[Callable]] = None
+        # Número de enfileiramento no controlador (identifica cada reuso)
+        self.sequence = 0
+        # Está em uma fila de política de arbitragem (mantido pela política)
+        self.queued = False
+
+    @property
+    def priority(self) -> BusPriority:
+        """Prioridade como BusPriority"""
+        return _PRIORITIES[self.priority_value]
+
+    def add_grant_callback(self, callback: Callable):
+        """Registra `callback(request)`, chamado quando o barramento é concedido
+
+        O callback executa com o lock do controlador adquirido e deve ser
+        rápido (por exemplo, agendar algo em outro loop ou acordar uma thread).
+        """
+        if self.grant_callbacks is None:
+            self.grant_callbacks = []
+        self.grant_callbacks.append(callback)
+
+    def add_drop_callback(self, callback: Callable):
+        """Registra `callback(request)`, chamado se a solicitação for
+        descartada da fila (excesso de carga ou prazo expirado)
+
+        Executa com o lock do controlador adquirido, como os de concessão.
+        """
+        if self.drop_callbacks is None:
+            self.drop_callbacks = []
+        self.drop_callbacks.append(callback)
 
     def __lt__(self, other):
         """Comparação para ordenação por prioridade"""
-        if self.priority.value != other.priority.value:
-            return self.priority.value > other.priority.value
+        if self.priority_value != other.priority_value:
+            return self.priority_value > other.priority_value
         return self.timestamp < other.timestamp
 
 
+class BusRequestPool:
+    """Lista livre de registros BusRequest
+
+    O controlador devolve cada solicitação ao pool quando a transferência é
+    liberada, e o próximo enfileiramento reinicializa um registro devolvido
+    em vez de alocar outro. Quem usa o pool não deve guardar referências a
+    solicitações já liberadas. No máximo `max_size` registros ficam
+    guardados.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.created = 0
+        self.reused = 0
+        self._free: List[BusRequest] = []
+
+    def acquire(
+        self,
+        requester_id: int,
+        priority: BusPriority,
+        data_size: int,
+        timestamp: Optional[float] = None,
+    ) -> BusRequest:
+        """Registro reinicializado da lista livre (ou um novo)"""
+        if self._free:
+            request = self._free.pop()
+            request.__init__(requester_id, priority, data_size, timestamp)
+            self.reused += 1
+            return request
+        self.created += 1
+        return BusRequest(requester_id, priority, data_size, timestamp)
+
+    def release(self, request: BusRequest):
+        """Devolve um registro que não será mais usado"""
+        if len(self._free) < self.max_size:
+            request.grant_callbacks = None
+            request.drop_callbacks = None
+            self._free.append(request)
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+
+class ArbitrationPolicy:
+    """Política de arbitragem: dona da estrutura de solicitações pendentes
+
+    O BusController delega à política a ordem em que as solicitações
+    pendentes recebem o barramento. Cada implementação mantém sua própria
+    estrutura de dados e os contadores por prioridade usados pelo status.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._size = 0
+        self.priority_counts: Dict[BusPriority, int] = {
+            priority: 0 for priority in BusPriority
+        }
+
+    def push(self, request: BusRequest):
+        """Insere uma solicitação pendente"""
+        raise NotImplementedError
+
+    def peek(self) -> Optional[BusRequest]:
+        """Retorna a próxima solicitação a ser concedida sem removê-la"""
+        raise NotImplementedError
+
+    def pop(self) -> Optional[BusRequest]:
+        """Remove e retorna a próxima solicitação a ser concedida"""
+        raise NotImplementedError
+
+    def remove(self, request: BusRequest) -> bool:
+        """Remove uma solicitação específica (cancelamento, timeout)"""
+        raise NotImplementedError
+
+    def find(self, requester_id: int) -> Optional[BusRequest]:
+        """Retorna a solicitação pendente mais antiga de um requisitante"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Esvazia a fila e zera os contadores"""
+        for request in self:
+            request.queued = False
+        self._size = 0
+        for priority in self.priority_counts:
+            self.priority_counts[priority] = 0
+
+    def _count_in(self, request: BusRequest):
+        self._size += 1
+        self.priority_counts[request.priority] += 1
+        request.queued = True
+
+    def _count_out(self, request: BusRequest):
+        self._size -= 1
+        self.priority_counts[request.priority] -= 1
+        request.queued = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, request: BusRequest) -> bool:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[BusRequest]:
+        raise NotImplementedError
+
+
+class PendingRequestQueue(ArbitrationPolicy):
+    """Fila de solicitações pendentes baseada em heap (prioridade estrita)
+
+    As entradas do heap são ordenadas por (prioridade, timestamp, sequência),
+    a mesma ordem de BusRequest.__lt__ com desempate FIFO. Um índice
+    requester_id -> entradas permite remover solicitações arbitrárias com
+    remoção preguiçosa (a entrada é marcada e descartada ao chegar ao topo),
+    e os contadores por prioridade são mantidos a cada operação.
+    """
+
+    name = "priority"
+
+    def __init__(self):
+        super().__init__()
+        self._heap: List[list] = []
+        self._index: Dict[int, List[list]] = {}
+        self._sequence = itertools.count()
+
+    def _key(self, request: BusRequest) -> tuple:
+        """Chave de ordenação do heap (menor sai primeiro)"""
+        return (-request.priority_value, request.timestamp)
+
+    def push(self, request: BusRequest):
+        """Insere uma solicitação na fila - O(log n)"""
+        entry = [*self._key(request), next(self._sequence), request]
+        heapq.heappush(self._heap, entry)
+        self._index.setdefault(request.requester_id, []).append(entry)
+        self._count_in(request)
+
+    def peek(self) -> Optional[BusRequest]:
+        """Retorna a solicitação de maior prioridade sem removê-la"""
+        self._discard_removed()
+        return self._heap[0][-1] if self._heap else None
+
+    def pop(self) -> Optional[BusRequest]:
+        """Remove e retorna a solicitação de maior prioridade - O(log n)"""
+        self._discard_removed()
+        if not self._heap:
+            return None
+        entry = heapq.heappop(self._heap)
+        self._unlink(entry)
+        return entry[-1]
+
+    def remove(self, request: BusRequest) -> bool:
+        """Remove uma solicitação específica da fila"""
+        if not request.queued:
+            return False
+        for entry in self._index.get(request.requester_id, ()):
+            if entry[-1] is request:
+                self._unlink(entry)
+                entry[-1] = None
+                if len(self._heap) > 2 * self._size + 64:
+                    self._compact()
+                return True
+        return False
+
+    def find(self, requester_id: int) -> Optional[BusRequest]:
+        """Retorna a solicitação pendente mais antiga de um requisitante"""
+        entries = self._index.get(requester_id)
+        return entries[0][-1] if entries else None
+
+    def clear(self):
+        """Esvazia a fila e zera os contadores"""
+        super().clear()
+        self._heap.clear()
+        self._index.clear()
+
+    def _unlink(self, entry: list):
+        """Remove a entrada do índice e atualiza os contadores"""
+        request = entry[-1]
+        entries = self._index[request.requester_id]
+        entries.remove(entry)
+        if not entries:
+            del self._index[request.requester_id]
+        self._count_out(request)
+
+    def _discard_removed(self):
+        """Descarta entradas removidas que chegaram ao topo do heap"""
+        heap = self._heap
+        while heap and heap[0][-1] is None:
+            heapq.heappop(heap)
+
+    def _compact(self):
+        """Reconstrói o heap sem as entradas removidas"""
+        self._heap = [entry for entry in self._heap if entry[-1] is not None]
+        heapq.heapify(self._heap)
+
+    def __contains__(self, request: BusRequest) -> bool:
+        return request.queued and any(
+            entry[-1] is request for entry in self._index.get(request.requester_id, ())
+        )
+
+    def __iter__(self) -> Iterator[BusRequest]:
+        """Itera pelas solicitações na ordem de concessão"""
+        for entry in sorted(self._heap):
+            if entry[-1] is not None:
+                yield entry[-1]
+
+
+class WeightedFairQueuing(PendingRequestQueue):
+    """Weighted fair queuing com heap de tempos virtuais de término
+
+    Cada requisitante é um fluxo. O tempo de término virtual de uma
+    solicitação é max(V, último término do fluxo) + data_size / peso, onde o
+    peso vem da prioridade; V avança para o término da solicitação concedida
+    (self-clocked fair queuing). Escolher a próxima custa O(log n).
+    """
+
+    name = "fair_queuing"
+
+    def __init__(self, weights: Optional[Dict[BusPriority, float]] = None):
+        super().__init__()
+        self.weights = weights or {
+            priority: float(priority.value + 1) for priority in BusPriority
+        }
+        self.virtual_time = 0.0
+        self._last_finish: Dict[int, float] = {}
+
+    def _key(self, request: BusRequest) -> tuple:
+        start = max(self.virtual_time, self._last_finish.get(request.requester_id, 0.0))
+        finish = start + request.data_size / self.weights[request.priority]
+        self._last_finish[request.requester_id] = finish
+        return (finish,)
+
+    def pop(self) -> Optional[BusRequest]:
+        """Concede a solicitação de menor término virtual e avança V"""
+        self._discard_removed()
+        if not self._heap:
+            return None
+        entry = heapq.heappop(self._heap)
+        self._unlink(entry)
+        self.virtual_time = max(self.virtual_time, entry[0])
+        if len(self._last_finish) > 2 * self._size + 64:
+            self._prune_flows()
+        return entry[-1]
+
+    def _prune_flows(self):
+        """Descarta fluxos cujo último término já ficou para trás de V"""
+        virtual_time = self.virtual_time
+        self._last_finish = {
+            requester_id: finish
+            for requester_id, finish in self._last_finish.items()
+            if finish > virtual_time
+        }
+
+    def clear(self):
+        super().clear()
+        self.virtual_time = 0.0
+        self._last_finish.clear()
+
+
+class AgingPriorityQueue(PendingRequestQueue):
+    """Prioridade com envelhecimento linear (sem starvation)
+
+    A prioridade efetiva cresce um nível a cada `aging_interval` segundos de
+    espera: priority + (agora - timestamp) / aging_interval. Como todas as
+    solicitações envelhecem à mesma taxa, a ordem entre elas não muda com o
+    tempo e equivale à chave fixa timestamp - priority * aging_interval
+    (um prazo virtual). Assim nenhuma entrada é recalculada: inserir e
+    conceder continuam O(log n), e uma solicitação LOW passa à frente de
+    uma CRITICAL que chegou 3 * aging_interval depois dela.
+    """
+
+    name = "aging"
+
+    def __init__(self, aging_interval: float = DEFAULT_AGING_INTERVAL):
+        if aging_interval <= 0:
+            raise ValueError("O intervalo de envelhecimento deve ser positivo")
+        super().__init__()
+        self.aging_interval = aging_interval
+
+    def _key(self, request: BusRequest) -> tuple:
+        return (request.timestamp - request.priority_value * self.aging_interval,)
+
+
+class RoundRobinArbitration(ArbitrationPolicy):
+    """Round-robin entre requisitantes com ponteiro rotativo
+
+    Um OrderedDict requester_id -> fila FIFO funciona como anel: o primeiro
+    requisitante é atendido e vai para o fim do anel. Concessão, inserção e
+    remoção do requisitante custam O(1).
+    """
+
+    name = "round_robin"
+
+    def __init__(self):
+        super().__init__()
+        self._ring: "OrderedDict[int, Deque[BusRequest]]" = OrderedDict()
+
+    def push(self, request: BusRequest):
+        queue = self._ring.get(request.requester_id)
+        if queue is None:
+            queue = self._ring[request.requester_id] = deque()
+        queue.append(request)
+        self._count_in(request)
+
+    def peek(self) -> Optional[BusRequest]:
+        if not self._ring:
+            return None
+        return next(iter(self._ring.values()))[0]
+
+    def pop(self) -> Optional[BusRequest]:
+        if not self._ring:
+            return None
+        requester_id, queue = next(iter(self._ring.items()))
+        request = queue.popleft()
+        if queue:
+            self._ring.move_to_end(requester_id)
+        else:
+            del self._ring[requester_id]
+        self._count_out(request)
+        return request
+
+    def remove(self, request: BusRequest) -> bool:
+        queue = self._ring.get(request.requester_id)
+        if not request.queued or not queue or request not in queue:
+            return False
+        queue.remove(request)
+        if not queue:
+            del self._ring[request.requester_id]
+        self._count_out(request)
+        return True
+
+    def find(self, requester_id: int) -> Optional[BusRequest]:
+        queue = self._ring.get(requester_id)
+        return queue[0] if queue else None
+
+    def clear(self):
+        super().clear()
+        self._ring.clear()
+
+    def __contains__(self, request: BusRequest) -> bool:
+        return request.queued and request in self._ring.get(request.requester_id, ())
+
+    def __iter__(self) -> Iterator[BusRequest]:
+        """Itera na ordem de concessão (uma volta do anel por vez)"""
+        queues = list(self._ring.values())
+        depth = 0
+        while queues:
+            queues = [queue for queue in queues if len(queue) > depth]
+            for queue in queues:
+                yield queue[depth]
+            depth += 1
+
+
+# Políticas disponíveis, por nome (usado em benchmarks e varreduras)
+ARBITRATION_POLICIES = {
+    policy.name: policy
+    for policy in (
+        PendingRequestQueue,
+        RoundRobinArbitration,
+        WeightedFairQueuing,
+        AgingPriorityQueue,
+    )
+}
+
+
+class ActiveTransferTable:
+    """Transferências ativas indexadas por requester_id"""
+
+    def __init__(self):
+        self._by_requester: Dict[int, Deque[BusRequest]] = {}
+        self._size = 0
+
+    def add(self, request: BusRequest):
+        """Registra uma transferência ativa - O(1)"""
+        self._by_requester.setdefault(request.requester_id, deque()).append(request)
+        self._size += 1
+
+    def pop(self, requester_id: int) -> Optional[BusRequest]:
+        """Remove a transferência mais antiga de um requisitante - O(1)"""
+        transfers = self._by_requester.get(requester_id)
+        if not transfers:
+            return None
+        request = transfers.popleft()
+        if not transfers:
+            del self._by_requester[requester_id]
+        self._size -= 1
+        return request
+
+    def remove(self, request: BusRequest) -> bool:
+        """Remove uma transferência específica"""
+        transfers = self._by_requester.get(request.requester_id)
+        if not transfers or request not in transfers:
+            return False
+        transfers.remove(request)
+        if not transfers:
+            del self._by_requester[request.requester_id]
+        self._size -= 1
+        return True
+
+    def clear(self):
+        """Remove todas as transferências ativas"""
+        self._by_requester.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, request: BusRequest) -> bool:
+        return request in self._by_requester.get(request.requester_id, ())
+
+    def __iter__(self) -> Iterator[BusRequest]:
+        for transfers in self._by_requester.values():
+            yield from transfers
+
+
 class BusController:
     """Controlador de barramento com arbitragem"""
 
-    def __init__(self, max_concurrent_transfers: int = 2):
+    def __init__(
+        self,
+        max_concurrent_transfers: int = 2,
+        clock: Optional[SimulationClock] = None,
+        bus_bandwidth: int = DEFAULT_BUS_BANDWIDTH,
+        policy: Optional[ArbitrationPolicy] = None,
+        starvation_threshold: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        overflow_policy: str = "reject_new",
+        default_max_wait: Optional[float] = None,
+        request_pool: Optional[BusRequestPool] = None,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de excesso desconhecida: {overflow_policy}")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("A capacidade da fila deve ser positiva")
         self.max_concurrent_transfers = max_concurrent_transfers
-        self.active_transfers = []
-        self.pending_requests = []
-        self.bus_utilization = 0.0
+        self.clock = clock
+        self.bus_bandwidth = bus_bandwidth
+        self.active_transfers = ActiveTransferTable()
+        # A política de arbitragem é a dona da fila de pendentes
+        self.pending_requests = policy if policy is not None else PendingRequestQueue()
         self.total_requests = 0
         self.granted_requests = 0
         self.lock = threading.Lock()
+        # Com um pool, as solicitações liberadas são recicladas
+        self.request_pool = request_pool
+        self._sequence = itertools.count(1)
+
+        # Histogramas de espera (fila -> concessão) e ocupação (concessão ->
+        # liberação) por prioridade, em nanossegundos
+        self.wait_histograms = {
+            priority: LogLinearHistogram() for priority in BusPriority
+        }
+        self.hold_histograms = {
+            priority: LogLinearHistogram() for priority in BusPriority
+        }
+        # Utilização, vazão e fila integradas no tempo (atualizadas a cada
+        # enfileiramento, concessão e liberação)
+        self.utilization = UtilizationTracker(max_concurrent_transfers, self._now())
+
+        # Justiça por requisitante, só com `starvation_threshold` (segundos):
+        # maior espera até a concessão e quantas solicitações esperaram mais
+        # que o limite. Sem o limite nada é guardado por requisitante
+        self.starvation_threshold = starvation_threshold
+        self.max_wait_by_requester: Dict[int, float] = {}
+        self.starvation_counts: Dict[int, int] = {}
+        # Solicitações em ordem de chegada para localizar as que ainda
+        # esperam; entradas já concedidas ou retiradas saem de forma
+        # preguiçosa. As estruturas auxiliares guardam (sequence, request)
+        # para reconhecer entradas antigas de registros reciclados pelo pool
+        self._arrivals: Deque[tuple] = deque()
+        self._track_arrivals = (
+            starvation_threshold is not None or overflow_policy == "drop_oldest"
+        )
+
+        # Fila limitada: com `max_pending`, o excesso é tratado conforme
+        # `overflow_policy`; prazos (`max_wait`) expiram de forma preguiçosa
+        # na próxima operação do controlador, por um heap de prazos
+        self.max_pending = max_pending
+        self.overflow_policy = overflow_policy
+        self.default_max_wait = default_max_wait
+        self.shed_requests = 0
+        self.expired_requests = 0
+        self._deadlines: List[tuple] = []
+        # drop_lowest: pendentes de cada prioridade em ordem de chegada
+        self._arrivals_by_priority: Optional[Dict[BusPriority, Deque]] = (
+            {priority: deque() for priority in BusPriority}
+            if overflow_policy == "drop_lowest"
+            else None
+        )
+
+    @property
+    def bus_utilization(self) -> float:
+        """Utilização média ponderada no tempo (0-100) desde o último reset"""
+        return self.utilization.utilization
 
     def request_bus(
-        self, requester_id: int, priority: BusPriority, data_size: int
+        self,
+        requester_id: int,
+        priority: BusPriority,
+        data_size: int,
+        on_grant: Optional[Callable] = None,
+        max_wait: Optional[float] = None,
+        on_drop: Optional[Callable] = None,
     ) -> bool:
-        """Solicita acesso ao barramento"""
+        """Solicita acesso ao barramento
+
+        Retorna False se a solicitação ficou pendente; nesse caso `on_grant`
+        (se informado) é chamado com a solicitação quando o barramento for
+        concedido por release_bus. Se a solicitação for recusada ou
+        descartada (fila cheia ou `max_wait` segundos sem concessão),
+        `on_drop` é chamado no lugar.
+        """
         with self.lock:
-            request = BusRequest(requester_id, priority, data_size)
-            self.pending_requests.append(request)
-            self.total_requests += 1
-
-            # Ordena por prioridade
-            self.pending_requests.sort()
-
-            return self._try_grant_access(request)
-
-    def _try_grant_access(self, request: BusRequest) -> bool:
-        """Tenta conceder acesso ao barramento"""
-        if len(self.active_transfers) < self.max_concurrent_transfers:
-            if request in self.pending_requests:
-                self.pending_requests.remove(request)
-                self.active_transfers.append(request)
-                request.granted = True
-                self.granted_requests += 1
-                return True
+            request = self._enqueue(
+                requester_id, priority, data_size, max_wait, on_grant, on_drop
+            )
+            self._grant_next()
+            return request.granted
+
+    def wait_for_bus(
+        self,
+        requester_id: int,
+        priority: BusPriority,
+        data_size: int,
+        timeout: Optional[float] = None,
+        max_wait: Optional[float] = None,
+    ) -> bool:
+        """Solicita o barramento e bloqueia até a concessão
+
+        A thread dorme em um Event acordado por _grant_next. Se o
+        `timeout` (segundos) expirar, a solicitação é retirada da fila e o
+        retorno é False, evitando entradas duplicadas por novas tentativas.
+        Também retorna False se a solicitação for descartada (fila cheia ou
+        `max_wait` segundos sem concessão, como em request_bus); a própria
+        thread acorda no prazo e o aplica, sem depender de outra operação.
+        """
+        granted = threading.Event()
+        with self.lock:
+            request = self._enqueue(
+                requester_id,
+                priority,
+                data_size,
+                max_wait,
+                on_grant=lambda _request: granted.set(),
+                on_drop=lambda _request: granted.set(),
+            )
+            self._grant_next()
+            if request.granted or request.drop_reason is not None:
+                return request.granted
+
+        timeout_end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = None
+            if timeout_end is not None:
+                wait = max(0.0, timeout_end - time.monotonic())
+            if request.deadline is not None:
+                until_deadline = max(0.0, request.deadline - self._now())
+                wait = until_deadline if wait is None else min(wait, until_deadline)
+            if granted.wait(wait):
+                return request.granted
+            if timeout_end is not None and time.monotonic() >= timeout_end:
+                break
+            with self.lock:
+                self._expire(self._now())
+                if request.granted or request.drop_reason is not None:
+                    return request.granted
+
+        with self.lock:
+            # A concessão (ou o descarte) pode ter ocorrido logo após o timeout
+            if self.pending_requests.remove(request):
+                self._observe(self._now())
+                return False
+            return request.granted
+
+    async def acquire(
+        self,
+        requester_id: int,
+        priority: BusPriority,
+        data_size: int,
+        max_wait: Optional[float] = None,
+    ) -> BusRequest:
+        """Versão assíncrona de request_bus
+
+        Se o barramento estiver cheio, a corrotina fica suspensa em um future
+        resolvido por release_bus no momento da concessão, sem polling.
+        Retorna a solicitação concedida; libere com release_bus. Levanta
+        BusRequestDropped se a solicitação for recusada ou descartada; o
+        prazo `max_wait` é aplicado por um temporizador do loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            request = self._enqueue(requester_id, priority, data_size, max_wait)
+            self._grant_next()
+            if request.granted:
+                return request
+            if request.drop_reason is not None:
+                raise BusRequestDropped(request.drop_reason)
+            granted = loop.create_future()
+
+            def wake(_request):
+                loop.call_soon_threadsafe(_resolve_future, granted)
+
+            request.add_grant_callback(wake)
+            request.add_drop_callback(wake)
+
+            def check_deadline():
+                nonlocal expiry
+                with self.lock:
+                    now = self._now()
+                    self._expire(now)
+                    if self._is_pending(request):
+                        # Relógio virtual ainda antes do prazo: confere de novo
+                        expiry = loop.call_later(request.deadline - now, check_deadline)
+
+            expiry = None
+            if request.deadline is not None:
+                expiry = loop.call_later(
+                    max(0.0, request.deadline - self._now()), check_deadline
+                )
+
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self.lock:
+                if self.pending_requests.remove(request):
+                    self._observe(self._now())
+                else:
+                    # Concedido durante o cancelamento: devolve o barramento
+                    self._release_request(request)
+            raise
+        finally:
+            if expiry is not None:
+                expiry.cancel()
+        if not request.granted:
+            raise BusRequestDropped(request.drop_reason)
+        return request
+
+    def _enqueue(
+        self,
+        requester_id: int,
+        priority: BusPriority,
+        data_size: int,
+        max_wait: Optional[float] = None,
+        on_grant: Optional[Callable] = None,
+        on_drop: Optional[Callable] = None,
+    ) -> BusRequest:
+        """Cria e enfileira uma solicitação (com o lock adquirido)
+
+        Com a fila cheia, a política de excesso decide quem é descartado;
+        a solicitação retornada pode já estar descartada (drop_reason).
+        """
+        now = self._now()
+        if self.request_pool is not None:
+            request = self.request_pool.acquire(requester_id, priority, data_size, now)
+        else:
+            request = BusRequest(requester_id, priority, data_size, now)
+        request.sequence = sequence = next(self._sequence)
+        if on_grant is not None:
+            request.add_grant_callback(on_grant)
+        if on_drop is not None:
+            request.add_drop_callback(on_drop)
+        self.total_requests += 1
+        self._expire(now)
+
+        if (
+            self.max_pending is not None
+            and len(self.pending_requests) >= self.max_pending
+            and not self._make_room(request)
+        ):
+            self._drop(request, "shed")
+            return request
+
+        if max_wait is None:
+            max_wait = self.default_max_wait
+        if max_wait is not None:
+            request.deadline = now + max_wait
+            heapq.heappush(self._deadlines, (request.deadline, sequence, request))
+        self.pending_requests.push(request)
+        if self._track_arrivals:
+            self._arrivals.append((sequence, request))
+        if self._arrivals_by_priority is not None:
+            self._arrivals_by_priority[request.priority].append((sequence, request))
+        tracked = len(self._arrivals) + len(self._deadlines)
+        if self._arrivals_by_priority is not None:
+            tracked += sum(map(len, self._arrivals_by_priority.values()))
+        if tracked > 2 * len(self.pending_requests) + 64:
+            self._prune_tracking()
+        self._observe(now)
+        return request
+
+    def _is_pending(self, request: BusRequest) -> bool:
+        """A solicitação ainda está na fila (com o lock adquirido) - O(1)
+
+        Usa a marca `queued` mantida pela política em vez de procurar a
+        solicitação nas entradas do requisitante.
+        """
+        return request.queued
+
+    def _is_current(self, entry: tuple) -> bool:
+        """A entrada (sequence, ..., request) ainda aponta para uma pendente"""
+        request = entry[-1]
+        return request.sequence == entry[-2] and self._is_pending(request)
+
+    def _drop(self, request: BusRequest, reason: str):
+        """Descarta uma solicitação sem concessão e avisa quem a aguarda"""
+        self.pending_requests.remove(request)
+        request.drop_reason = reason
+        if reason == "shed":
+            self.shed_requests += 1
+        elif reason == "expired":
+            self.expired_requests += 1
+        if request.drop_callbacks:
+            for callback in request.drop_callbacks:
+                callback(request)
+
+    def _make_room(self, request: BusRequest) -> bool:
+        """Abre vaga na fila cheia para `request` segundo a política
+
+        Retorna False se a nova solicitação é que deve ser recusada.
+        """
+        if self.overflow_policy == "drop_oldest":
+            arrivals = self._arrivals
+            while arrivals:
+                entry = arrivals.popleft()
+                if self._is_current(entry):
+                    self._drop(entry[-1], "shed")
+                    return True
+            return False
+        if self.overflow_policy == "drop_lowest":
+            # A mais recente da menor prioridade, se for menor que a nova
+            counts = self.pending_requests.priority_counts
+            for priority in BusPriority:
+                if priority.value >= request.priority_value:
+                    return False
+                if counts[priority]:
+                    queue = self._arrivals_by_priority[priority]
+                    while queue:
+                        entry = queue.pop()
+                        if self._is_current(entry):
+                            self._drop(entry[-1], "shed")
+                            return True
         return False
 
+    def _expire(self, now: float):
+        """Descarta as solicitações pendentes cujo prazo já passou"""
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            entry = heapq.heappop(deadlines)
+            if self._is_current(entry):
+                self._drop(entry[-1], "expired")
+
+    def _prune_tracking(self):
+        """Reconstrói as estruturas auxiliares só com as pendentes"""
+        is_current = self._is_current
+        self._arrivals = deque(filter(is_current, self._arrivals))
+        self._deadlines = list(filter(is_current, self._deadlines))
+        heapq.heapify(self._deadlines)
+        if self._arrivals_by_priority is not None:
+            for priority, queue in self._arrivals_by_priority.items():
+                self._arrivals_by_priority[priority] = deque(filter(is_current, queue))
+
+    def _release_request(self, request: BusRequest) -> bool:
+        """Libera uma transferência específica (com o lock adquirido)"""
+        if not self.active_transfers.remove(request):
+            return False
+        self._on_released(request)
+        return True
+
+    def _on_released(self, request: BusRequest) -> Optional[BusRequest]:
+        """Contabiliza a liberação e concede a vaga à próxima solicitação"""
+        now = self._now()
+        self.hold_histograms[request.priority].record(
+            round((now - request.grant_time) * NANOSECONDS_PER_SECOND)
+        )
+        if self.request_pool is not None:
+            self.request_pool.release(request)
+        self._observe(now)
+        return self._grant_next()
+
+    def release_request(self, request: BusRequest) -> bool:
+        """Libera uma transferência concedida específica
+
+        Útil quando o mesmo solicitante tem várias transferências ativas.
+        """
+        with self.lock:
+            return self._release_request(request)
+
     def release_bus(self, requester_id: int) -> bool:
         """Libera o barramento após transferência"""
         with self.lock:
-            for transfer in self.active_transfers:
-                if transfer.requester_id == requester_id:
-                    self.active_transfers.remove(transfer)
+            request = self.active_transfers.pop(requester_id)
+            if request is None:
+                return False
 
-                    # Tenta conceder acesso para próxima solicitação
-                    if self.pending_requests:
-                        next_request = self.pending_requests[0]
-                        self._try_grant_access(next_request)
+            # Tenta conceder acesso para próxima solicitação
+            self._on_released(request)
 
-                    return True
-            return False
+            return True
+
+    def _grant_next(self) -> Optional[BusRequest]:
+        """Concede o barramento à solicitação escolhida pela política
+
+        Só concede se houver vaga; retorna a solicitação concedida ou None.
+        """
+        if len(self.active_transfers) >= self.max_concurrent_transfers:
+            return None
+        if self._deadlines:
+            self._expire(self._now())
+        request = self.pending_requests.pop()
+        if request is None:
+            return None
+        self.active_transfers.add(request)
+        request.granted = True
+        request.grant_time = now = self._now()
+        self.granted_requests += 1
+        wait = now - request.timestamp
+        self.wait_histograms[request.priority].record(
+            round(wait * NANOSECONDS_PER_SECOND)
+        )
+        requester_id = request.requester_id
+        threshold = self.starvation_threshold
+        if threshold is not None and wait > self.max_wait_by_requester.get(
+            requester_id, -1.0
+        ):
+            self.max_wait_by_requester[requester_id] = wait
+        if threshold is not None and wait >= threshold:
+            self.starvation_counts[requester_id] = (
+                self.starvation_counts.get(requester_id, 0) + 1
+            )
+        self._observe(now)
+        self.utilization.record_grant(
+            request.priority, request.requester_id, request.data_size
+        )
+        if request.grant_callbacks:
+            for callback in request.grant_callbacks:
+                callback(request)
+        return request
+
+    def _observe(self, now: float):
+        """Atualiza os níveis de ocupação e de fila (com o lock adquirido)"""
+        self.utilization.observe(
+            now, len(self.active_transfers), len(self.pending_requests)
+        )
+
+    def starving_requests(self, now: Optional[float] = None) -> List[BusRequest]:
+        """Solicitações pendentes há pelo menos `starvation_threshold`
+
+        Percorre apenas a frente da ordem de chegada: para na primeira
+        solicitação pendente mais nova que o limite.
+        """
+        if self.starvation_threshold is None:
+            return []
+        with self.lock:
+            now = self._now() if now is None else now
+            arrivals = self._arrivals
+            self._expire(now)
+            while arrivals and not self._is_current(arrivals[0]):
+                arrivals.popleft()
+            starving = []
+            limit = now - self.starvation_threshold
+            for entry in arrivals:
+                if not self._is_current(entry):
+                    continue
+                if entry[-1].timestamp > limit:
+                    break
+                starving.append(entry[-1])
+            return starving
+
+    def get_fairness_snapshot(self) -> Dict[str, any]:
+        """Maior espera e contagem de starvation por requisitante
+
+        Esperas em nanossegundos; "starving" lista, por requisitante, quantas
+        solicitações pendentes já passaram do limite.
+        """
+        starving: Dict[int, int] = {}
+        for request in self.starving_requests():
+            starving[request.requester_id] = starving.get(request.requester_id, 0) + 1
+        with self.lock:
+            return {
+                "starvation_threshold": self.starvation_threshold,
+                "max_wait_ns": {
+                    requester_id: round(wait * NANOSECONDS_PER_SECOND)
+                    for requester_id, wait in self.max_wait_by_requester.items()
+                },
+                "starved_requests": dict(self.starvation_counts),
+                "starving": starving,
+            }
+
+    @property
+    def policy(self) -> ArbitrationPolicy:
+        """Política de arbitragem em uso"""
+        return self.pending_requests
+
+    def _now(self) -> float:
+        """Tempo atual em segundos (virtual se houver relógio de simulação)"""
+        return self.clock.seconds if self.clock is not None else time.time()
+
+    def transfer_duration_ns(self, data_size: int) -> int:
+        """Duração simulada de uma transferência com a banda configurada"""
+        return transfer_duration_ns(data_size, self.bus_bandwidth)
 
     def get_bus_status(self) -> Dict[str, any]:
-        """Retorna status atual do barramento"""
+        """Retorna status atual do barramento
+
+        "bus_utilization" é a mesma média ponderada no tempo do atributo
+        bus_utilization (e de "time_weighted_utilization"); a ocupação deste
+        instante fica em "instantaneous_utilization".
+        """
         with self.lock:
-            utilization = (
+            instantaneous = (
                 len(self.active_transfers) / self.max_concurrent_transfers * 100
             )
+            now = self._now()
+            self._expire(now)
+            self._observe(now)
 
             return {
                 "active_transfers": len(self.active_transfers),
                 "pending_requests": len(self.pending_requests),
-                "bus_utilization": utilization,
+                "bus_utilization": self.utilization.utilization,
+                "instantaneous_utilization": instantaneous,
                 "total_requests": self.total_requests,
                 "granted_requests": self.granted_requests,
                 "success_rate": (
@@ -107,19 +1056,92 @@ class BusController:
                     if self.total_requests > 0
                     else 0
                 ),
+                "wait_time_ns": self._latency_summary(self.wait_histograms),
+                "hold_time_ns": self._latency_summary(self.hold_histograms),
+                "time_weighted_utilization": self.utilization.utilization,
+                "starved_requests": sum(self.starvation_counts.values()),
+                "shed_requests": self.shed_requests,
+                "expired_requests": self.expired_requests,
+            }
+
+    @staticmethod
+    def _latency_summary(histograms) -> Dict[str, Dict[str, int]]:
+        """p50/p90/p99/max por prioridade (apenas prioridades com amostras)"""
+        summary = {}
+        for priority, histogram in histograms.items():
+            if histogram.count:
+                snapshot = histogram.snapshot()
+                summary[priority.name] = {
+                    key: snapshot[key] for key in ("p50", "p90", "p99", "max")
+                }
+        return summary
+
+    def get_latency_snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Snapshot completo dos histogramas de espera e ocupação
+
+        Retorna {"wait": {prioridade: resumo}, "hold": {...}} com contagem,
+        média, mínimo, p50, p90, p99 e máximo em nanossegundos.
+        """
+        with self.lock:
+            return {
+                "wait": {
+                    priority.name: histogram.snapshot()
+                    for priority, histogram in self.wait_histograms.items()
+                },
+                "hold": {
+                    priority.name: histogram.snapshot()
+                    for priority, histogram in self.hold_histograms.items()
+                },
+            }
+
+    def get_throughput_snapshot(self) -> Dict[str, any]:
+        """Utilização, vazão e profundidade de fila ponderadas no tempo
+
+        Inclui os totais desde o último reset (bytes/s por prioridade e por
+        solicitante, fila média e máxima) e as janelas deslizantes de 1s,
+        10s e 60s (também por prioridade e por solicitante), todos mantidos
+        incrementalmente.
+        """
+        with self.lock:
+            snapshot = self.utilization.snapshot(self._now())
+        snapshot["bytes_per_sec_by_priority"] = {
+            priority.name: rate
+            for priority, rate in snapshot.pop("bytes_per_sec_by_key").items()
+        }
+        for window in snapshot["windows"].values():
+            window["bytes_per_sec_by_priority"] = {
+                priority.name: rate
+                for priority, rate in window.pop("bytes_per_sec_by_key").items()
             }
+        return snapshot
 
-    def simulate_arbitration(self, num_requests: int = 10) -> Dict[str, any]:
-        """Simula processo de arbitragem com múltiplas solicitações"""
-        import random
+    def simulate_arbitration(
+        self,
+        num_requests: int = 10,
+        seed: Optional[int] = None,
+        workload: Optional[WorkloadGenerator] = None,
+    ) -> Dict[str, any]:
+        """Simula processo de arbitragem com múltiplas solicitações
+
+        As prioridades e tamanhos são sorteados em lote por WorkloadGenerator;
+        com `seed` a simulação é reproduzível. `workload` substitui o gerador
+        padrão (por exemplo, para outra mistura de prioridades ou
+        distribuição de tamanhos) e nesse caso `seed` é ignorado.
+        """
+        if workload is None:
+            workload = WorkloadGenerator(seed)
+        if self.clock is not None:
+            return self._simulate_arbitration_on_clock(num_requests, workload=workload)
 
         start_time = time.time()
+        workload = workload.generate_all(num_requests)
+        priorities = list(BusPriority)
 
         # Gera solicitações aleatórias
         for i in range(num_requests):
             requester_id = i
-            priority = random.choice(list(BusPriority))
-            data_size = random.randint(64, 4096)
+            priority = priorities[workload.priorities[i]]
+            data_size = workload.sizes[i]
 
             granted = self.request_bus(requester_id, priority, data_size)
 
@@ -138,23 +1160,103 @@ class BusController:
 
         return status
 
+    def _simulate_arbitration_on_clock(
+        self,
+        num_requests: int,
+        request_interval_ns: int = 100_000,
+        seed: Optional[int] = None,
+        workload: Optional[WorkloadGenerator] = None,
+    ) -> Dict[str, any]:
+        """Simula a arbitragem em tempo virtual
+
+        As chegadas são eventos espaçados por `request_interval_ns` e cada
+        transferência concedida ocupa o barramento pelo tempo calculado a
+        partir de `data_size` e `bus_bandwidth`.
+        """
+        clock = self.clock
+        start_ns = clock.now
+        wall_start = time.perf_counter()
+        priorities = list(BusPriority)
+        if workload is None:
+            workload = WorkloadGenerator(seed)
+        workload = workload.generate_all(num_requests)
+
+        def finish(requester_id: int):
+            with self.lock:
+                request = self.active_transfers.pop(requester_id)
+                if request is None:
+                    return
+                granted = self._on_released(request)
+            if granted is not None:
+                clock.schedule(
+                    self.transfer_duration_ns(granted.data_size),
+                    finish,
+                    granted.requester_id,
+                )
+
+        def arrive(requester_id: int):
+            # Cada chegada agenda a seguinte, mantendo a fila de eventos pequena
+            if requester_id + 1 < num_requests:
+                clock.schedule(request_interval_ns, arrive, requester_id + 1)
+            data_size = workload.sizes[requester_id]
+            priority = priorities[workload.priorities[requester_id]]
+            if self.request_bus(requester_id, priority, data_size):
+                clock.schedule(
+                    self.transfer_duration_ns(data_size), finish, requester_id
+                )
+
+        if num_requests > 0:
+            clock.schedule(0, arrive, 0)
+        clock.run()
+
+        elapsed = (clock.now - start_ns) / NANOSECONDS_PER_SECOND
+        status = self.get_bus_status()
+        status["simulation_time"] = elapsed
+        status["wall_time"] = time.perf_counter() - wall_start
+        status["requests_per_second"] = num_requests / elapsed if elapsed > 0 else 0
+        return status
+
     def reset_statistics(self):
-        """Reseta as estatísticas do controlador"""
+        """Reseta as estatísticas do controlador
+
+        As solicitações pendentes são descartadas com o motivo "reset", o
+        que acorda wait_for_bus (False) e acquire (BusRequestDropped).
+        """
         with self.lock:
+            for request in list(self.pending_requests):
+                self._drop(request, "reset")
             self.total_requests = 0
             self.granted_requests = 0
             self.active_transfers.clear()
             self.pending_requests.clear()
+            for histogram in self.wait_histograms.values():
+                histogram.reset()
+            for histogram in self.hold_histograms.values():
+                histogram.reset()
+            self.max_wait_by_requester.clear()
+            self.starvation_counts.clear()
+            self._arrivals.clear()
+            self.shed_requests = 0
+            self.expired_requests = 0
+            self._deadlines.clear()
+            if self._arrivals_by_priority is not None:
+                for queue in self._arrivals_by_priority.values():
+                    queue.clear()
+            self.utilization.reset(self._now())
 
     def get_priority_distribution(self) -> Dict[str, int]:
         """Retorna distribuição de prioridades das solicitações pendentes"""
         with self.lock:
-            distribution = {priority.name: 0 for priority in BusPriority}
+            return {
+                priority.name: count
+                for priority, count in self.pending_requests.priority_counts.items()
+            }
 
-            for request in self.pending_requests:
-                distribution[request.priority.name] += 1
 
-            return distribution
+def _resolve_future(future: asyncio.Future):
+    """Marca o future de concessão como resolvido (executa no loop do future)"""
+    if not future.done():
+        future.set_result(True)
 
 
 class BusArbitrator:
@@ -162,16 +1264,22 @@ class BusArbitrator:
 
     def __init__(self, bus_controller: BusController):
         self.bus_controller = bus_controller
+        self._round_robin_pointer = 0
 
     def round_robin_arbitration(
         self, requests: List[BusRequest]
     ) -> Optional[BusRequest]:
-        """Algoritmo de arbitragem round-robin"""
+        """Algoritmo de arbitragem round-robin
+
+        Usa um ponteiro rotativo sobre a lista recebida. Para arbitragem
+        integrada ao controlador, use RoundRobinArbitration como política.
+        """
         if not requests:
             return None
 
-        # Implementação simples: retorna o primeiro da lista
-        return requests[0]
+        request = requests[self._round_robin_pointer % len(requests)]
+        self._round_robin_pointer += 1
+        return request
 
     def priority_based_arbitration(
         self, requests: List[BusRequest]
@@ -186,7 +1294,12 @@ class BusArbitrator:
     def fair_queuing_arbitration(
         self, requests: List[BusRequest]
     ) -> Optional[BusRequest]:
-        """Algoritmo de arbitragem com fila justa"""
+        """Algoritmo de arbitragem com fila justa
+
+        Recalcula a pontuação de toda a lista a cada chamada. Para
+        arbitragem integrada ao controlador, use AgingPriorityQueue ou
+        WeightedFairQueuing como política.
+        """
         if not requests:
             return None
 
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Métricas do Barramento - Latência, Utilização e Vazão
+Histogramas log-lineares (estilo HDR) com memória fixa para tempos de espera
+e de ocupação do barramento, e contabilidade incremental de utilização
+ponderada no tempo, vazão e profundidade de fila em janelas deslizantes
+"""
+
+from array import array
+from collections import deque
+from typing import Deque, Dict, Iterable
+
+
+class LogLinearHistogram:
+    """Histograma log-linear de memória fixa (estilo HdrHistogram)
+
+    Valores menores que 2**sub_bucket_bits têm um bucket cada; acima disso,
+    cada potência de dois é dividida em 2**(sub_bucket_bits - 1) buckets
+    lineares, o que limita o erro relativo a 2**-(sub_bucket_bits - 1).
+    Registrar um valor custa algumas operações de bits e um incremento.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7, max_value_bits: int = 40):
+        if sub_bucket_bits < 2 or max_value_bits <= sub_bucket_bits:
+            raise ValueError("Configuração de histograma inválida")
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value_bits = max_value_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._half_count = self._sub_count >> 1
+        self._max_shift = max_value_bits - sub_bucket_bits
+        num_buckets = self._sub_count + (
+            (max_value_bits - sub_bucket_bits) * self._half_count
+        )
+        self.counts = array("Q", bytes(8 * num_buckets))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        """Bucket de um valor (valores acima do limite vão para o último)"""
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift > self._max_shift:
+            return len(self.counts) - 1
+        # Equivale a sub_count + (shift - 1) * half_count + (topo - half_count)
+        return shift * self._half_count + (value >> shift)
+
+    def _highest_value(self, index: int) -> int:
+        """Maior valor equivalente ao bucket"""
+        if index < self._sub_count:
+            return index
+        offset = index - self._sub_count
+        shift = offset // self._half_count + 1
+        top = self._half_count + offset % self._half_count
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int):
+        """Registra um valor inteiro não negativo (por exemplo, em ns)"""
+        if value < 0:
+            value = 0
+        if value < self._sub_count:
+            self.counts[value] += 1
+        else:
+            self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentiles(self, fractions: Iterable[float]) -> Dict[float, int]:
+        """Calcula vários percentis em uma única varredura dos buckets"""
+        targets = sorted(fractions)
+        results: Dict[float, int] = {}
+        if self.count == 0:
+            return {fraction: 0 for fraction in targets}
+
+        position = 0
+        cumulative = 0
+        last_index = len(self.counts) - 1
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            # O último bucket acumula os valores acima do limite
+            value = (
+                self.max
+                if index == last_index
+                else min(self._highest_value(index), self.max)
+            )
+            while (
+                position < len(targets) and cumulative >= targets[position] * self.count
+            ):
+                results[targets[position]] = value
+                position += 1
+            if position == len(targets):
+                break
+        for fraction in targets[position:]:
+            results[fraction] = self.max
+        return results
+
+    def percentile(self, fraction: float) -> int:
+        """Valor abaixo do qual está a fração `fraction` (0-1) das amostras"""
+        return self.percentiles([fraction])[fraction]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Resumo: contagem, média, mínimo, p50/p90/p99 e máximo"""
+        values = self.percentiles([0.5, 0.9, 0.99])
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "min": self.min or 0,
+            "p50": values[0.5],
+            "p90": values[0.9],
+            "p99": values[0.99],
+            "max": self.max,
+        }
+
+    def merge(self, other: "LogLinearHistogram"):
+        """Soma as amostras de outro histograma com a mesma configuração"""
+        if (
+            other.sub_bucket_bits != self.sub_bucket_bits
+            or other.max_value_bits != self.max_value_bits
+        ):
+            raise ValueError("Histogramas com configurações diferentes")
+        counts = self.counts
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        """Descarta todas as amostras"""
+        self.counts = array("Q", bytes(8 * len(self.counts)))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+
+class UtilizationTracker:
+    """Utilização ponderada no tempo, vazão e profundidade de fila
+
+    Mantém incrementalmente, a cada enfileiramento, concessão e liberação, as
+    integrais no tempo do número de transferências ativas e de solicitações
+    pendentes e os bytes concedidos por chave (prioridade) e por solicitante.
+    As janelas deslizantes (por padrão 1s, 10s e 60s) são diferenças entre os
+    acumulados atuais e pontos de controle gravados a cada `resolution`
+    segundos, então nenhuma atualização ou consulta percorre as listas de
+    solicitações e o custo por evento é constante. Por solicitante, cada
+    ponto de controle guarda apenas os bytes dos solicitantes ativos desde o
+    ponto anterior, e a janela soma esses deltas. Depois de
+    `max_requesters` solicitantes distintos, os bytes dos novos solicitantes
+    são somados na chave None, mantendo a memória limitada.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        now: float = 0.0,
+        windows: Iterable[float] = (1.0, 10.0, 60.0),
+        resolution: float = 0.1,
+        max_requesters: int = 4096,
+    ):
+        if capacity <= 0 or resolution <= 0 or max_requesters <= 0:
+            raise ValueError("Configuração de utilização inválida")
+        self.capacity = capacity
+        self.max_requesters = max_requesters
+        self.windows = tuple(sorted(windows))
+        self.resolution = resolution
+        self.reset(now)
+
+    def reset(self, now: float = 0.0):
+        """Reinicia os acumulados e as janelas a partir de `now`"""
+        self.start_time = now
+        self.last_time = now
+        self.active = 0
+        self.pending = 0
+        self.max_pending = 0
+        self.busy_time = 0.0  # Soma de (transferências ativas x segundos)
+        self.queue_time = 0.0  # Soma de (solicitações pendentes x segundos)
+        self.bytes_granted = 0
+        self.bytes_by_key: Dict[object, int] = {}
+        self.bytes_by_requester: Dict[int, int] = {}
+        # Bytes por solicitante desde o último ponto de controle
+        self._recent_by_requester: Dict[int, int] = {}
+        # Pontos de controle: (tempo, ocupação, fila, bytes, bytes por chave,
+        # bytes por solicitante desde o ponto anterior)
+        history = int(round(self.windows[-1] / self.resolution)) + 2
+        self._checkpoints: Deque[tuple] = deque(maxlen=history)
+        self._checkpoints.append((now, 0.0, 0.0, 0, {}, {}))
+        self._next_tick = int(now // self.resolution) + 1
+
+    def _integrate(self, now: float):
+        """Acumula os níveis atuais até `now`"""
+        last = self.last_time
+        if now <= last:
+            return
+        resolution = self.resolution
+        if now >= self._next_tick * resolution:
+            self._checkpoint(now)
+        elapsed = now - last
+        self.busy_time += self.active * elapsed
+        self.queue_time += self.pending * elapsed
+        self.last_time = now
+
+    def _checkpoint(self, now: float):
+        """Grava os pontos de controle das bordas entre last_time e `now`"""
+        resolution = self.resolution
+        last_tick = int(now // resolution)
+        # Bordas que sairiam do histórico não precisam ser gravadas
+        first_tick = max(self._next_tick, last_tick - self._checkpoints.maxlen + 1)
+        by_key = dict(self.bytes_by_key)
+        # As concessões pendentes de registro ocorreram antes da primeira borda
+        recent = self._recent_by_requester
+        self._recent_by_requester = {}
+        for tick in range(first_tick, last_tick + 1):
+            time_point = tick * resolution
+            elapsed = time_point - self.last_time
+            self._checkpoints.append(
+                (
+                    time_point,
+                    self.busy_time + self.active * elapsed,
+                    self.queue_time + self.pending * elapsed,
+                    self.bytes_granted,
+                    by_key,
+                    recent,
+                )
+            )
+            recent = {}
+        self._next_tick = last_tick + 1
+
+    def observe(self, now: float, active: int, pending: int):
+        """Registra os novos níveis de ocupação e de fila a partir de `now`"""
+        self._integrate(now)
+        self.active = active
+        self.pending = pending
+        if pending > self.max_pending:
+            self.max_pending = pending
+
+    def record_grant(self, key, requester_id: int, data_size: int):
+        """Contabiliza os bytes de uma concessão"""
+        self.bytes_granted += data_size
+        self.bytes_by_key[key] = self.bytes_by_key.get(key, 0) + data_size
+        by_requester = self.bytes_by_requester
+        if requester_id not in by_requester and len(by_requester) >= (
+            self.max_requesters
+        ):
+            requester_id = None  # Demais solicitantes
+        by_requester[requester_id] = by_requester.get(requester_id, 0) + data_size
+        recent = self._recent_by_requester
+        recent[requester_id] = recent.get(requester_id, 0) + data_size
+
+    @property
+    def utilization(self) -> float:
+        """Utilização média ponderada no tempo desde o início (0-100)"""
+        elapsed = self.last_time - self.start_time
+        if elapsed <= 0:
+            return 0.0
+        return self.busy_time / (self.capacity * elapsed) * 100
+
+    def _rates(self, since: tuple) -> Dict[str, object]:
+        """Taxas entre um ponto de controle e o instante atual"""
+        time_point, busy, queue, granted, by_key = since[:5]
+        span = self.last_time - time_point
+
+        def rate(amount: float) -> float:
+            return amount / span if span > 0 else 0.0
+
+        return {
+            "span": span,
+            "utilization": rate(self.busy_time - busy) / self.capacity * 100,
+            "mean_queue_depth": rate(self.queue_time - queue),
+            "bytes_per_sec": rate(self.bytes_granted - granted),
+            "bytes_per_sec_by_key": {
+                key: rate(total - by_key.get(key, 0))
+                for key, total in self.bytes_by_key.items()
+            },
+        }
+
+    def snapshot(self, now: float) -> Dict[str, object]:
+        """Resumo acumulado e por janela até o instante `now`
+
+        Cada janela usa o ponto de controle mais recente com pelo menos
+        `window` segundos de idade (ou o início, se a execução for mais
+        curta); "span" informa o intervalo efetivamente coberto.
+        """
+        self._integrate(now)
+        checkpoints = self._checkpoints
+        windows = {}
+        for window in self.windows:
+            index = 0
+            for position in range(len(checkpoints) - 1, -1, -1):
+                if checkpoints[position][0] <= self.last_time - window:
+                    index = position
+                    break
+            rates = self._rates(checkpoints[index])
+            span = rates["span"]
+            by_requester = dict(self._recent_by_requester)
+            for position in range(index + 1, len(checkpoints)):
+                for requester_id, amount in checkpoints[position][5].items():
+                    by_requester[requester_id] = (
+                        by_requester.get(requester_id, 0) + amount
+                    )
+            rates["bytes_per_sec_by_requester"] = {
+                requester_id: (amount / span if span > 0 else 0.0)
+                for requester_id, amount in by_requester.items()
+            }
+            windows[f"{window:g}s"] = rates
+
+        overall = self._rates((self.start_time, 0.0, 0.0, 0, {}))
+        elapsed = overall.pop("span")
+        overall.update(
+            {
+                "elapsed": elapsed,
+                "max_queue_depth": self.max_pending,
+                "bytes_granted": self.bytes_granted,
+                "bytes_per_sec_by_requester": {
+                    requester_id: (total / elapsed if elapsed > 0 else 0.0)
+                    for requester_id, total in self.bytes_by_requester.items()
+                },
+                "windows": windows,
+            }
+        )
+        return overall
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modelo de Custo em Ciclos - E/S Programada vs DMA
+Calcula analiticamente, em lote, os ciclos de measure_programmed_io e
+measure_dma_transfer (asmpipe_dma.asm) para cargas arbitrárias e encontra o
+tamanho de transferência a partir do qual o DMA vence
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+from dma_simulator import (
+    DMA_ARBITRATION_CYCLES,
+    DMA_BURST_SIZE,
+    DMA_SETUP_CYCLES,
+    PIO_CYCLES_PER_BYTE,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele usa listas
+    np = None
+
+
+class CostSweep(NamedTuple):
+    """Colunas de uma varredura (uma linha por configuração)"""
+
+    sizes: List[int]
+    channels: List[int]
+    pio_cycles: List[float]
+    dma_cycles: List[float]
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def dma_wins(self) -> int:
+        """Quantidade de configurações em que o DMA gasta menos ciclos"""
+        return sum(dma < pio for pio, dma in zip(self.pio_cycles, self.dma_cycles))
+
+
+class CycleCostModel:
+    """Custo em ciclos de transferências por E/S programada e por DMA
+
+    Cada configuração é um lote de `channels` transferências de `size`
+    bytes executadas ao mesmo tempo, uma por canal.
+
+    E/S programada: a CPU copia uma transferência após a outra, gastando
+    `pio_cycles_per_byte` por byte (o `.pio_loop` soma 3).
+
+    DMA: a CPU programa cada canal em `setup_cycles` e o barramento leva um
+    ciclo por byte na fase de dados. Cada transação de até `burst_size`
+    bytes paga `arbitration_cycles` (como DMAController.transfer_cycles com
+    burst_length) e, com vários canais ativos, uma rodada extra de
+    arbitragem por canal concorrente, ponderada por `contention` (0 = sem
+    conflitos, 1 = conflito a cada transação, como em dma_request_bus).
+
+    Os métodos aceitam colunas inteiras e as calculam em uma passada, com
+    NumPy quando disponível.
+    """
+
+    def __init__(
+        self,
+        pio_cycles_per_byte: float = PIO_CYCLES_PER_BYTE,
+        setup_cycles: int = DMA_SETUP_CYCLES,
+        burst_size: int = DMA_BURST_SIZE,
+        arbitration_cycles: int = DMA_ARBITRATION_CYCLES,
+        contention: float = 1.0,
+        use_numpy: Optional[bool] = None,
+    ):
+        if pio_cycles_per_byte <= 0 or burst_size < 1:
+            raise ValueError("Parâmetros de custo inválidos")
+        if not 0.0 <= contention <= 1.0:
+            raise ValueError("A contenção deve estar entre 0 e 1")
+        if use_numpy and np is None:
+            raise ImportError("NumPy não está instalado")
+        self.pio_cycles_per_byte = pio_cycles_per_byte
+        self.setup_cycles = setup_cycles
+        self.burst_size = burst_size
+        self.arbitration_cycles = arbitration_cycles
+        self.contention = contention
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+
+    def transaction_overhead(self, channels: int = 1) -> float:
+        """Ciclos de arbitragem de cada transação com `channels` canais ativos"""
+        return self.arbitration_cycles * (1 + self.contention * (channels - 1))
+
+    def pio_cycles(
+        self, sizes: Sequence[int], channels: Union[int, Sequence[int]] = 1
+    ) -> List[float]:
+        """Ciclos de CPU da E/S programada para cada lote"""
+        per_byte = self.pio_cycles_per_byte
+        if self.use_numpy:
+            return (np.asarray(sizes) * np.asarray(channels) * per_byte).tolist()
+        if isinstance(channels, int):
+            channels = itertools.repeat(channels)
+        return [size * count * per_byte for size, count in zip(sizes, channels)]
+
+    def dma_cycles(
+        self, sizes: Sequence[int], channels: Union[int, Sequence[int]] = 1
+    ) -> List[float]:
+        """Ciclos até a conclusão de cada lote por DMA
+
+        `channels` é o número de canais ativos: um valor para todo o lote ou
+        uma coluna do mesmo comprimento de `sizes`.
+        """
+        burst, setup = self.burst_size, self.setup_cycles
+        arbitration, contention = self.arbitration_cycles, self.contention
+        if self.use_numpy:
+            sizes = np.asarray(sizes, dtype=np.int64)
+            channels = np.asarray(channels, dtype=np.int64)
+            transactions = -(-sizes // burst)
+            overhead = arbitration * (1 + contention * (channels - 1))
+            return (channels * (setup + sizes + transactions * overhead)).tolist()
+        if isinstance(channels, int):
+            channels = itertools.repeat(channels)
+        return [
+            count
+            * (
+                setup
+                + size
+                + -(-size // burst) * arbitration * (1 + contention * (count - 1))
+            )
+            for size, count in zip(sizes, channels)
+        ]
+
+    def sweep(self, sizes: Sequence[int], channel_counts: Sequence[int]) -> CostSweep:
+        """Avalia todas as combinações de tamanho e número de canais"""
+        if self.use_numpy:
+            grid_channels = np.repeat(np.asarray(channel_counts), len(sizes))
+            grid_sizes = np.tile(np.asarray(sizes), len(channel_counts))
+            grid_channels, grid_sizes = grid_channels.tolist(), grid_sizes.tolist()
+        else:
+            grid_channels = [c for c in channel_counts for _ in range(len(sizes))]
+            grid_sizes = list(sizes) * len(channel_counts)
+        return CostSweep(
+            grid_sizes,
+            grid_channels,
+            self.pio_cycles(grid_sizes, grid_channels),
+            self.dma_cycles(grid_sizes, grid_channels),
+        )
+
+    def crossover(self, channels: int = 1) -> Optional[int]:
+        """Menor tamanho a partir do qual o DMA vence em todos os tamanhos
+
+        Por byte, o DMA gasta no máximo 1 + sobrecarga / burst ciclos; se
+        isso não for menor que o custo da E/S programada, o DMA nunca vence
+        (None). Caso contrário, o custo fixo (programação e uma transação
+        parcial) limita o intervalo em que a E/S programada ainda pode
+        vencer, e só esse intervalo é avaliado.
+        """
+        overhead = self.transaction_overhead(channels)
+        margin = self.pio_cycles_per_byte - 1 - overhead / self.burst_size
+        if margin <= 0:
+            return None
+        limit = int((self.setup_cycles + overhead) / margin) + 2
+        sizes = range(1, limit + 1)
+        pio = self.pio_cycles(sizes, channels)
+        dma = self.dma_cycles(sizes, channels)
+        # Último tamanho em que a E/S programada não perde
+        for size in reversed(sizes):
+            if dma[size - 1] >= pio[size - 1]:
+                return size + 1
+        return 1
+
+    def crossover_table(
+        self, channel_counts: Sequence[int]
+    ) -> Dict[int, Optional[int]]:
+        """Ponto de cruzamento para cada número de canais ativos"""
+        return {channels: self.crossover(channels) for channels in channel_counts}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando"""
+    parser = argparse.ArgumentParser(description="Custo E/S programada vs DMA")
+    parser.add_argument("--pio-cycles", type=float, default=PIO_CYCLES_PER_BYTE)
+    parser.add_argument("--setup-cycles", type=int, default=DMA_SETUP_CYCLES)
+    parser.add_argument("--burst", type=int, default=DMA_BURST_SIZE)
+    parser.add_argument("--contention", type=float, default=1.0)
+    parser.add_argument("--max-channels", type=int, default=8)
+    parser.add_argument("--max-size", type=int, default=65536)
+    args = parser.parse_args(argv)
+
+    model = CycleCostModel(
+        args.pio_cycles,
+        setup_cycles=args.setup_cycles,
+        burst_size=args.burst,
+        contention=args.contention,
+    )
+    channel_counts = range(1, args.max_channels + 1)
+    for channels, size in model.crossover_table(channel_counts).items():
+        result = "nunca" if size is None else f"a partir de {size} bytes"
+        print(f"{channels} canal(is) ativo(s): DMA vence {result}")
+
+    start = time.perf_counter()
+    sweep = model.sweep(range(1, args.max_size + 1), channel_counts)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Varredura: {len(sweep):,} configurações em {elapsed:.2f} s, "
+        f"DMA vence em {sweep.dma_wins():,}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
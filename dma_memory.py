@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memória Física Simulada - Módulo de Memória para DMA
+Espaço de endereçamento onde as transferências DMA copiam bytes de verdade
+"""
+
+import mmap
+import os
+from typing import Optional
+
+
+class MemoryAccessError(Exception):
+    """Acesso fora dos limites da memória simulada"""
+
+
+class PhysicalMemory:
+    """Memória física simulada baseada em bytearray
+
+    Todas as operações usam fatias de memoryview, então uma transferência
+    DMA é uma única cópia em bloco (memmove), sem trabalho por byte.
+    """
+
+    def __init__(self, size: int = 1 << 20):
+        if size <= 0:
+            raise ValueError("O tamanho da memória deve ser positivo")
+        self.size = size
+        self._buffer = bytearray(size)
+        self.view = memoryview(self._buffer)
+
+    def _check_range(self, address: int, length: int):
+        """Valida se [address, address + length) está dentro da memória"""
+        if address < 0 or length < 0 or address + length > self.size:
+            raise MemoryAccessError(
+                f"Acesso inválido: endereço 0x{address:X}, {length} bytes "
+                f"(memória de {self.size} bytes)"
+            )
+
+    def read(self, address: int, length: int) -> memoryview:
+        """Retorna uma visão (sem cópia) da região solicitada"""
+        self._check_range(address, length)
+        return self.view[address : address + length]
+
+    def write(self, address: int, data) -> int:
+        """Escreve `data` (qualquer objeto com buffer protocol) no endereço"""
+        data = memoryview(data).cast("B")
+        self._check_range(address, len(data))
+        self.view[address : address + len(data)] = data
+        return len(data)
+
+    def fill(self, address: int, length: int, value: int = 0):
+        """Preenche uma região com um valor de byte"""
+        self._check_range(address, length)
+        self.view[address : address + length] = bytes([value]) * length
+
+    def copy(self, source: int, destination: int, length: int) -> int:
+        """Copia `length` bytes de `source` para `destination` em bloco
+
+        Regiões sobrepostas são tratadas como memmove.
+        """
+        self._check_range(source, length)
+        self._check_range(destination, length)
+        view = self.view
+        view[destination : destination + length] = view[source : source + length]
+        return length
+
+    def compare(self, source: int, destination: int, length: int) -> bool:
+        """Verifica se duas regiões possuem o mesmo conteúdo"""
+        return self.read(source, length) == self.read(destination, length)
+
+    def first_mismatch(
+        self, source: int, destination: int, length: int
+    ) -> Optional[int]:
+        """Retorna o deslocamento do primeiro byte divergente (ou None)"""
+        src = self.read(source, length)
+        dst = self.read(destination, length)
+        if src == dst:
+            return None
+        # Busca binária sobre fatias: compara blocos inteiros em C
+        low, high = 0, length
+        while high - low > 1:
+            middle = (low + high) // 2
+            if src[low:middle] == dst[low:middle]:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def release(self):
+        """Libera a visão da memória"""
+        self.view.release()
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class MappedMemory(PhysicalMemory):
+    """Memória simulada mapeada de um arquivo esparso (mmap)
+
+    Permite espaços de endereçamento de vários GB: o arquivo é criado com
+    truncate (esparso), então apenas as páginas tocadas ocupam RAM e disco.
+    A imagem pode ser persistida com flush() e reaberta em outra execução
+    passando o mesmo caminho sem `size`.
+    """
+
+    def __init__(self, path: str, size: Optional[int] = None):
+        exists = os.path.exists(path)
+        if size is None:
+            if not exists:
+                raise ValueError("Informe o tamanho para criar uma nova imagem")
+            size = os.path.getsize(path)
+        if size <= 0:
+            raise ValueError("O tamanho da memória deve ser positivo")
+
+        self.path = path
+        self.size = size
+        self._file = open(path, "r+b" if exists else "w+b")
+        if os.fstat(self._file.fileno()).st_size < size:
+            self._file.truncate(size)
+        self._buffer = mmap.mmap(self._file.fileno(), size)
+        self.view = memoryview(self._buffer)
+
+    def flush(self):
+        """Grava as páginas modificadas no arquivo de imagem"""
+        self._buffer.flush()
+
+    def release(self):
+        """Persiste e fecha o mapeamento e o arquivo
+
+        Visões retornadas por read() precisam ter sido liberadas antes.
+        """
+        if self._file.closed:
+            return
+        self.flush()
+        self.view.release()
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedMemory":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
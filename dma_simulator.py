@@ -6,50 +6,171 @@ Simula o comportamento de um controlador DMA para fins educacionais
 """
 
 import time
+import asyncio
 import random
-from typing import Dict, List, Tuple, Optional
+import threading
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import cycle, islice
+from operator import add
+from typing import Dict, List, NamedTuple, Tuple, Optional, Sequence
+
+from dma_memory import MemoryAccessError, PhysicalMemory
+from simulation_clock import (
+    DEFAULT_BUS_BANDWIDTH,
+    NANOSECONDS_PER_SECOND,
+    SimulationClock,
+    transfer_duration_ns,
+)
+
+# Códigos de status - os mesmos de dma_controller.asm
+DMA_IDLE = 0
+DMA_ACTIVE = 1
+DMA_COMPLETE = 2
+DMA_ERROR = 3
+# Exclusivo do modelo Python: canal programado, transferência não iniciada
+DMA_CONFIGURED = 4
+
+STATUS_NAMES = ("IDLE", "ACTIVE", "COMPLETE", "ERROR", "CONFIGURED")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# Custo em ciclos de barramento (um byte por ciclo na fase de dados).
+# DMA_BURST_SIZE e DMA_ARBITRATION_CYCLES são os de dma_advanced.asm
+DMA_BURST_SIZE = 8
+DMA_ARBITRATION_CYCLES = 4  # Arbitragem e endereço de cada transação
+DMA_SETUP_CYCLES = 16  # CPU programando os registradores do canal
+DMA_DESCRIPTOR_CYCLES = 4  # Canal buscando o próximo descritor da cadeia
+# E/S programada: ciclos de CPU por byte copiado (.pio_loop de asmpipe_dma.asm)
+PIO_CYCLES_PER_BYTE = 3
+
+
+class DMADescriptor(NamedTuple):
+    """Segmento de uma cadeia scatter-gather"""
+
+    source: int
+    destination: int
+    length: int
+
+
+class ChannelTable:
+    """Tabela de canais no formato struct-of-arrays
+
+    Espelha o registro de 32 bytes de `dma_channels` (dma_controller.asm):
+    cada campo do registro é uma coluna `array`, então uma tabela com
+    milhares de canais ocupa poucos blocos contíguos e pode ser varrida e
+    atualizada em massa.
+    """
+
+    def __init__(self, num_channels: int):
+        self.size = num_channels
+        self.source = array("q", [0]) * num_channels
+        self.destination = array("q", [0]) * num_channels
+        self.count = array("q", [0]) * num_channels
+        self.type = array("i", [0]) * num_channels
+        self.status = array("B", [DMA_IDLE]) * num_channels
+        self.current = array("q", [0]) * num_channels
+        self.remaining = array("q", [0]) * num_channels
+
+    def reset_status(self, code: int = DMA_IDLE):
+        """Define o mesmo status para todos os canais"""
+        self.status[:] = array("B", [code]) * self.size
+
+    def count_status(self, code: int) -> int:
+        """Conta os canais com o status informado"""
+        return self.status.count(code)
+
+    def find_status(self, code: int) -> int:
+        """Retorna o primeiro canal com o status informado (ou -1)"""
+        try:
+            return self.status.index(code)
+        except ValueError:
+            return -1
+
+    def status_counts(self) -> Dict[str, int]:
+        """Retorna a quantidade de canais em cada status"""
+        return {name: self.status.count(code) for code, name in enumerate(STATUS_NAMES)}
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def _column(name: str, doc: str) -> property:
+    """Cria uma propriedade que lê/escreve uma coluna da ChannelTable"""
+
+    def getter(self):
+        return getattr(self._table, name)[self._row]
+
+    def setter(self, value):
+        getattr(self._table, name)[self._row] = value
+
+    return property(getter, setter, doc=doc)
 
 
 class DMAChannel:
-    """Representa um canal DMA individual"""
+    """Representa um canal DMA individual
 
-    def __init__(self, channel_id: int):
+    O estado fica em uma linha de ChannelTable; o objeto é apenas uma visão.
+    Sem tabela, o canal cria uma tabela própria de uma linha.
+    """
+
+    __slots__ = ("channel_id", "_table", "_row")
+
+    def __init__(self, channel_id: int, table: Optional[ChannelTable] = None):
         self.channel_id = channel_id
-        self.source_address = 0
-        self.destination_address = 0
-        self.transfer_size = 0
-        self.transfer_type = 0
-        self.status = "IDLE"
-        self.current_address = 0
-        self.remaining_bytes = 0
+        if table is None:
+            table, row = ChannelTable(1), 0
+        else:
+            row = channel_id
+        self._table = table
+        self._row = row
+
+    source_address = _column("source", "Endereço de origem")
+    destination_address = _column("destination", "Endereço de destino")
+    transfer_size = _column("count", "Tamanho da transferência")
+    transfer_type = _column("type", "Tipo da transferência")
+    current_address = _column("current", "Endereço atual")
+    remaining_bytes = _column("remaining", "Bytes restantes")
+    status_code = _column("status", "Código de status (DMA_IDLE, ...)")
+
+    @property
+    def status(self) -> str:
+        """Status do canal como texto"""
+        return STATUS_NAMES[self._table.status[self._row]]
+
+    @status.setter
+    def status(self, value: str):
+        self._table.status[self._row] = STATUS_CODES[value]
 
     def configure(
         self, source: int, destination: int, size: int, transfer_type: int
     ) -> bool:
         """Configura o canal DMA"""
-        if self.status != "IDLE":
+        table, row = self._table, self._row
+        # Assim como dma_setup_channel, um canal concluído pode ser reprogramado
+        if table.status[row] not in (DMA_IDLE, DMA_COMPLETE):
             return False
 
-        self.source_address = source
-        self.destination_address = destination
-        self.transfer_size = size
-        self.transfer_type = transfer_type
-        self.current_address = source
-        self.remaining_bytes = size
-        self.status = "CONFIGURED"
+        table.source[row] = source
+        table.destination[row] = destination
+        table.count[row] = size
+        table.type[row] = transfer_type
+        table.current[row] = source
+        table.remaining[row] = size
+        table.status[row] = DMA_CONFIGURED
         return True
 
     def start_transfer(self) -> bool:
         """Inicia a transferência DMA"""
-        if self.status != "CONFIGURED":
+        if self._table.status[self._row] != DMA_CONFIGURED:
             return False
 
-        self.status = "ACTIVE"
+        self._table.status[self._row] = DMA_ACTIVE
         return True
 
     def is_busy(self) -> bool:
         """Verifica se o canal está ocupado"""
-        return self.status == "ACTIVE"
+        return self._table.status[self._row] == DMA_ACTIVE
 
     def get_status(self) -> str:
         """Retorna o status atual do canal"""
@@ -59,19 +180,70 @@ class DMAChannel:
 class DMAController:
     """Controlador DMA principal"""
 
-    def __init__(self, num_channels: int = 4):
-        self.channels = [DMAChannel(i) for i in range(num_channels)]
+    def __init__(
+        self,
+        num_channels: int = 4,
+        clock: Optional[SimulationClock] = None,
+        bus_bandwidth: int = DEFAULT_BUS_BANDWIDTH,
+        memory: Optional[PhysicalMemory] = None,
+        max_workers: Optional[int] = None,
+        burst_length: Optional[int] = None,
+    ):
+        if burst_length is not None and burst_length < 1:
+            raise ValueError("O tamanho do burst deve ser positivo")
+        self.channel_table = ChannelTable(num_channels)
+        self.channels = [DMAChannel(i, self.channel_table) for i in range(num_channels)]
+        self.clock = clock
+        self.bus_bandwidth = bus_bandwidth
+        self.memory = memory
+        # Sem burst_length a duração depende só da banda (sem overhead)
+        self.burst_length = burst_length
+        # Cadeia de descritores programada em cada canal (mantida após a
+        # conclusão para verify_transfer, até a próxima programação)
+        self._chains: Dict[int, List[DMADescriptor]] = {}
+
+        # Um lock por canal e um lock para as estatísticas
+        self._channel_locks = [threading.Lock() for _ in range(num_channels)]
+        self._stats_lock = threading.Lock()
+
+        # Modo worker pool: cada transferência iniciada roda em uma thread
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[int, Future] = {}
+        # Modo relógio: último evento de conclusão agendado em cada canal
+        self._scheduled: Dict[int, list] = {}
+        # Futures asyncio aguardando a conclusão de cada canal
+        self._completion_waiters: Dict[int, List[Tuple]] = {}
+        if max_workers is not None:
+            if clock is not None:
+                raise ValueError(
+                    "O modo worker pool usa tempo real e não pode ser "
+                    "combinado com um relógio de simulação"
+                )
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="dma-channel"
+            )
         self.transfers_completed = 0
         self.bytes_transferred = 0
         self.cycles_saved = 0
+        self.bus_cycles = 0
 
     def initialize(self) -> bool:
         """Inicializa o controlador DMA"""
-        for channel in self.channels:
-            channel.status = "IDLE"
-        self.transfers_completed = 0
-        self.bytes_transferred = 0
-        self.cycles_saved = 0
+        # Transferências do worker pool precisam terminar antes do reset
+        for future in list(self._futures.values()):
+            future.result()
+        self._futures.clear()
+        # Eventos de conclusão pendentes concluiriam a próxima transferência
+        for event in self._scheduled.values():
+            self.clock.cancel(event)
+        self._scheduled.clear()
+        self._chains.clear()
+        self.channel_table.reset_status(DMA_IDLE)
+        with self._stats_lock:
+            self.transfers_completed = 0
+            self.bytes_transferred = 0
+            self.cycles_saved = 0
+            self.bus_cycles = 0
         return True
 
     def setup_channel(
@@ -86,13 +258,67 @@ class DMAController:
         if channel_id >= len(self.channels):
             return -1  # Canal inválido
 
+        if size < 0:
+            return -3  # Tamanho inválido
+        if self.memory is not None and (
+            min(source, destination) < 0
+            or max(source, destination) + size > self.memory.size
+        ):
+            return -3  # Região fora da memória simulada
+
         channel = self.channels[channel_id]
-        if channel.is_busy():
-            return -2  # Canal ocupado
+        with self._channel_locks[channel_id]:
+            if channel.is_busy():
+                return -2  # Canal ocupado
 
-        if channel.configure(source, destination, size, transfer_type):
-            return 0  # Sucesso
-        return -3  # Erro na configuração
+            if channel.configure(source, destination, size, transfer_type):
+                self._chains.pop(channel_id, None)
+                return 0  # Sucesso
+            return -3  # Erro na configuração
+
+    def setup_chain(
+        self,
+        channel_id: int,
+        descriptors: Sequence[Tuple[int, int, int]],
+        transfer_type: int = 0,
+    ) -> int:
+        """Programa uma cadeia de descritores (scatter-gather) em um canal
+
+        `descriptors` é a lista ligada de segmentos (origem, destino,
+        tamanho). Após start_transfer o canal percorre todos os segmentos sem
+        voltar ao chamador e sinaliza uma única conclusão no fim; a
+        programação do canal é paga uma vez, e cada segmento custa apenas a
+        busca do descritor. Retorna os mesmos códigos de setup_channel.
+        """
+        if channel_id >= len(self.channels):
+            return -1  # Canal inválido
+
+        chain = [DMADescriptor(*descriptor) for descriptor in descriptors]
+        if not chain or min(segment.length for segment in chain) < 0:
+            return -3  # Cadeia vazia ou segmento inválido
+        if self.memory is not None and (
+            min(min(segment.source, segment.destination) for segment in chain) < 0
+            or max(
+                max(segment.source, segment.destination) + segment.length
+                for segment in chain
+            )
+            > self.memory.size
+        ):
+            return -3  # Região fora da memória simulada
+
+        channel = self.channels[channel_id]
+        first = chain[0]
+        with self._channel_locks[channel_id]:
+            if channel.is_busy():
+                return -2  # Canal ocupado
+
+            total = sum(segment.length for segment in chain)
+            if not channel.configure(
+                first.source, first.destination, total, transfer_type
+            ):
+                return -3  # Erro na configuração
+            self._chains[channel_id] = chain
+            return 0
 
     def start_transfer(self, channel_id: int) -> int:
         """Inicia transferência em um canal específico"""
@@ -100,15 +326,366 @@ class DMAController:
             return -1  # Canal inválido
 
         channel = self.channels[channel_id]
-        if channel.start_transfer():
-            # Simula transferência
-            time.sleep(0.001)  # Simula tempo de transferência
+        with self._channel_locks[channel_id]:
+            if not channel.start_transfer():
+                return -2  # Erro ao iniciar
+
+            chain = self._chains.get(channel_id)
+            if chain is None:
+                complete, args = self._complete_transfer, (channel,)
+            else:
+                complete, args = self._complete_chain, (channel, chain)
+
+            if self.clock is not None:
+                # Tempo virtual: a conclusão vira um evento no relógio
+                if chain is None:
+                    duration = self.transfer_duration_ns(channel.transfer_size)
+                else:
+                    duration = self.chain_duration_ns(chain)
+                self._scheduled[channel_id] = self.clock.schedule(
+                    duration, complete, *args
+                )
+                return 0  # Sucesso (transferência em andamento)
+
+            if self._executor is not None:
+                # Worker pool: a cópia roda em paralelo com o chamador
+                self._futures[channel_id] = self._executor.submit(complete, *args)
+                return 0  # Sucesso (transferência em andamento)
+
+        # Simula transferência
+        time.sleep(0.001)  # Simula tempo de transferência
+        complete(*args)
+        return 0  # Sucesso
+
+    def _complete_transfer(self, channel: DMAChannel):
+        """Finaliza a transferência de um canal e atualiza as estatísticas"""
+        if self.memory is not None:
+            # Uma única cópia em bloco, como o laço de dma_start_transfer
+            try:
+                self.memory.copy(
+                    channel.source_address,
+                    channel.destination_address,
+                    channel.transfer_size,
+                )
+            except MemoryAccessError as error:
+                self._fail_channel(channel, error)
+                raise
+        self._finish_channel(channel)
+        size = channel.transfer_size
+        self._account(1, size, self.transfer_cycles((size,)))
+
+    def _complete_chain(self, channel: DMAChannel, chain: List[DMADescriptor]):
+        """Percorre a cadeia de descritores e finaliza o canal uma única vez"""
+        if self.memory is not None:
+            view = self.memory.view
+            for source, destination, length in chain:
+                view[destination : destination + length] = view[
+                    source : source + length
+                ]
+        last = chain[-1]
+        channel.current_address = last.source + last.length
+        self._finish_channel(channel)
+        lengths = [segment.length for segment in chain]
+        self._account(1, sum(lengths), self.transfer_cycles(lengths, chained=True))
+
+    def _finish_channel(self, channel: DMAChannel):
+        """Marca o canal como concluído e acorda quem aguarda por ele"""
+        with self._channel_locks[channel.channel_id]:
             channel.status = "COMPLETE"
-            self.transfers_completed += 1
-            self.bytes_transferred += channel.transfer_size
-            self.cycles_saved += channel.transfer_size * 2  # Estimativa
-            return 0  # Sucesso
-        return -2  # Erro ao iniciar
+            channel.remaining_bytes = 0
+            waiters = self._completion_waiters.pop(channel.channel_id, None)
+        if waiters:
+            for loop, future in waiters:
+                loop.call_soon_threadsafe(_resolve_future, future)
+
+    def _fail_channel(self, channel: DMAChannel, error: Exception):
+        """Marca o canal com erro e repassa a exceção a quem aguarda por ele
+
+        Como em dma_setup_channel, o canal só volta a ser programável depois
+        de initialize.
+        """
+        with self._channel_locks[channel.channel_id]:
+            channel.status = "ERROR"
+            waiters = self._completion_waiters.pop(channel.channel_id, None)
+        if waiters:
+            for loop, future in waiters:
+                loop.call_soon_threadsafe(_reject_future, future, error)
+
+    async def transfer(
+        self,
+        channel_id: int,
+        source: int,
+        destination: int,
+        size: int,
+        transfer_type: int = 0,
+    ) -> int:
+        """Versão assíncrona de setup_channel + start_transfer
+
+        Retorna quando a transferência termina, com os mesmos códigos de
+        erro. No modo padrão a espera usa asyncio.sleep; com relógio de
+        simulação ou worker pool, a corrotina aguarda o evento de conclusão
+        (o relógio precisa ser avançado por outra tarefa).
+        """
+        result = self.setup_channel(
+            channel_id, source, destination, size, transfer_type
+        )
+        if result != 0:
+            return result
+
+        channel = self.channels[channel_id]
+        if self.clock is None and self._executor is None:
+            with self._channel_locks[channel_id]:
+                if not channel.start_transfer():
+                    return -2
+            await asyncio.sleep(0.001)  # Simula tempo de transferência
+            self._complete_transfer(channel)
+            return 0
+
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        waiter = (loop, done)
+        with self._channel_locks[channel_id]:
+            self._completion_waiters.setdefault(channel_id, []).append(waiter)
+        result = self.start_transfer(channel_id)
+        if result != 0:
+            with self._channel_locks[channel_id]:
+                self._completion_waiters.get(channel_id, []).remove(waiter)
+            return result
+        await done
+        return 0
+
+    def _account(self, transfers: int, num_bytes: int, cycles: int):
+        """Atualiza os contadores de desempenho de forma atômica"""
+        with self._stats_lock:
+            self.transfers_completed += transfers
+            self.bytes_transferred += num_bytes
+            # Ciclos de CPU que a E/S programada gastaria (como em dma_controller.asm)
+            self.cycles_saved += num_bytes * PIO_CYCLES_PER_BYTE
+            self.bus_cycles += cycles
+
+    def submit_many(
+        self,
+        channel_ids: Optional[Sequence[int]],
+        sources: Sequence[int],
+        destinations: Sequence[int],
+        sizes: Sequence[int],
+        transfer_types: Optional[Sequence[int]] = None,
+    ) -> int:
+        """Configura e inicia um lote de transferências de uma só vez
+
+        Aceita sequências paralelas (listas, array('Q'), arrays NumPy). Com
+        `channel_ids=None` o lote é distribuído em round-robin pelos canais.
+        A validação usa reduções sobre o lote inteiro e os contadores são
+        atualizados uma vez por lote; cada canal executa suas transferências
+        em sequência. Retorna os mesmos códigos de setup_channel.
+        """
+        count = len(sizes)
+        num_channels = len(self.channels)
+        if channel_ids is None:
+            channel_ids = array("q", islice(cycle(range(num_channels)), count))
+        if not (
+            len(channel_ids) == len(sources) == len(destinations) == count
+            and (transfer_types is None or len(transfer_types) == count)
+        ):
+            return -3  # Vetores de tamanhos diferentes
+        if count == 0:
+            return 0
+
+        if min(channel_ids) < 0 or max(channel_ids) >= num_channels:
+            return -1  # Canal inválido
+
+        if min(sizes) < 0:
+            return -3
+        if self.memory is not None and (
+            min(sources) < 0
+            or min(destinations) < 0
+            or max(map(add, sources, sizes)) > self.memory.size
+            or max(map(add, destinations, sizes)) > self.memory.size
+        ):
+            return -3  # Região fora da memória simulada
+
+        # Última transferência de cada canal: define o estado final do canal
+        last_index = {channel_id: i for i, channel_id in enumerate(channel_ids)}
+        with ExitStack() as stack:
+            # Locks adquiridos em ordem crescente para evitar deadlock
+            for channel_id in sorted(last_index):
+                stack.enter_context(self._channel_locks[channel_id])
+            return self._submit_locked(
+                channel_ids, last_index, sources, destinations, sizes, transfer_types
+            )
+
+    def _submit_locked(
+        self, channel_ids, last_index, sources, destinations, sizes, transfer_types
+    ) -> int:
+        """Programa e inicia o lote com os locks dos canais já adquiridos"""
+        count = len(sizes)
+        used_channels = [self.channels[channel_id] for channel_id in last_index]
+        if any(channel.is_busy() for channel in used_channels):
+            return -2  # Canal ocupado
+        if any(channel.status not in ("IDLE", "COMPLETE") for channel in used_channels):
+            return -3  # Canal já configurado individualmente
+
+        for channel_id, i in last_index.items():
+            channel = self.channels[channel_id]
+            channel.configure(
+                sources[i],
+                destinations[i],
+                sizes[i],
+                transfer_types[i] if transfer_types is not None else 0,
+            )
+            channel.start_transfer()
+            self._chains.pop(channel_id, None)
+
+        if self.clock is None and self._executor is None:
+            self._copy_batch(range(count), sources, destinations, sizes)
+            for channel in used_channels:
+                channel.status = "COMPLETE"
+                channel.remaining_bytes = 0
+            self._account(count, sum(sizes), self._batch_cycles(range(count), sizes))
+            return 0
+
+        # Cada canal conclui seu lote em um único evento do relógio ou em
+        # uma única tarefa do worker pool
+        batches: Dict[int, List[int]] = {channel_id: [] for channel_id in last_index}
+        for i, channel_id in enumerate(channel_ids):
+            batches[channel_id].append(i)
+        for channel_id, indices in batches.items():
+            batch_bytes = sum(sizes[i] for i in indices)
+            batch_cycles = self._batch_cycles(indices, sizes)
+            args = (
+                self.channels[channel_id],
+                indices,
+                batch_bytes,
+                batch_cycles,
+                sources,
+                destinations,
+                sizes,
+            )
+            if self.clock is not None:
+                self._scheduled[channel_id] = self.clock.schedule(
+                    transfer_duration_ns(batch_cycles, self.bus_bandwidth),
+                    self._complete_batch,
+                    *args,
+                )
+            else:
+                self._futures[channel_id] = self._executor.submit(
+                    self._complete_batch, *args
+                )
+        return 0
+
+    def _copy_batch(self, indices, sources, destinations, sizes):
+        """Executa as cópias de memória de um lote, na ordem de submissão"""
+        if self.memory is None:
+            return
+        view = self.memory.view
+        for i in indices:
+            source, destination, size = sources[i], destinations[i], sizes[i]
+            view[destination : destination + size] = view[source : source + size]
+
+    def _batch_cycles(self, indices, sizes) -> int:
+        """Ciclos de um lote: cada transferência é programada separadamente"""
+        return self.transfer_cycles([sizes[i] for i in indices])
+
+    def _complete_batch(
+        self, channel, indices, batch_bytes, batch_cycles, sources, destinations, sizes
+    ):
+        """Evento de conclusão do lote de um canal"""
+        self._copy_batch(indices, sources, destinations, sizes)
+        self._finish_channel(channel)
+        self._account(len(indices), batch_bytes, batch_cycles)
+
+    def verify_transfer(self, channel_id: int) -> bool:
+        """Confere se o destino do canal contém os bytes da origem
+
+        Em um canal programado com setup_chain, confere cada segmento.
+        """
+        if self.memory is None or channel_id >= len(self.channels):
+            return False
+        chain = self._chains.get(channel_id)
+        if chain is not None:
+            return all(
+                self.memory.compare(source, destination, length)
+                for source, destination, length in chain
+            )
+        channel = self.channels[channel_id]
+        return self.memory.compare(
+            channel.source_address,
+            channel.destination_address,
+            channel.transfer_size,
+        )
+
+    def transfer_cycles(self, sizes: Sequence[int], chained: bool = False) -> int:
+        """Ciclos de barramento para executar os segmentos `sizes`
+
+        Sem burst_length, um ciclo por byte. Com burst_length, cada
+        transação de até burst_length bytes paga DMA_ARBITRATION_CYCLES e a
+        programação do canal custa DMA_SETUP_CYCLES; em uma cadeia
+        (`chained`) a programação é paga uma vez e cada segmento adiciona
+        DMA_DESCRIPTOR_CYCLES.
+        """
+        total = sum(sizes)
+        burst = self.burst_length
+        if burst is None or not sizes:
+            return total
+        transactions = sum(-(-size // burst) for size in sizes)
+        cycles = DMA_SETUP_CYCLES + total + transactions * DMA_ARBITRATION_CYCLES
+        if chained:
+            cycles += len(sizes) * DMA_DESCRIPTOR_CYCLES
+        else:
+            cycles += (len(sizes) - 1) * DMA_SETUP_CYCLES
+        return cycles
+
+    def transfer_duration_ns(self, size: int) -> int:
+        """Duração simulada de uma transferência com a banda configurada"""
+        return transfer_duration_ns(self.transfer_cycles((size,)), self.bus_bandwidth)
+
+    def chain_duration_ns(self, descriptors: Sequence[Tuple[int, int, int]]) -> int:
+        """Duração simulada de uma cadeia de descritores"""
+        lengths = [descriptor[2] for descriptor in descriptors]
+        return transfer_duration_ns(
+            self.transfer_cycles(lengths, chained=True), self.bus_bandwidth
+        )
+
+    def scatter_gather_gain(
+        self, descriptors: Sequence[Tuple[int, int, int]]
+    ) -> Dict[str, float]:
+        """Compara a cadeia com os mesmos segmentos como transferências avulsas"""
+        lengths = [descriptor[2] for descriptor in descriptors]
+        single = self.transfer_cycles(lengths)
+        chained = self.transfer_cycles(lengths, chained=True)
+        return {
+            "single_cycles": single,
+            "chain_cycles": chained,
+            "speedup": single / chained if chained else 1.0,
+        }
+
+    def wait_for_channel(self, channel_id: int) -> bool:
+        """Aguarda o canal deixar de estar ativo
+
+        Com relógio de simulação avança o tempo virtual; no modo worker pool
+        espera a tarefa do canal. Retorna False se o canal continuar ocupado.
+        """
+        channel = self.channels[channel_id]
+        if self.clock is not None:
+            while channel.is_busy() and self.clock.step():
+                pass
+        future = self._futures.pop(channel_id, None)
+        if future is not None:
+            future.result()
+        return not channel.is_busy()
+
+    def wait_all(self):
+        """Aguarda todas as transferências em andamento"""
+        if self.clock is not None:
+            self.clock.run()
+        for channel_id in list(self._futures):
+            self.wait_for_channel(channel_id)
+
+    def shutdown(self):
+        """Conclui as transferências e encerra o worker pool"""
+        self.wait_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
 
     def get_channel_status(self, channel_id: int) -> Optional[str]:
         """Retorna o status de um canal específico"""
@@ -116,24 +693,40 @@ class DMAController:
             return None
         return self.channels[channel_id].get_status()
 
+    def find_idle_channel(self) -> int:
+        """Retorna o primeiro canal ocioso (ou -1), varrendo a tabela em C"""
+        return self.channel_table.find_status(DMA_IDLE)
+
+    def get_channel_summary(self) -> Dict[str, int]:
+        """Retorna a quantidade de canais em cada status"""
+        return self.channel_table.status_counts()
+
     def get_statistics(self) -> Dict[str, int]:
         """Retorna estatísticas do controlador"""
-        return {
-            "transfers_completed": self.transfers_completed,
-            "bytes_transferred": self.bytes_transferred,
-            "cycles_saved": self.cycles_saved,
-        }
+        with self._stats_lock:
+            return {
+                "transfers_completed": self.transfers_completed,
+                "bytes_transferred": self.bytes_transferred,
+                "cycles_saved": self.cycles_saved,
+                "bus_cycles": self.bus_cycles,
+            }
 
-    def performance_test(self) -> Dict[str, float]:
+    def performance_test(
+        self, num_transfers: int = 10, transfer_size: int = 1024
+    ) -> Dict[str, float]:
         """Executa teste de performance"""
+        if self.clock is not None:
+            return self._performance_test_on_clock(num_transfers, transfer_size)
+
         start_time = time.time()
 
         # Simula múltiplas transferências
-        for i in range(10):
+        for i in range(num_transfers):
             channel_id = i % len(self.channels)
+            offset = i * transfer_size
             if (
                 self.setup_channel(
-                    channel_id, 0x1000 + i * 1024, 0x2000 + i * 1024, 1024
+                    channel_id, 0x1000 + offset, 0x2000 + offset, transfer_size
                 )
                 == 0
             ):
@@ -155,6 +748,51 @@ class DMAController:
             ),
         }
 
+    def _performance_test_on_clock(
+        self, num_transfers: int = 10, transfer_size: int = 1024
+    ) -> Dict[str, float]:
+        """Teste de performance medido no tempo virtual do relógio"""
+        clock = self.clock
+        start_ns = clock.now
+        wall_start = time.perf_counter()
+
+        for i in range(num_transfers):
+            channel_id = i % len(self.channels)
+            self.wait_for_channel(channel_id)
+            offset = i * transfer_size
+            if (
+                self.setup_channel(
+                    channel_id, 0x1000 + offset, 0x2000 + offset, transfer_size
+                )
+                == 0
+            ):
+                self.start_transfer(channel_id)
+        clock.run()
+
+        elapsed = (clock.now - start_ns) / NANOSECONDS_PER_SECOND
+        return {
+            "total_time": elapsed,
+            "wall_time": time.perf_counter() - wall_start,
+            "transfers_per_second": (
+                self.transfers_completed / elapsed if elapsed > 0 else 0
+            ),
+            "bytes_per_second": (
+                self.bytes_transferred / elapsed if elapsed > 0 else 0
+            ),
+        }
+
+
+def _resolve_future(future: asyncio.Future):
+    """Marca o future de conclusão como resolvido (executa no loop do future)"""
+    if not future.done():
+        future.set_result(True)
+
+
+def _reject_future(future: asyncio.Future, error: Exception):
+    """Marca o future de conclusão com a exceção da transferência"""
+    if not future.done():
+        future.set_exception(error)
+
 
 # Função principal para testes
 def main():
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Varredura de Parâmetros - Estudos de Capacidade
+Expande uma grade de parâmetros, distribui os pontos de
+simulate_arbitration e performance_test por um pool de processos e guarda
+cada resultado em disco pelo hash dos parâmetros e da semente, de modo que
+repetir a grade só calcula os pontos novos
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from bus_controller import ARBITRATION_POLICIES, BusController
+from dma_simulator import DMAController
+from simulation_clock import SimulationClock
+from workload_generator import WorkloadGenerator
+
+# Versão do formato dos resultados: alterá-la invalida o cache inteiro
+SWEEP_VERSION = 1
+DEFAULT_CACHE_DIR = ".sweep_cache"
+
+# Pesos de prioridade (LOW, MEDIUM, HIGH, CRITICAL) de cada mistura
+REQUEST_MIXES = {
+    "uniform": (1, 1, 1, 1),
+    "background": (8, 4, 2, 1),
+    "realtime": (1, 2, 4, 8),
+}
+
+
+def run_bus_point(params: Dict, seed: int) -> Dict:
+    """Um ponto de BusController.simulate_arbitration em tempo virtual"""
+    bus = BusController(
+        params["max_concurrent"],
+        clock=SimulationClock(),
+        policy=ARBITRATION_POLICIES[params["policy"]](),
+        max_pending=params["max_pending"],
+        overflow_policy=params["overflow"],
+    )
+    workload = WorkloadGenerator(
+        seed,
+        size_distribution=params["sizes"],
+        priority_weights=REQUEST_MIXES[params["mix"]],
+    )
+    return bus.simulate_arbitration(params["requests"], workload=workload)
+
+
+def run_dma_point(params: Dict, seed: int) -> Dict:
+    """Um ponto de DMAController.performance_test em tempo virtual"""
+    dma = DMAController(
+        params["num_channels"],
+        clock=SimulationClock(),
+        burst_length=params["burst_length"],
+    )
+    dma.initialize()
+    result = dma.performance_test(params["transfers"], params["transfer_size"])
+    result.update(dma.get_statistics())
+    return result
+
+
+# Alvo -> (função do ponto, valores padrão dos eixos)
+SWEEP_TARGETS: Dict[str, tuple] = {
+    "bus": (
+        run_bus_point,
+        {
+            "max_concurrent": 2,
+            "policy": "priority",
+            "mix": "uniform",
+            "sizes": "uniform",
+            "requests": 1000,
+            "max_pending": None,
+            "overflow": "reject_new",
+        },
+    ),
+    "dma": (
+        run_dma_point,
+        {
+            "num_channels": 4,
+            "burst_length": None,
+            "transfers": 100,
+            "transfer_size": 1024,
+        },
+    ),
+}
+
+
+def expand_grid(target: str, grid: Dict[str, list]) -> List[Dict]:
+    """Produto cartesiano dos eixos, completado com os valores padrão"""
+    defaults = SWEEP_TARGETS[target][1]
+    unknown = set(grid) - set(defaults)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos para {target}: {sorted(unknown)}")
+    keys = sorted(grid)
+    points = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        params = dict(defaults)
+        params.update(zip(keys, values))
+        points.append(params)
+    return points
+
+
+def point_key(target: str, params: Dict, seed: int) -> str:
+    """Hash estável de um ponto (alvo, parâmetros, semente e versão)"""
+    document = json.dumps(
+        {"target": target, "params": params, "seed": seed, "version": SWEEP_VERSION},
+        sort_keys=True,
+    )
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+class SweepCache:
+    """Resultados em disco, um arquivo JSON por ponto
+
+    As gravações usam um arquivo temporário e os.replace, então execuções
+    interrompidas ou simultâneas nunca deixam um resultado parcial.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Resultado gravado ou None"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: Dict):
+        """Grava o resultado de um ponto"""
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as cache_file:
+                json.dump(result, cache_file)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def _run_point(target: str, params: Dict, seed: int) -> Dict:
+    """Executa um ponto (função de nível de módulo para o pool)"""
+    return SWEEP_TARGETS[target][0](params, seed)
+
+
+def run_sweep(
+    target: str,
+    grid: Dict[str, list],
+    seed: int = 42,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Executa todos os pontos da grade, reaproveitando o cache
+
+    Com `cache_dir=None` nada é lido nem gravado; com `max_workers=0` os
+    pontos rodam em sequência neste processo. `on_result` recebe cada
+    ponto assim que fica pronto.
+    """
+    if target not in SWEEP_TARGETS:
+        raise ValueError(f"Alvo de varredura desconhecido: {target}")
+    cache = SweepCache(cache_dir) if cache_dir is not None else None
+    points = [
+        {"params": params, "key": point_key(target, params, seed)}
+        for params in expand_grid(target, grid)
+    ]
+
+    missing = []
+    for point in points:
+        result = cache.get(point["key"]) if cache is not None else None
+        point["cached"] = result is not None
+        if result is None:
+            missing.append(point)
+        else:
+            point["result"] = result
+            if on_result is not None:
+                on_result(point)
+
+    def store(point: Dict, result: Dict):
+        point["result"] = result
+        if cache is not None:
+            cache.put(point["key"], result)
+        if on_result is not None:
+            on_result(point)
+
+    wall_start = time.perf_counter()
+    if max_workers == 0 or len(missing) <= 1:
+        for point in missing:
+            store(point, _run_point(target, point["params"], seed))
+    elif missing:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_run_point, target, point["params"], seed)
+                for point in missing
+            ]
+            for point, future in zip(missing, futures):
+                store(point, future.result())
+
+    return {
+        "target": target,
+        "seed": seed,
+        "points": points,
+        "computed": len(missing),
+        "cached": len(points) - len(missing),
+        "wall_time": time.perf_counter() - wall_start,
+    }
+
+
+def _parse_value(text: str):
+    """Converte um valor da linha de comando (int, float, None ou texto)"""
+    if text == "none":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_grid(axes: List[str]) -> Dict[str, list]:
+    """Converte 'eixo=v1,v2,...' em uma grade"""
+    grid = {}
+    for axis in axes:
+        name, separator, values = axis.partition("=")
+        if not separator or not values:
+            raise ValueError(f"Eixo inválido: {axis}")
+        grid[name] = [_parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando"""
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros")
+    parser.add_argument("--target", choices=sorted(SWEEP_TARGETS), default="bus")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="EIXO=V1,V2",
+        help="eixo da grade (repetível), por exemplo max_concurrent=1,2,4",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--output", help="grava todos os pontos em JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.grid)
+        report = run_sweep(
+            args.target,
+            grid,
+            seed=args.seed,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            max_workers=args.workers,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    axes = sorted(grid)
+    metric = "time_weighted_utilization" if args.target == "bus" else "bytes_per_second"
+    for point in report["points"]:
+        label = " ".join(f"{axis}={point['params'][axis]}" for axis in axes)
+        origin = "cache" if point["cached"] else "novo"
+        print(
+            f"{label or 'padrão'}: {metric}={point['result'][metric]:,.2f} ({origin})"
+        )
+    print(
+        f"Pontos: {len(report['points'])} ({report['computed']} calculados, "
+        f"{report['cached']} do cache) em {report['wall_time']:.2f} s"
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
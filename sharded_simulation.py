@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulação Particionada - Vários Barramentos em Paralelo
+Modela um sistema com N barramentos independentes, cada um com seu
+controlador e seus canais DMA, particionados por requester_id entre os
+processos de um ProcessPoolExecutor; apenas estatísticas agregadas e
+histogramas voltam ao processo principal
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from bus_controller import (
+    ARBITRATION_POLICIES,
+    BusController,
+    BusPriority,
+    BusRequest,
+)
+from bus_metrics import LogLinearHistogram
+from dma_simulator import DMA_COMPLETE, DMA_IDLE, DMAController
+from simulation_clock import NANOSECONDS_PER_SECOND, SimulationClock
+from workload_generator import WorkloadGenerator
+
+# Contadores de get_bus_status e get_statistics somados entre as partições
+_BUS_COUNTERS = (
+    "active_transfers",
+    "pending_requests",
+    "total_requests",
+    "granted_requests",
+)
+_DMA_COUNTERS = (
+    "transfers_completed",
+    "bytes_transferred",
+    "cycles_saved",
+    "bus_cycles",
+)
+
+
+def run_shard(shard: int, num_shards: int, params: Dict) -> Dict:
+    """Simula um barramento e seus canais DMA em tempo virtual
+
+    A partição gera a própria carga com a semente seed * 65536 + shard e usa
+    os solicitantes locais 0..n-1 mapeados para os globais
+    `local * num_shards + shard`, o que equivale a particionar um fluxo
+    único por requester_id. Retorna apenas estatísticas agregadas.
+    """
+    clock = SimulationClock()
+    bus = BusController(
+        params["max_concurrent"],
+        clock=clock,
+        policy=ARBITRATION_POLICIES[params["policy"]](),
+    )
+    # Um canal por transferência simultânea: a concessão sempre acha canal
+    dma = DMAController(max(params["channels"], params["max_concurrent"]), clock=clock)
+    dma.initialize()
+    table = dma.channel_table
+    generator = WorkloadGenerator(
+        params["seed"] * 65536 + shard,
+        size_distribution=params["sizes"],
+        arrival_pattern=params["arrival"],
+        mean_interval_ns=params["interval_ns"],
+        num_requesters=max(1, params["requesters"] // num_shards),
+    )
+    priorities = list(BusPriority)
+
+    def finish(request: BusRequest):
+        bus.release_request(request)
+
+    def granted(request: BusRequest):
+        channel_id = table.find_status(DMA_IDLE)
+        if channel_id < 0:
+            channel_id = table.find_status(DMA_COMPLETE)
+        dma.setup_channel(channel_id, 0, 0, request.data_size)
+        dma.start_transfer(channel_id)  # Conclusão agendada antes da liberação
+        clock.schedule(dma.transfer_duration_ns(request.data_size), finish, request)
+
+    wall_start = time.perf_counter()
+    for chunk in generator.generate(params["requests"]):
+        for arrival, local_id, priority, size in zip(
+            chunk.arrival_ns, chunk.requester_ids, chunk.priorities, chunk.sizes
+        ):
+            if arrival > clock.now:
+                clock.run(until_ns=arrival)
+            requester_id = local_id * num_shards + shard
+            bus.request_bus(requester_id, priorities[priority], size, granted)
+    clock.run()
+
+    return {
+        "shard": shard,
+        "bus": bus.get_bus_status(),
+        "dma": dma.get_statistics(),
+        "wait_histograms": {p.name: h for p, h in bus.wait_histograms.items()},
+        "hold_histograms": {p.name: h for p, h in bus.hold_histograms.items()},
+        "simulation_time": clock.now / NANOSECONDS_PER_SECOND,
+        "wall_time": time.perf_counter() - wall_start,
+    }
+
+
+def merge_shard_results(results: List[Dict]) -> Dict:
+    """Combina os resultados das partições em um único resumo"""
+    bus = {key: sum(result["bus"][key] for result in results) for key in _BUS_COUNTERS}
+    bus["success_rate"] = (
+        bus["granted_requests"] / bus["total_requests"] * 100
+        if bus["total_requests"]
+        else 0
+    )
+    bus["time_weighted_utilization"] = (
+        sum(result["bus"]["time_weighted_utilization"] for result in results)
+        / len(results)
+        if results
+        else 0.0
+    )
+
+    histograms = {}
+    for kind in ("wait_histograms", "hold_histograms"):
+        merged = {priority: LogLinearHistogram() for priority in BusPriority}
+        for result in results:
+            for name, histogram in result[kind].items():
+                merged[BusPriority[name]].merge(histogram)
+        histograms[kind] = merged
+    bus["wait_time_ns"] = BusController._latency_summary(histograms["wait_histograms"])
+    bus["hold_time_ns"] = BusController._latency_summary(histograms["hold_histograms"])
+
+    return {
+        "shards": len(results),
+        "bus": bus,
+        "dma": {
+            key: sum(result["dma"][key] for result in results) for key in _DMA_COUNTERS
+        },
+        "wait_histograms": histograms["wait_histograms"],
+        "hold_histograms": histograms["hold_histograms"],
+        "simulation_time": max(
+            (result["simulation_time"] for result in results), default=0.0
+        ),
+        "shard_wall_time": sum(result["wall_time"] for result in results),
+    }
+
+
+def run_sharded(
+    num_shards: int,
+    requests_per_shard: int = 100_000,
+    max_workers: Optional[int] = None,
+    seed: int = 42,
+    max_concurrent: int = 2,
+    channels: int = 4,
+    policy: str = "priority",
+    sizes: str = "uniform",
+    arrival: str = "poisson",
+    interval_ns: float = 10_000,
+    requesters: int = 1024,
+) -> Dict:
+    """Executa `num_shards` barramentos em paralelo e mescla as estatísticas
+
+    Com `max_workers=0` as partições rodam em sequência neste processo (útil
+    para depuração e como referência de desempenho).
+    """
+    if num_shards <= 0:
+        raise ValueError("O número de partições deve ser positivo")
+    params = {
+        "requests": requests_per_shard,
+        "seed": seed,
+        "max_concurrent": max_concurrent,
+        "channels": channels,
+        "policy": policy,
+        "sizes": sizes,
+        "arrival": arrival,
+        "interval_ns": interval_ns,
+        "requesters": requesters,
+    }
+    shards = range(num_shards)
+
+    wall_start = time.perf_counter()
+    if max_workers == 0:
+        results = [run_shard(shard, num_shards, params) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    run_shard, shards, [num_shards] * num_shards, [params] * num_shards
+                )
+            )
+    summary = merge_shard_results(results)
+    summary["wall_time"] = time.perf_counter() - wall_start
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando"""
+    parser = argparse.ArgumentParser(description="Barramentos em paralelo")
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-concurrent", type=int, default=2)
+    parser.add_argument(
+        "--policy", choices=sorted(ARBITRATION_POLICIES), default="priority"
+    )
+    args = parser.parse_args(argv)
+
+    summary = run_sharded(
+        args.shards,
+        args.requests,
+        max_workers=args.workers,
+        seed=args.seed,
+        max_concurrent=args.max_concurrent,
+        policy=args.policy,
+    )
+    bus = summary["bus"]
+    total = bus["total_requests"]
+    print(f"Barramentos: {summary['shards']}")
+    print(f"Solicitações: {total:,} ({bus['success_rate']:.1f}% concedidas)")
+    print(f"Bytes via DMA: {summary['dma']['bytes_transferred']:,}")
+    print(f"Utilização média: {bus['time_weighted_utilization']:.1f}%")
+    for name, latency in bus["wait_time_ns"].items():
+        print(
+            f"  espera {name:<8} p50 {latency['p50']:>9} ns  p99 {latency['p99']:>9} ns"
+        )
+    print(
+        f"Tempo real: {summary['wall_time']:.2f} s "
+        f"({total / summary['wall_time']:,.0f} solicitações/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
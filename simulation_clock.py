@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Relógio de Simulação - Motor de Eventos Discretos
+Mantém o tempo virtual (em nanossegundos) usado pelos controladores DMA e de
+barramento no lugar de pausas com time.sleep
+"""
+
+import heapq
+import itertools
+from typing import Callable, List, Optional
+
+# Largura de banda padrão do barramento simulado (bytes por segundo)
+DEFAULT_BUS_BANDWIDTH = 100_000_000
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+
+def transfer_duration_ns(size: int, bandwidth: int = DEFAULT_BUS_BANDWIDTH) -> int:
+    """Calcula a duração de uma transferência de `size` bytes em nanossegundos"""
+    if bandwidth <= 0:
+        raise ValueError("A largura de banda deve ser positiva")
+    # Arredonda para cima: uma transferência não vazia ocupa ao menos 1 ns
+    return -(-size * NANOSECONDS_PER_SECOND // bandwidth)
+
+
+class SimulationClock:
+    """Relógio virtual com fila de eventos (heap)
+
+    Os eventos são executados em ordem de tempo; eventos agendados para o
+    mesmo instante executam na ordem em que foram agendados.
+    """
+
+    def __init__(self, start_ns: int = 0):
+        self.now = start_ns
+        self.events_processed = 0
+        self._events: List[list] = []
+        self._sequence = itertools.count()
+
+    @property
+    def seconds(self) -> float:
+        """Tempo virtual atual em segundos"""
+        return self.now / NANOSECONDS_PER_SECOND
+
+    def schedule(self, delay_ns: int, callback: Callable, *args) -> list:
+        """Agenda `callback(*args)` para daqui a `delay_ns` nanossegundos"""
+        if delay_ns < 0:
+            raise ValueError("Não é possível agendar eventos no passado")
+        return self.schedule_at(self.now + delay_ns, callback, *args)
+
+    def schedule_at(self, time_ns: int, callback: Callable, *args) -> list:
+        """Agenda `callback(*args)` para o instante absoluto `time_ns`"""
+        if time_ns < self.now:
+            raise ValueError("Não é possível agendar eventos no passado")
+        event = [time_ns, next(self._sequence), callback, args]
+        heapq.heappush(self._events, event)
+        return event
+
+    def cancel(self, event: list):
+        """Cancela um evento agendado (descartado ao chegar ao topo)"""
+        event[2] = None
+
+    def step(self) -> bool:
+        """Executa o próximo evento; retorna False se a fila estiver vazia"""
+        events = self._events
+        while events:
+            time_ns, _, callback, args = heapq.heappop(events)
+            if callback is None:
+                continue
+            self.now = time_ns
+            self.events_processed += 1
+            callback(*args)
+            return True
+        return False
+
+    def run(self, until_ns: Optional[int] = None) -> int:
+        """Executa eventos até esvaziar a fila ou atingir `until_ns`
+
+        Retorna o número de eventos executados.
+        """
+        processed = self.events_processed
+        events = self._events
+        while events:
+            if until_ns is not None and events[0][0] > until_ns:
+                break
+            self.step()
+        if until_ns is not None and until_ns > self.now:
+            self.now = until_ns
+        return self.events_processed - processed
+
+    @property
+    def pending_events(self) -> int:
+        """Número de eventos ainda agendados (incluindo cancelados)"""
+        return len(self._events)
@@ -14,6 +14,21 @@ import subprocess
 import time
 from colorama import Fore, Back, Style, init
 
+# Os módulos de simulação ficam na raiz do repositório
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+from asm_runner import run_many
+
+# Binários e número de execuções de cada teste do menu
+ASSEMBLY_TESTS = {
+    1: (["asmpipe_dma"], 10),
+    2: (["asmpipe_dma"], 50),
+    3: (["asmpipe_dma"], 50),
+    4: (["asmpipe", "asmpipe_dma"], 200),
+    5: (["asmpipe", "asmpipe_dma"], 100),
+}
+
 # Inicializar colorama para cores no terminal
 init(autoreset=True)
 
@@ -74,63 +89,63 @@ class DMAGUITester:
         print(f"{Fore.GREEN}CONCLUÍDO!\n")
 
     def run_assembly_test(self, test_type):
-        """Executa um teste específico do simulador Assembly"""
+        """Executa um teste específico nos binários Assembly"""
+        names, runs = ASSEMBLY_TESTS[test_type]
         try:
-            # Simula a execução do código Assembly
-            print(f"{Fore.CYAN}COMPILANDO: Código Assembly...")
-            time.sleep(1)
-            print(f"{Fore.GREEN}SUCESSO: Compilação bem-sucedida!")
-
-            print(f"{Fore.CYAN}EXECUTANDO: Simulação DMA...")
-            time.sleep(2)
-
-            # Simula resultados baseados no tipo de teste
-            self.show_test_results(test_type)
+            print(f"{Fore.CYAN}EXECUTANDO: {runs} execuções de {', '.join(names)}...")
+            report = run_many(runs, names)
+            self.show_test_results(test_type, report)
 
         except Exception as e:
             print(f"{Fore.RED}ERRO: Falha na execução: {e}")
 
-    def show_test_results(self, test_type):
-        """Mostra os resultados do teste de forma profissional"""
+    def show_test_results(self, test_type, report):
+        """Mostra os resultados medidos nas execuções dos binários"""
         print(f"\n{Fore.GREEN}{Style.BRIGHT}RELATÓRIO DE RESULTADOS:")
         print(f"{Fore.CYAN}" + "=" * 40)
 
-        if test_type == 1:  # Teste Básico
-            print(f"{Fore.WHITE}TESTE: Básico DMA")
-            print(f"{Fore.GREEN}  SUCESSO: Canal 0 - Transferência de 1KB")
-            print(f"{Fore.GREEN}  SUCESSO: Canal 1 - Transferência de 4KB")
-            print(f"{Fore.YELLOW}  TEMPO: 0.25ms")
-            print(f"{Fore.BLUE}  STATUS: Funcionalidade básica validada")
-
-        elif test_type == 2:  # Comparação
-            print(f"{Fore.WHITE}ANÁLISE: Comparativa DMA vs E/S Programada")
-            print(f"{Fore.GREEN}  DMA: 0.15ms para 8KB")
-            print(f"{Fore.RED}  E/S PROGRAMADA: 2.3ms para 8KB")
-            print(f"{Fore.YELLOW}  GANHO: 15.3x performance")
-            print(f"{Fore.BLUE}  CONCLUSÃO: DMA demonstra superioridade significativa")
-
-        elif test_type == 3:  # Arbitragem
-            print(f"{Fore.WHITE}TESTE: Arbitragem de Barramento")
-            print(f"{Fore.GREEN}  CONCEDIDO: Canal 0 (prioridade alta)")
-            print(f"{Fore.YELLOW}  AGUARDANDO: Canal 1 (prioridade média)")
-            print(f"{Fore.RED}  ENFILEIRADO: Canal 2 (prioridade baixa)")
+        for name in report["skipped"]:
+            print(f"{Fore.YELLOW}  IGNORADO: {name} não encontrado (execute make all)")
+
+        for name, summary in report["binaries"].items():
+            times = summary["wall_time_ns"]
+            events = summary["events"]
+            status = Fore.GREEN if summary["failures"] == 0 else Fore.RED
+            print(f"{Fore.WHITE}BINÁRIO: {name}")
+            print(
+                f"{status}  EXECUÇÕES: {summary['runs']} "
+                f"({summary['failures']} falhas)"
+            )
             print(
-                f"{Fore.BLUE}  STATUS: Sistema de prioridades funcionando corretamente"
+                f"{Fore.YELLOW}  TEMPO: p50 {times['p50'] / 1e6:.2f}ms, "
+                f"p99 {times['p99'] / 1e6:.2f}ms, máx {times['max'] / 1e6:.2f}ms"
             )
 
-        elif test_type == 4:  # Performance
-            print(f"{Fore.WHITE}ANÁLISE: Performance Avançada")
-            print(f"{Fore.GREEN}  THROUGHPUT: 45.2 MB/s")
-            print(f"{Fore.YELLOW}  BURST TRANSFERS: 127 executados")
-            print(f"{Fore.CYAN}  LATÊNCIA: 0.08ms (média)")
-            print(f"{Fore.BLUE}  STATUS: Performance dentro dos parâmetros esperados")
-
-        elif test_type == 5:  # Cenário Completo
-            print(f"{Fore.WHITE}SUITE: Completa - Relatório Final")
-            print(f"{Fore.GREEN}  RESULTADO: Todos os testes APROVADOS")
-            print(f"{Fore.YELLOW}  CLASSIFICAÇÃO: EXCELENTE")
-            print(f"{Fore.CYAN}  EFICIÊNCIA: 94.7%")
-            print(f"{Fore.BLUE}  STATUS: Sistema validado para uso em produção")
+            if test_type in (1, 5):
+                print(
+                    f"{Fore.GREEN}  TRANSFERÊNCIAS: {events['transfers_completed']}"
+                    f" de {events['transfers_started']} concluídas"
+                )
+            if test_type in (2, 5):
+                for label, key in (
+                    ("E/S PROGRAMADA", "pio_cycles"),
+                    ("DMA", "dma_cycles"),
+                ):
+                    cycles = summary[key]
+                    value = "não informado" if cycles is None else f"{cycles:.0f}"
+                    print(f"{Fore.CYAN}  CICLOS {label}: {value}")
+                for winner, count in summary["winners"].items():
+                    print(f"{Fore.BLUE}  MAIS EFICIENTE: {winner.upper()} ({count}x)")
+            if test_type in (3, 5):
+                print(
+                    f"{Fore.BLUE}  ARBITRAGEM: {events['bus_grants']} concessões, "
+                    f"{events['bus_conflicts']} conflitos"
+                )
+            if test_type in (4, 5):
+                rate = summary["runs"] / report["wall_time"]
+                print(f"{Fore.CYAN}  VAZÃO: {rate:,.0f} execuções/s no pool")
+            if events["errors"]:
+                print(f"{Fore.RED}  ERROS: {events['errors']} mensagens de erro")
 
         print(f"{Fore.CYAN}" + "=" * 40 + "\n")
 
@@ -6,15 +6,46 @@ Testa funcionalidades dos simuladores DMA e Bus Controller
 """
 
 import pytest
+import asyncio
 import time
 import sys
 import os
+import threading
+from array import array
 
 # Adiciona o diretório atual ao path para importar os módulos
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from dma_simulator import DMAController, DMAChannel
-from bus_controller import BusController, BusArbitrator, BusPriority
+from dma_simulator import (
+    DMA_ACTIVE,
+    DMA_COMPLETE,
+    DMA_IDLE,
+    ChannelTable,
+    DMAController,
+    DMAChannel,
+)
+from bus_controller import (
+    BusController,
+    BusArbitrator,
+    BusPriority,
+    BusRequest,
+    PendingRequestQueue,
+    RoundRobinArbitration,
+    WeightedFairQueuing,
+)
+from asm_pipe import ASMPipe, SharedPipe, measure_throughput
+from bus_metrics import LogLinearHistogram, UtilizationTracker
+from dma_memory import MappedMemory, MemoryAccessError, PhysicalMemory
+from simulation_clock import SimulationClock, transfer_duration_ns
+from workload_generator import WorkloadGenerator
+from workload_trace import (
+    TraceFormatError,
+    TraceRecord,
+    TraceWriter,
+    read_trace,
+    replay_bus,
+    replay_dma,
+)
 
 
 class TestDMAChannel:
@@ -60,6 +91,39 @@ class TestDMAChannel:
         assert result is False
 
 
+class TestChannelTable:
+    """Testes para a tabela de canais struct-of-arrays"""
+
+    def test_channel_is_view_over_table_row(self):
+        """Testa que o canal lê e escreve direto na linha da tabela"""
+        table = ChannelTable(3)
+        channel = DMAChannel(1, table)
+        channel.configure(0x1000, 0x2000, 512, 1)
+        channel.start_transfer()
+
+        assert table.source[1] == 0x1000
+        assert table.count[1] == 512
+        assert table.status[1] == DMA_ACTIVE
+        assert table.status[0] == DMA_IDLE
+        assert not hasattr(channel, "__dict__")
+
+    def test_bulk_status_scan(self):
+        """Testa varredura de status em controlador com muitos canais"""
+        dma = DMAController(10_000)
+        dma.initialize()
+        dma.setup_channel(0, 0x1000, 0x2000, 64)
+        dma.start_transfer(0)
+        dma.channel_table.status[1:5000] = array("B", [DMA_ACTIVE]) * 4999
+
+        summary = dma.get_channel_summary()
+        assert summary["COMPLETE"] == 1
+        assert summary["ACTIVE"] == 4999
+        assert summary["IDLE"] == 5000
+        assert dma.find_idle_channel() == 5000
+        assert dma.channels[4999].is_busy() is True
+        assert dma.channel_table.count_status(DMA_COMPLETE) == 1
+
+
 class TestDMAController:
     """Testes para a classe DMAController"""
 
@@ -169,6 +233,369 @@ class TestDMAController:
         assert results["total_time"] >= 0
 
 
+class TestDMABatchSubmission:
+    """Testes para a submissão em lote de transferências"""
+
+    def test_submit_many_round_robin(self):
+        """Testa lote distribuído em round-robin com contadores agregados"""
+        dma = DMAController(4)
+        dma.initialize()
+        count = 1000
+        sources = array("Q", range(0, count * 64, 64))
+        destinations = array("Q", range(0x100000, 0x100000 + count * 64, 64))
+        sizes = array("Q", [64]) * count
+
+        assert dma.submit_many(None, sources, destinations, sizes) == 0
+        assert dma.transfers_completed == count
+        assert dma.bytes_transferred == count * 64
+        assert all(channel.status == "COMPLETE" for channel in dma.channels)
+        assert dma.channels[3].source_address == sources[count - 1]
+
+    def test_submit_many_copies_memory(self):
+        """Testa que o lote copia os dados na ordem de submissão"""
+        memory = PhysicalMemory(0x1000)
+        memory.write(0, b"abcdefgh")
+        dma = DMAController(2, memory=memory)
+        dma.initialize()
+
+        result = dma.submit_many(
+            [0, 1, 0], [0, 4, 0x100], [0x100, 0x200, 0x300], [4, 4, 4]
+        )
+
+        assert result == 0
+        assert bytes(memory.read(0x100, 4)) == b"abcd"
+        assert bytes(memory.read(0x200, 4)) == b"efgh"
+        assert bytes(memory.read(0x300, 4)) == b"abcd"
+
+    def test_submit_many_validation(self):
+        """Testa validação do lote inteiro antes de qualquer alteração"""
+        dma = DMAController(2, memory=PhysicalMemory(0x1000))
+        dma.initialize()
+
+        assert dma.submit_many([0, 2], [0, 0], [0x10, 0x20], [4, 4]) == -1
+        assert dma.submit_many([0], [0, 1], [0x10], [4]) == -3
+        assert dma.submit_many([0, 1], [0, 0xFFF], [0x10, 0x20], [4, 4]) == -3
+
+        dma.setup_channel(1, 0, 0x10, 4)
+        dma.channels[1].start_transfer()
+        assert dma.submit_many([0, 1], [0, 0], [0x10, 0x20], [4, 4]) == -2
+        assert dma.get_channel_status(0) == "IDLE"
+        assert dma.transfers_completed == 0
+
+    def test_submit_many_on_virtual_clock(self):
+        """Testa lote em tempo virtual: um evento de conclusão por canal"""
+        clock = SimulationClock()
+        dma = DMAController(2, clock=clock, bus_bandwidth=1_000_000_000)
+        dma.initialize()
+
+        assert dma.submit_many([0, 0, 1], [0, 0, 0], [0, 0, 0], [100, 200, 50]) == 0
+        assert dma.get_channel_status(0) == "ACTIVE"
+
+        assert clock.run() == 2
+        assert clock.now == 300
+        assert dma.transfers_completed == 3
+        assert dma.bytes_transferred == 350
+
+
+class TestScatterGather:
+    """Testes para cadeias de descritores e o custo de burst"""
+
+    def test_chain_walks_all_segments(self):
+        """Testa cópia de todos os segmentos com uma única conclusão"""
+        memory = PhysicalMemory(0x1000)
+        memory.write(0, b"abcdefghijkl")
+        clock = SimulationClock()
+        dma = DMAController(2, clock=clock, memory=memory)
+        dma.initialize()
+        chain = [(0, 0x100, 4), (4, 0x200, 4), (8, 0x300, 4)]
+
+        assert dma.setup_chain(0, chain) == 0
+        assert dma.channels[0].transfer_size == 12
+        assert dma.start_transfer(0) == 0
+        assert dma.channels[0].is_busy()
+        clock.run()
+
+        assert clock.now == dma.chain_duration_ns(chain) == 12 * 10
+        assert dma.channels[0].status == "COMPLETE"
+        assert dma.transfers_completed == 1
+        assert dma.bytes_transferred == 12
+        assert bytes(memory.read(0x200, 4)) == b"efgh"
+        assert bytes(memory.read(0x300, 4)) == b"ijkl"
+        assert dma.verify_transfer(0) is True
+        memory.write(0x204, b"x")  # Fora dos segmentos: não afeta
+        assert dma.verify_transfer(0) is True
+        memory.write(0x201, b"x")
+        assert dma.verify_transfer(0) is False
+
+        # Reprogramado com setup_channel, volta a conferir a região única
+        memory.write(0x400, b"abcd")
+        assert dma.setup_channel(0, 0x400, 0x500, 4) == 0
+        assert dma.start_transfer(0) == 0
+        clock.run()
+        assert dma.verify_transfer(0) is True
+
+    def test_chain_validation(self):
+        """Testa cadeias inválidas e reprogramação com setup_channel"""
+        dma = DMAController(2, memory=PhysicalMemory(0x100))
+        dma.initialize()
+
+        assert dma.setup_chain(5, [(0, 0x10, 4)]) == -1
+        assert dma.setup_chain(0, []) == -3
+        assert dma.setup_chain(0, [(0, 0x10, 4), (0, 0xFE, 4)]) == -3
+        assert dma.setup_chain(0, [(0, 0x10, 4), (4, 0x14, 4)]) == 0
+        # Canal programado não aceita nova configuração até concluir
+        assert dma.setup_channel(0, 0, 0x20, 2) == -3
+        assert dma.start_transfer(0) == 0
+        assert dma.bytes_transferred == 8
+
+        # Depois da cadeia, o canal volta a aceitar transferências avulsas
+        assert dma.setup_channel(0, 0, 0x20, 2) == 0
+        assert dma.start_transfer(0) == 0
+        assert dma.bytes_transferred == 10
+
+    def test_burst_length_changes_cycle_cost(self):
+        """Testa o custo em ciclos com e sem burst"""
+        legacy = DMAController(1)
+        byte_bursts = DMAController(1, burst_length=1)
+        bursts = DMAController(1, burst_length=8)
+
+        assert legacy.transfer_cycles((64,)) == 64
+        assert byte_bursts.transfer_cycles((64,)) == 16 + 64 + 64 * 4
+        assert bursts.transfer_cycles((64,)) == 16 + 64 + 8 * 4
+        assert bursts.transfer_duration_ns(64) < byte_bursts.transfer_duration_ns(64)
+        with pytest.raises(ValueError):
+            DMAController(1, burst_length=0)
+
+    def test_scatter_gather_beats_single_transfers(self):
+        """Testa o ganho de vazão da cadeia sobre transferências avulsas"""
+        segments = [(i * 64, 0x10000 + i * 64, 64) for i in range(32)]
+
+        single = DMAController(1, clock=SimulationClock(), burst_length=8)
+        single.initialize()
+        for source, destination, size in segments:
+            single.wait_for_channel(0)
+            single.setup_channel(0, source, destination, size)
+            single.start_transfer(0)
+        single.wait_all()
+
+        chained = DMAController(1, clock=SimulationClock(), burst_length=8)
+        chained.initialize()
+        chained.setup_chain(0, segments)
+        chained.start_transfer(0)
+        chained.wait_all()
+
+        gain = chained.scatter_gather_gain(segments)
+        assert single.bus_cycles == gain["single_cycles"]
+        assert chained.bus_cycles == gain["chain_cycles"]
+        assert gain["speedup"] > 1
+        assert single.clock.now > chained.clock.now
+        assert single.bytes_transferred == chained.bytes_transferred == 32 * 64
+
+
+class TestCycleCostModel:
+    """Testes para o modelo de custo E/S programada vs DMA"""
+
+    def test_single_channel_matches_controller(self):
+        """Testa que um canal custa o mesmo que DMAController com burst"""
+        from cycle_model import CycleCostModel
+        from dma_simulator import DMA_BURST_SIZE
+
+        model = CycleCostModel()
+        dma = DMAController(1, burst_length=DMA_BURST_SIZE)
+        sizes = [1, 8, 9, 100, 4096]
+        assert model.dma_cycles(sizes) == [dma.transfer_cycles((s,)) for s in sizes]
+        assert model.pio_cycles(sizes) == [3 * s for s in sizes]
+
+    def test_crossover_matches_brute_force(self):
+        """Testa o ponto de cruzamento contra uma busca exaustiva"""
+        from cycle_model import CycleCostModel
+
+        for contention in (0.0, 0.5, 1.0):
+            model = CycleCostModel(contention=contention)
+            for channels in range(1, 6):
+                sizes = range(1, 2001)
+                pio = model.pio_cycles(sizes, channels)
+                dma = model.dma_cycles(sizes, channels)
+                losing = [s for s, p, d in zip(sizes, pio, dma) if d >= p]
+                expected = losing[-1] + 1 if losing else 1
+                if expected > 1000:  # DMA não vence na faixa avaliada
+                    expected = None
+                assert model.crossover(channels) == expected
+        assert CycleCostModel().crossover(1) == 13
+
+    def test_sweep_covers_grid(self):
+        """Testa a varredura de todas as combinações em colunas"""
+        from cycle_model import CycleCostModel
+
+        model = CycleCostModel()
+        sweep = model.sweep(range(1, 101), [1, 2, 4])
+        assert len(sweep) == 300
+        assert sweep.channels[:100] == [1] * 100
+        assert sweep.sizes[100:200] == list(range(1, 101))
+        assert sweep.dma_cycles[250] == model.dma_cycles([51], 4)[0]
+        assert sweep.dma_wins() == sum(
+            d < p for p, d in zip(sweep.pio_cycles, sweep.dma_cycles)
+        )
+
+    def test_cycles_saved_match_assembly(self):
+        """Testa que cycles_saved usa 3 ciclos por byte como o Assembly"""
+        dma = DMAController(1)
+        dma.initialize()
+        dma.setup_channel(0, 0, 1024, 100)
+        dma.start_transfer(0)
+        assert dma.get_statistics()["cycles_saved"] == 300
+
+
+class TestDMAConcurrency:
+    """Testes de uso concorrente do controlador DMA"""
+
+    def test_concurrent_producers(self):
+        """Testa produtores concorrentes em canais distintos"""
+        dma = DMAController(8, memory=PhysicalMemory(0x10000))
+        dma.initialize()
+        transfers_per_thread = 50
+
+        def producer(channel_id: int):
+            base = channel_id * 0x1000
+            for _ in range(transfers_per_thread):
+                assert dma.setup_channel(channel_id, base, base + 0x800, 256) == 0
+                assert dma.start_transfer(channel_id) == 0
+
+        threads = [threading.Thread(target=producer, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = dma.get_statistics()
+        assert stats["transfers_completed"] == 8 * transfers_per_thread
+        assert stats["bytes_transferred"] == 8 * transfers_per_thread * 256
+
+    def test_worker_pool_mode(self):
+        """Testa execução das transferências em um worker pool"""
+        memory = PhysicalMemory(1 << 20)
+        for channel_id in range(4):
+            memory.fill(channel_id * 0x20000, 0x10000, channel_id + 1)
+        dma = DMAController(4, memory=memory, max_workers=4)
+        dma.initialize()
+
+        for channel_id in range(4):
+            base = channel_id * 0x20000
+            assert dma.setup_channel(channel_id, base, base + 0x10000, 0x10000) == 0
+            assert dma.start_transfer(channel_id) == 0
+
+        dma.wait_all()
+        assert dma.transfers_completed == 4
+        assert all(dma.verify_transfer(channel_id) for channel_id in range(4))
+
+        assert dma.submit_many(None, [0, 0x20000], [0x40000, 0x60000], [16, 16]) == 0
+        dma.shutdown()
+        assert dma.transfers_completed == 6
+        assert bytes(memory.read(0x60000, 2)) == b"\x02\x02"
+
+    def test_worker_pool_rejects_simulation_clock(self):
+        """Testa que o worker pool não pode ser usado com tempo virtual"""
+        with pytest.raises(ValueError):
+            DMAController(2, clock=SimulationClock(), max_workers=2)
+
+
+class TestASMPipe:
+    """Testes para o buffer circular ASMPipe"""
+
+    def test_full_and_empty_semantics(self):
+        """Testa escrita parcial, pipe cheio e pipe vazio como no assembly"""
+        pipe = ASMPipe()
+        assert pipe.capacity == 256
+        assert pipe.readinto(bytearray(8)) == 0  # Vazio
+
+        assert pipe.write(b"x" * 300) == 256  # Limitado ao espaço livre
+        assert pipe.is_full()
+        assert pipe.write(b"y") == -1  # Cheio
+        assert pipe.read(10) == b"x" * 10
+        assert pipe.free_space == 10
+
+        with pytest.raises(ValueError):
+            ASMPipe(100)
+
+    def test_wraparound_preserves_order(self):
+        """Testa dados atravessando o fim do buffer"""
+        pipe = ASMPipe(16)
+        assert pipe.write(b"0123456789") == 10
+        assert pipe.read(8) == b"01234567"
+        assert pipe.write(b"abcdefghij") == 10  # Volta ao início do buffer
+        assert pipe.write_ptr == 4
+
+        out = bytearray(16)
+        assert pipe.readinto(memoryview(out)[2:]) == 12
+        assert bytes(out[2:14]) == b"89abcdefghij"
+        assert pipe.is_empty()
+        assert pipe.read_ptr == pipe.write_ptr
+
+    def test_feeds_dma_memory(self):
+        """Testa o pipe como caminho de E/S entre regiões da memória simulada"""
+        memory = PhysicalMemory(0x1000)
+        memory.write(0x10, b"dados via pipe")
+        pipe = ASMPipe(8)
+
+        moved = 0
+        while moved < 14:
+            pipe.fill_from(memory, 0x10 + moved, min(pipe.free_space, 14 - moved))
+            moved += pipe.drain_to(memory, 0x800 + moved)
+
+        assert bytes(memory.read(0x800, 14)) == b"dados via pipe"
+
+
+def _consumer_exits_early(pipe, total, chunk_size, verify, result):
+    """Consumidor que sai sem ler nada (simula falha no processo filho)"""
+    pipe.close()
+
+
+class TestSharedPipe:
+    """Testes para o pipe SPSC em memória compartilhada"""
+
+    def test_indices_live_in_shared_segment(self):
+        """Testa que outro mapeamento do segmento vê os mesmos índices"""
+        producer = SharedPipe(16)
+        consumer = SharedPipe.attach(producer.name)
+        try:
+            assert consumer.capacity == 16
+            assert consumer.readinto(bytearray(4)) == 0  # Vazio
+            assert producer.write(b"0123456789") == 10
+            assert consumer.data_count == 10
+            assert consumer.read_ptr == 0 and consumer.write_ptr == 10
+
+            out = bytearray(8)
+            assert consumer.readinto(out) == 8
+            assert producer.write(b"abcdefghijklmnop") == 14  # Atravessa o fim
+            assert producer.write(b"z") == -1  # Cheio
+            assert producer.is_full()
+
+            rest = bytearray(16)
+            assert consumer.readinto(rest) == 16
+            assert bytes(out) + bytes(rest) == b"0123456789abcdefghijklmn"
+            assert producer.is_empty()
+        finally:
+            consumer.close()
+            producer.close()
+            producer.unlink()
+
+    def test_throughput_between_processes(self):
+        """Testa o fluxo entre processos com verificação do CRC32"""
+        report = measure_throughput(
+            total_bytes=1 << 20, chunk_size=3000, capacity=4096, verify=True
+        )
+        assert report["verified"]
+        assert report["gb_per_second"] > 0
+
+    def test_producer_stops_when_consumer_dies(self, monkeypatch):
+        """Testa que o produtor não trava se o consumidor sair cedo"""
+        import asm_pipe
+
+        monkeypatch.setattr(asm_pipe, "_consume", _consumer_exits_early)
+        with pytest.raises(RuntimeError):
+            measure_throughput(total_bytes=1 << 20, chunk_size=3000, capacity=4096)
+
+
 class TestBusController:
     """Testes para a classe BusController"""
 
@@ -264,6 +691,702 @@ class TestBusController:
         assert "MEDIUM" in distribution
         assert "LOW" in distribution
         assert "CRITICAL" in distribution
+        assert distribution["MEDIUM"] == 1
+        assert distribution["LOW"] == 1
+        assert distribution["HIGH"] == 0
+
+    def test_release_grants_highest_priority_pending(self):
+        """Testa que a liberação concede a solicitação de maior prioridade"""
+        bus = BusController(1)
+        bus.request_bus(0, BusPriority.LOW, 1024)
+        bus.request_bus(1, BusPriority.LOW, 512)
+        bus.request_bus(2, BusPriority.CRITICAL, 256)
+        bus.request_bus(3, BusPriority.MEDIUM, 128)
+
+        assert bus.release_bus(0) is True
+        assert [t.requester_id for t in bus.active_transfers] == [2]
+        assert [r.requester_id for r in bus.pending_requests] == [3, 1]
+
+    def test_release_unknown_requester(self):
+        """Testa liberação por requisitante sem transferência ativa"""
+        bus = BusController(2)
+        bus.request_bus(0, BusPriority.HIGH, 1024)
+
+        assert bus.release_bus(7) is False
+        assert len(bus.active_transfers) == 1
+
+
+class TestPendingRequestQueue:
+    """Testes para a fila de solicitações pendentes"""
+
+    def test_pop_order_by_priority_then_fifo(self):
+        """Testa ordem de saída por prioridade e depois por chegada"""
+        queue = PendingRequestQueue()
+        for requester_id, priority in enumerate(
+            [BusPriority.LOW, BusPriority.HIGH, BusPriority.LOW, BusPriority.HIGH]
+        ):
+            queue.push(BusRequest(requester_id, priority, 64))
+
+        assert [queue.pop().requester_id for _ in range(4)] == [1, 3, 0, 2]
+        assert queue.pop() is None
+
+    def test_remove_and_counters(self):
+        """Testa remoção arbitrária e contadores incrementais"""
+        queue = PendingRequestQueue()
+        requests = [BusRequest(i, BusPriority.MEDIUM, 64) for i in range(3)]
+        for request in requests:
+            queue.push(request)
+
+        assert queue.remove(requests[0]) is True
+        assert queue.remove(requests[0]) is False
+        assert requests[0] not in queue
+        assert len(queue) == 2
+        assert queue.priority_counts[BusPriority.MEDIUM] == 2
+        assert queue.peek() is requests[1]
+        assert queue.find(2) is requests[2]
+        assert queue.find(0) is None
+
+    def test_compaction_keeps_order(self):
+        """Testa que a compactação do heap preserva a ordem"""
+        queue = PendingRequestQueue()
+        requests = [BusRequest(i, BusPriority.LOW, 64) for i in range(500)]
+        for request in requests:
+            queue.push(request)
+        for request in requests[:-3]:
+            queue.remove(request)
+
+        assert len(queue) == 3
+        assert [r.requester_id for r in queue] == [497, 498, 499]
+
+
+class TestBlockingGrant:
+    """Testes para a espera bloqueante pela concessão do barramento"""
+
+    def test_wait_for_bus_wakes_on_release(self):
+        """Testa que a thread em espera acorda quando o barramento é liberado"""
+        bus = BusController(1)
+        bus.request_bus(0, BusPriority.HIGH, 1024)
+        results = []
+
+        waiter = threading.Thread(
+            target=lambda: results.append(bus.wait_for_bus(1, BusPriority.LOW, 64, 5))
+        )
+        waiter.start()
+        while len(bus.pending_requests) == 0:
+            time.sleep(0.001)
+        bus.release_bus(0)
+        waiter.join(5)
+
+        assert results == [True]
+        assert [t.requester_id for t in bus.active_transfers] == [1]
+
+    def test_wait_for_bus_timeout_removes_request(self):
+        """Testa que o timeout retira a solicitação da fila"""
+        bus = BusController(1)
+        bus.request_bus(0, BusPriority.HIGH, 1024)
+
+        assert bus.wait_for_bus(1, BusPriority.LOW, 64, timeout=0.01) is False
+        assert len(bus.pending_requests) == 0
+        assert bus.total_requests == 2
+
+    def test_request_bus_callback(self):
+        """Testa callback de concessão em solicitação pendente"""
+        bus = BusController(1)
+        granted = []
+        assert bus.request_bus(0, BusPriority.HIGH, 64, granted.append) is True
+        assert bus.request_bus(1, BusPriority.LOW, 64, granted.append) is False
+        assert [r.requester_id for r in granted] == [0]
+
+        bus.release_bus(0)
+        assert [r.requester_id for r in granted] == [0, 1]
+
+    def test_reset_wakes_waiters(self):
+        """Testa que reset_statistics acorda threads e corrotinas em espera"""
+        from bus_controller import BusRequestDropped
+
+        bus = BusController(1)
+        bus.request_bus(0, BusPriority.HIGH, 1024)
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(bus.wait_for_bus(1, BusPriority.LOW, 64))
+        )
+        waiter.start()
+
+        async def scenario():
+            pending = asyncio.ensure_future(bus.acquire(2, BusPriority.LOW, 64))
+            while len(bus.pending_requests) < 2:
+                await asyncio.sleep(0.001)
+            bus.reset_statistics()
+            with pytest.raises(BusRequestDropped, match="reset"):
+                await pending
+
+        asyncio.run(scenario())
+        waiter.join(5)
+        assert results == [False]
+        assert bus.get_bus_status()["expired_requests"] == 0
+
+
+class TestAsyncFrontend:
+    """Testes para as variantes assíncronas dos controladores"""
+
+    def test_acquire_waits_for_release(self):
+        """Testa que acquire aguarda a concessão feita por release_bus"""
+        bus = BusController(1)
+        grant_order = []
+
+        async def requester(requester_id: int, priority: BusPriority):
+            request = await bus.acquire(requester_id, priority, 256)
+            assert request.granted is True
+            grant_order.append(requester_id)
+            await asyncio.sleep(0)
+            bus.release_bus(requester_id)
+
+        async def scenario():
+            await bus.acquire(99, BusPriority.HIGH, 64)
+            tasks = [
+                asyncio.ensure_future(requester(0, BusPriority.LOW)),
+                asyncio.ensure_future(requester(1, BusPriority.CRITICAL)),
+                asyncio.ensure_future(requester(2, BusPriority.MEDIUM)),
+            ]
+            await asyncio.sleep(0)
+            assert len(bus.pending_requests) == 3
+            bus.release_bus(99)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(scenario())
+        assert grant_order == [1, 2, 0]
+        assert bus.granted_requests == 4
+        assert len(bus.active_transfers) == 0
+
+    def test_acquire_cancellation_leaves_queue(self):
+        """Testa que um acquire cancelado sai da fila de pendentes"""
+        bus = BusController(1)
+
+        async def scenario():
+            await bus.acquire(0, BusPriority.HIGH, 64)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(bus.acquire(1, BusPriority.LOW, 64), 0.01)
+
+        asyncio.run(scenario())
+        assert len(bus.pending_requests) == 0
+        assert len(bus.active_transfers) == 1
+
+    def test_async_dma_transfer(self):
+        """Testa transferências DMA assíncronas nos três modos de execução"""
+        memory = PhysicalMemory(0x10000)
+        memory.write(0, b"async")
+
+        async def scenario(dma: DMAController):
+            results = await asyncio.gather(
+                dma.transfer(0, 0, 0x1000, 5), dma.transfer(1, 0, 0x2000, 5)
+            )
+            assert results == [0, 0]
+            assert await dma.transfer(9, 0, 0x3000, 5) == -1
+
+        asyncio.run(scenario(DMAController(2, memory=memory)))
+        assert bytes(memory.read(0x2000, 5)) == b"async"
+
+        pool = DMAController(2, memory=memory, max_workers=2)
+        asyncio.run(scenario(pool))
+        pool.shutdown()
+        assert pool.transfers_completed == 2
+
+        clock = SimulationClock()
+        timed = DMAController(2, clock=clock, memory=memory)
+
+        async def drive_clock():
+            await asyncio.sleep(0)
+            clock.run()
+
+        async def clocked():
+            await asyncio.gather(scenario(timed), drive_clock())
+
+        asyncio.run(clocked())
+        assert timed.transfers_completed == 2
+
+
+class TestLatencyHistograms:
+    """Testes para os histogramas de latência"""
+
+    def test_percentiles_within_relative_error(self):
+        """Testa percentis com erro relativo limitado pelos sub-buckets"""
+        histogram = LogLinearHistogram(sub_bucket_bits=7)
+        for value in range(1, 100_001):
+            histogram.record(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100_000
+        assert snapshot["min"] == 1
+        assert snapshot["max"] == 100_000
+        for key, expected in (("p50", 50_000), ("p90", 90_000), ("p99", 99_000)):
+            assert abs(snapshot[key] - expected) / expected < 2**-6
+
+    def test_fixed_memory_and_merge(self):
+        """Testa memória fixa, valores acima do limite e mesclagem"""
+        first = LogLinearHistogram(sub_bucket_bits=4, max_value_bits=10)
+        second = LogLinearHistogram(sub_bucket_bits=4, max_value_bits=10)
+        buckets = len(first.counts)
+        first.record(5)
+        second.record(10**9)
+
+        first.merge(second)
+        assert len(first.counts) == buckets
+        assert first.count == 2
+        assert first.max == 10**9
+        assert first.percentile(1.0) == 10**9
+        with pytest.raises(ValueError):
+            first.merge(LogLinearHistogram())
+
+    def test_bus_records_wait_and_hold_times(self):
+        """Testa espera e ocupação medidas em tempo virtual por prioridade"""
+        clock = SimulationClock()
+        bus = BusController(1, clock=clock)
+        bus.request_bus(0, BusPriority.HIGH, 64)
+        bus.request_bus(1, BusPriority.LOW, 64)
+        clock.run(until_ns=5_000)
+        bus.release_bus(0)
+        clock.run(until_ns=7_000)
+        bus.release_bus(1)
+
+        status = bus.get_bus_status()
+        assert status["wait_time_ns"]["LOW"]["max"] == 5_000
+        assert status["hold_time_ns"]["HIGH"]["p50"] == 5_000
+        assert status["hold_time_ns"]["LOW"]["p99"] == 2_000
+        assert "CRITICAL" not in status["wait_time_ns"]
+
+        snapshot = bus.get_latency_snapshot()
+        assert snapshot["wait"]["HIGH"]["count"] == 1
+        assert snapshot["wait"]["HIGH"]["max"] == 0
+        assert snapshot["hold"]["CRITICAL"]["count"] == 0
+
+        bus.reset_statistics()
+        assert bus.get_latency_snapshot()["wait"]["LOW"]["count"] == 0
+
+
+class TestUtilizationAccounting:
+    """Testes para a utilização ponderada no tempo e a vazão"""
+
+    def test_time_weighted_utilization_and_windows(self):
+        """Testa integrais no tempo, janelas deslizantes e bytes/s"""
+        clock = SimulationClock()
+        bus = BusController(2, clock=clock)
+        bus.request_bus(0, BusPriority.HIGH, 1000)
+        bus.request_bus(1, BusPriority.LOW, 3000)
+        bus.request_bus(2, BusPriority.MEDIUM, 500)  # Fica pendente
+        clock.run(until_ns=1_050_000_000)
+        bus.release_bus(0)  # Concede a solicitação 2
+        clock.run(until_ns=1_500_000_000)
+        bus.release_bus(1)
+        bus.release_bus(2)
+        clock.run(until_ns=2_000_000_000)
+
+        snapshot = bus.get_throughput_snapshot()
+        assert snapshot["elapsed"] == pytest.approx(2.0)
+        assert snapshot["utilization"] == pytest.approx(75.0)
+        assert snapshot["mean_queue_depth"] == pytest.approx(0.525)
+        assert snapshot["max_queue_depth"] == 1
+        assert snapshot["bytes_per_sec"] == pytest.approx(2250.0)
+        assert snapshot["bytes_per_sec_by_priority"]["LOW"] == pytest.approx(1500.0)
+        assert snapshot["bytes_per_sec_by_requester"][2] == pytest.approx(250.0)
+
+        last_second = snapshot["windows"]["1s"]
+        assert last_second["span"] == pytest.approx(1.0)
+        assert last_second["utilization"] == pytest.approx(50.0)
+        assert last_second["mean_queue_depth"] == pytest.approx(0.05)
+        assert last_second["bytes_per_sec"] == pytest.approx(500.0)
+        assert last_second["bytes_per_sec_by_priority"]["HIGH"] == 0
+        # Por solicitante: só quem recebeu bytes dentro da janela
+        assert last_second["bytes_per_sec_by_requester"] == {2: pytest.approx(500.0)}
+        assert snapshot["windows"]["10s"]["bytes_per_sec_by_requester"][1] == (
+            pytest.approx(1500.0)
+        )
+        # Execução mais curta que a janela: cobre desde o início
+        assert snapshot["windows"]["60s"]["span"] == pytest.approx(2.0)
+        assert bus.bus_utilization == pytest.approx(75.0)
+        status = bus.get_bus_status()
+        assert status["bus_utilization"] == bus.bus_utilization
+        assert status["instantaneous_utilization"] == 0.0
+
+        bus.reset_statistics()
+        assert bus.get_throughput_snapshot()["bytes_granted"] == 0
+
+    def test_long_idle_gap_keeps_bounded_history(self):
+        """Testa que longos períodos ociosos não crescem o histórico"""
+        tracker = UtilizationTracker(1, windows=(1.0,), resolution=0.1)
+        tracker.observe(0.0, 1, 0)
+        tracker.record_grant("HIGH", 7, 100)
+        tracker.observe(1_000.0, 0, 0)
+
+        assert len(tracker._checkpoints) <= tracker._checkpoints.maxlen
+        snapshot = tracker.snapshot(1_000.5)
+        assert snapshot["utilization"] == pytest.approx(1_000 / 1_000.5 * 100)
+        assert snapshot["windows"]["1s"]["utilization"] == pytest.approx(50.0)
+        assert snapshot["windows"]["1s"]["bytes_per_sec"] == 0
+
+
+class TestArbitrationPolicies:
+    """Testes para as políticas de arbitragem plugáveis"""
+
+    @staticmethod
+    def _grant_order(bus: BusController, requests) -> list:
+        """Enfileira com o barramento ocupado e registra a ordem de concessão"""
+        bus.request_bus(-1, BusPriority.CRITICAL, 1)
+        for requester_id, priority, size in requests:
+            bus.request_bus(requester_id, priority, size)
+        order = []
+        holder = -1
+        while True:
+            bus.release_bus(holder)
+            if len(bus.active_transfers) == 0:
+                return order
+            holder = next(iter(bus.active_transfers)).requester_id
+            order.append(holder)
+
+    def test_round_robin_rotates_between_requesters(self):
+        """Testa que o round-robin alterna entre requisitantes"""
+        bus = BusController(1, policy=RoundRobinArbitration())
+        requests = [(0, BusPriority.LOW, 64)] * 3 + [(1, BusPriority.LOW, 64)] * 2
+        requests += [(2, BusPriority.CRITICAL, 64)]
+
+        assert self._grant_order(bus, requests) == [0, 1, 2, 0, 1, 0]
+        assert bus.policy.name == "round_robin"
+
+    def test_weighted_fair_queuing_shares_by_weight(self):
+        """Testa que o WFQ divide o barramento proporcionalmente ao peso"""
+        bus = BusController(1, policy=WeightedFairQueuing())
+        requests = [(0, BusPriority.LOW, 100)] * 20 + [(1, BusPriority.HIGH, 100)] * 20
+
+        order = self._grant_order(bus, requests)[:16]
+        # Peso 3 (HIGH) contra peso 1 (LOW): três concessões para cada uma
+        assert order.count(1) == 12
+        assert order.count(0) == 4
+
+    def test_policies_keep_priority_counters(self):
+        """Testa contadores por prioridade e remoção em todas as políticas"""
+        for policy in (
+            PendingRequestQueue(),
+            RoundRobinArbitration(),
+            WeightedFairQueuing(),
+        ):
+            requests = [BusRequest(i % 3, BusPriority(i % 4), 64) for i in range(12)]
+            for request in requests:
+                policy.push(request)
+            assert policy.remove(requests[5]) is True
+            assert requests[5] not in policy
+            assert len(policy) == 11
+            assert sum(policy.priority_counts.values()) == 11
+            assert len(list(policy)) == 11
+            while policy.pop() is not None:
+                pass
+            assert len(policy) == 0
+            assert sum(policy.priority_counts.values()) == 0
+
+
+class TestAgingAndStarvation:
+    """Testes para envelhecimento de prioridade e detecção de starvation"""
+
+    def _flood(self, policy):
+        """LOW em t=0 seguido de um fluxo contínuo de CRITICAL (1 vaga)"""
+        clock = SimulationClock()
+        bus = BusController(1, clock=clock, policy=policy, starvation_threshold=0.0005)
+        bus.request_bus(0, BusPriority.CRITICAL, 100)  # Ocupa o barramento
+        bus.request_bus(1, BusPriority.LOW, 100)
+        grants = []
+        for i in range(40):
+            clock.run(until_ns=(i + 1) * 100_000)
+            bus.request_bus(100 + i, BusPriority.CRITICAL, 100)
+            grants.append(next(iter(bus.active_transfers)).requester_id)
+            bus.release_bus(grants[-1])
+        return bus, grants
+
+    def test_aging_promotes_waiting_request(self):
+        """Testa que LOW é concedido após esperar 3 intervalos de envelhecimento"""
+        from bus_controller import AgingPriorityQueue, PendingRequestQueue
+
+        strict, strict_grants = self._flood(PendingRequestQueue())
+        assert 1 not in strict_grants
+        assert len(strict.starving_requests()) == 1
+        assert strict.get_fairness_snapshot()["starving"] == {1: 1}
+
+        aged, aged_grants = self._flood(AgingPriorityQueue(aging_interval=0.001))
+        # Espera de 3 ms = 3 níveis: passa à frente das CRITICAL mais novas
+        position = aged_grants.index(1)
+        assert 28 <= position <= 31
+        assert aged.max_wait_by_requester[1] >= 0.003
+        assert aged.starvation_counts[1] == 1
+        assert aged.get_bus_status()["starved_requests"] == 1
+        assert aged.starving_requests() == []
+
+    def test_aging_key_is_time_invariant(self):
+        """Testa a ordem da fila com envelhecimento sem recálculo"""
+        from bus_controller import AgingPriorityQueue
+
+        queue = AgingPriorityQueue(aging_interval=1.0)
+        queue.push(BusRequest(1, BusPriority.LOW, 10, timestamp=0.0))
+        queue.push(BusRequest(2, BusPriority.HIGH, 10, timestamp=1.5))
+        queue.push(BusRequest(3, BusPriority.MEDIUM, 10, timestamp=0.5))
+        queue.push(BusRequest(4, BusPriority.HIGH, 10, timestamp=2.5))
+        assert [queue.pop().requester_id for _ in range(4)] == [2, 3, 1, 4]
+
+    def test_starvation_tracking_prunes_arrivals(self):
+        """Testa que a ordem de chegada não cresce com as concessões"""
+        clock = SimulationClock()
+        bus = BusController(2, clock=clock, starvation_threshold=1.0)
+        for i in range(10_000):
+            bus.request_bus(i, BusPriority.MEDIUM, 64)
+            bus.release_bus(i)
+        assert len(bus._arrivals) <= 2 * len(bus.pending_requests) + 65
+        assert bus.starvation_counts == {}
+        assert len(bus.max_wait_by_requester) == 10_000
+
+    def test_pending_checks_skip_membership_scan(self, monkeypatch):
+        """Testa que as verificações de pendência usam a marca queued (O(1))"""
+        from bus_controller import ARBITRATION_POLICIES
+
+        def scan(self, request):
+            raise AssertionError("varredura de pertinência")
+
+        for name, policy in ARBITRATION_POLICIES.items():
+            monkeypatch.setattr(policy, "__contains__", scan)
+            clock = SimulationClock()
+            bus = BusController(
+                1,
+                clock=clock,
+                policy=policy(),
+                starvation_threshold=1e-6,
+                default_max_wait=1.0,
+            )
+            for _ in range(200):  # Um único requisitante
+                bus.request_bus(0, BusPriority.LOW, 64)
+            clock.run(until_ns=1_000)
+            for _ in range(200):
+                bus.release_request(next(iter(bus.active_transfers)))
+                bus.request_bus(0, BusPriority.LOW, 64)
+            clock.run(until_ns=10_000)
+            assert len(bus.starving_requests()) == len(bus.pending_requests) == 199
+
+            queued = list(bus.pending_requests)
+            assert all(request.queued for request in queued)
+            assert bus.pending_requests.remove(queued[0])
+            assert not queued[0].queued
+            assert not bus.pending_requests.remove(queued[0])
+            bus.pending_requests.clear()
+            assert not any(request.queued for request in queued), name
+
+
+class TestBoundedPendingQueue:
+    """Testes para a fila limitada com descarte e prazos"""
+
+    def _full_bus(self, **kwargs):
+        """Barramento de 1 vaga ocupado e fila com LOW, MEDIUM e HIGH"""
+        bus = BusController(1, clock=SimulationClock(), max_pending=3, **kwargs)
+        bus.request_bus(0, BusPriority.CRITICAL, 64)
+        for requester_id, priority in (
+            (1, BusPriority.LOW),
+            (2, BusPriority.MEDIUM),
+            (3, BusPriority.HIGH),
+        ):
+            bus.request_bus(requester_id, priority, 64)
+        return bus
+
+    def _pending_ids(self, bus):
+        return sorted(request.requester_id for request in bus.pending_requests)
+
+    def test_reject_new(self):
+        """Testa que a fila cheia recusa a nova solicitação"""
+        bus = self._full_bus()
+        dropped = []
+        assert not bus.request_bus(4, BusPriority.CRITICAL, 64, on_drop=dropped.append)
+        assert [request.drop_reason for request in dropped] == ["shed"]
+        assert self._pending_ids(bus) == [1, 2, 3]
+        assert bus.get_bus_status()["shed_requests"] == 1
+
+    def test_drop_lowest_and_oldest(self):
+        """Testa o descarte da menor prioridade e da mais antiga"""
+        bus = self._full_bus(overflow_policy="drop_lowest")
+        bus.request_bus(4, BusPriority.HIGH, 64)
+        assert self._pending_ids(bus) == [2, 3, 4]
+        bus.request_bus(5, BusPriority.MEDIUM, 64)  # Nada menor: recusada
+        assert self._pending_ids(bus) == [2, 3, 4]
+        assert bus.shed_requests == 2
+
+        bus = self._full_bus(overflow_policy="drop_oldest")
+        bus.release_bus(0)  # Concede a HIGH (3)
+        bus.request_bus(4, BusPriority.LOW, 64)
+        bus.request_bus(5, BusPriority.LOW, 64)
+        assert self._pending_ids(bus) == [2, 4, 5]
+        assert bus.shed_requests == 1
+
+    def test_deadlines_expire_lazily(self):
+        """Testa a expiração de prazos na próxima operação do controlador"""
+        clock = SimulationClock()
+        bus = BusController(1, clock=clock, default_max_wait=0.001)
+        bus.request_bus(0, BusPriority.LOW, 64)
+        expired = []
+        bus.request_bus(1, BusPriority.LOW, 64, on_drop=expired.append)
+        bus.request_bus(2, BusPriority.LOW, 64, max_wait=0.010)
+        clock.run(until_ns=2_000_000)
+        assert len(bus.pending_requests) == 2  # Nada expira sem operação
+
+        status = bus.get_bus_status()
+        assert status["expired_requests"] == 1
+        assert status["pending_requests"] == 1
+        assert expired[0].requester_id == 1
+        bus.release_bus(0)
+        assert bus.active_transfers.pop(2) is not None
+
+    def test_waiters_see_dropped_requests(self):
+        """Testa wait_for_bus e acquire com solicitações descartadas"""
+        from bus_controller import BusRequestDropped
+
+        bus = BusController(1, max_pending=1)
+        bus.request_bus(0, BusPriority.LOW, 64)
+        bus.request_bus(1, BusPriority.LOW, 64)
+        assert bus.wait_for_bus(2, BusPriority.LOW, 64, timeout=5) is False
+
+        async def scenario():
+            with pytest.raises(BusRequestDropped):
+                await bus.acquire(3, BusPriority.LOW, 64)
+            bus.release_bus(0)  # Concede a 1 e esvazia a fila
+            waiter = asyncio.ensure_future(
+                bus.acquire(4, BusPriority.LOW, 64, max_wait=0.01)
+            )
+            # Nenhuma outra operação: o próprio acquire aplica o prazo
+            with pytest.raises(BusRequestDropped, match="expired"):
+                await asyncio.wait_for(waiter, 1.0)
+
+        asyncio.run(scenario())
+        assert bus.shed_requests == 2
+        assert bus.expired_requests == 1
+
+    def test_wait_for_bus_drop_after_timeout(self):
+        """Testa o descarte entre o fim do timeout e a retomada do lock"""
+        bus = BusController(1)
+        bus.request_bus(0, BusPriority.HIGH, 64)
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(
+                bus.wait_for_bus(1, BusPriority.LOW, 64, timeout=0.1)
+            )
+        )
+        waiter.start()
+        while len(bus.pending_requests) == 0:
+            time.sleep(0.001)
+        with bus.lock:
+            time.sleep(0.2)  # O timeout expira com o lock ocupado
+            bus._drop(bus.pending_requests.peek(), "shed")
+        waiter.join(5)
+
+        assert results == [False]
+        assert bus.shed_requests == 1
+
+    def test_wait_for_bus_max_wait(self):
+        """Testa que wait_for_bus aplica o próprio prazo, sem outra operação"""
+        bus = BusController(1)
+        bus.request_bus(0, BusPriority.HIGH, 64)
+
+        start = time.monotonic()
+        assert bus.wait_for_bus(1, BusPriority.LOW, 64, max_wait=0.05) is False
+        assert time.monotonic() - start < 1.0
+        assert bus.expired_requests == 1
+        assert len(bus.pending_requests) == 0
+        granted = bus.wait_for_bus(2, BusPriority.LOW, 64, timeout=5, max_wait=0.01)
+        assert granted is False  # O prazo vence antes do timeout
+        assert bus.expired_requests == 2
+
+    def test_memory_stays_bounded_under_overload(self):
+        """Testa que a fila e as estruturas auxiliares não crescem sob excesso"""
+        for overflow in ("reject_new", "drop_lowest", "drop_oldest"):
+            bus = BusController(
+                1,
+                clock=SimulationClock(),
+                max_pending=100,
+                overflow_policy=overflow,
+                default_max_wait=1.0,
+            )
+            priorities = list(BusPriority)
+            for i in range(20_000):
+                bus.request_bus(i, priorities[i % 4], 64)
+            assert len(bus.pending_requests) == 100
+            assert len(bus._arrivals) + len(bus._deadlines) <= 2 * 100 + 64
+            status = bus.get_bus_status()
+            assert status["shed_requests"] == 20_000 - 101
+
+    def test_per_requester_maps_stay_bounded(self):
+        """Testa que os mapas por requisitante não crescem sem limite"""
+        clock = SimulationClock()
+        bus = BusController(1, clock=clock, max_pending=16)
+        bus.utilization.max_requesters = 100
+        for i in range(5_000):  # Um requisitante novo por solicitação
+            bus.request_bus(i, BusPriority.LOW, 64)
+            clock.run(until_ns=(i + 1) * 1_000)
+            bus.release_request(next(iter(bus.active_transfers)))
+
+        assert bus.max_wait_by_requester == {}  # Sem starvation_threshold
+        by_requester = bus.get_throughput_snapshot()["bytes_per_sec_by_requester"]
+        assert len(by_requester) == 101
+        assert bus.utilization.bytes_by_requester[None] == (5_000 - 100) * 64
+
+
+class TestRequestPool:
+    """Testes para o BusRequest compacto e o pool de registros"""
+
+    def test_slotted_request(self):
+        """Testa __slots__, prioridade inteira e a ordenação do heap"""
+        request = BusRequest(1, BusPriority.HIGH, 64, timestamp=1.0)
+        assert not hasattr(request, "__dict__")
+        assert request.priority is BusPriority.HIGH
+        assert request.priority_value == BusPriority.HIGH.value
+        older = BusRequest(2, BusPriority.HIGH, 64, timestamp=0.5)
+        low = BusRequest(3, BusPriority.LOW, 64, timestamp=0.0)
+        assert sorted([low, request, older]) == [older, request, low]
+
+    def test_released_requests_are_recycled(self):
+        """Testa a reutilização dos registros após release_bus"""
+        from bus_controller import BusRequestPool
+
+        pool = BusRequestPool()
+        bus = BusController(1, clock=SimulationClock(), request_pool=pool)
+        bus.request_bus(0, BusPriority.LOW, 64)
+        first = next(iter(bus.active_transfers))
+        bus.release_bus(0)
+        assert len(pool) == 1
+
+        bus.request_bus(1, BusPriority.HIGH, 128)
+        recycled = next(iter(bus.active_transfers))
+        assert recycled is first
+        assert (recycled.requester_id, recycled.priority) == (1, BusPriority.HIGH)
+        assert recycled.granted and recycled.data_size == 128
+        assert (pool.created, pool.reused) == (1, 1)
+
+    def test_recycled_requests_ignore_stale_entries(self):
+        """Testa que entradas antigas de prazo não expiram registros reciclados"""
+        from bus_controller import BusRequestPool
+
+        clock = SimulationClock()
+        bus = BusController(
+            1, clock=clock, request_pool=BusRequestPool(), default_max_wait=0.001
+        )
+        bus.request_bus(0, BusPriority.LOW, 64)
+        for requester_id in range(1, 50):
+            bus.request_bus(requester_id, BusPriority.MEDIUM, 64)
+            bus.release_request(next(iter(bus.active_transfers)))
+        clock.run(until_ns=500_000)  # Dentro do prazo de todas
+        status = bus.get_bus_status()
+        assert status["expired_requests"] == 0
+        assert status["granted_requests"] == 50
+
+    def test_pending_benchmark(self):
+        """Testa o benchmark de memória por solicitação pendente"""
+        from benchmark_suite import run_suite
+
+        grid = {"policy": ["priority"], "requests": [50], "seed": [1]}
+        document = run_suite(grid, benchmarks=("pending",), repetitions=1, warmup=0)
+        operations = {r["operation"] for r in document["results"]}
+        assert operations == {"request_bus", "churn"}
+        for result in document["results"]:
+            assert result["params"]["pool"] is False
+            assert result["peak_memory_per_request"] > 0
 
 
 class TestBusArbitrator:
@@ -297,6 +1420,10 @@ class TestBusArbitrator:
         assert result is not None
         assert result.requester_id == 0
 
+        # O ponteiro gira a cada chamada
+        assert arbitrator.round_robin_arbitration(requests).requester_id == 1
+        assert arbitrator.round_robin_arbitration(requests).requester_id == 0
+
     def test_priority_based_arbitration(self):
         """Testa arbitragem baseada em prioridade"""
         bus = BusController(2)
@@ -327,7 +1454,518 @@ class TestBusArbitrator:
         assert result is not None
 
 
+class TestSimulationClock:
+    """Testes para o relógio de simulação de eventos discretos"""
+
+    def test_events_run_in_time_order(self):
+        """Testa execução de eventos em ordem de tempo e FIFO no empate"""
+        clock = SimulationClock()
+        order = []
+        clock.schedule(300, order.append, "c")
+        clock.schedule(100, order.append, "a")
+        clock.schedule(100, order.append, "b")
+
+        assert clock.run() == 3
+        assert order == ["a", "b", "c"]
+        assert clock.now == 300
+
+    def test_cancel_and_run_until(self):
+        """Testa cancelamento de eventos e execução limitada no tempo"""
+        clock = SimulationClock()
+        order = []
+        event = clock.schedule(50, order.append, "cancelado")
+        clock.schedule(100, order.append, "a")
+        clock.schedule(500, order.append, "b")
+        clock.cancel(event)
+
+        clock.run(until_ns=200)
+        assert order == ["a"]
+        assert clock.now == 200
+
+        with pytest.raises(ValueError):
+            clock.schedule_at(100, order.append, "passado")
+
+    def test_transfer_duration(self):
+        """Testa cálculo da duração a partir do tamanho e da banda"""
+        assert transfer_duration_ns(1000, 1_000_000_000) == 1000
+        assert transfer_duration_ns(1, 3_000_000_000) == 1
+        assert transfer_duration_ns(0, 1_000_000) == 0
+
+    def test_dma_transfer_on_virtual_clock(self):
+        """Testa transferência DMA concluída por evento do relógio"""
+        clock = SimulationClock()
+        dma = DMAController(2, clock=clock, bus_bandwidth=1_000_000_000)
+        dma.initialize()
+
+        dma.setup_channel(0, 0x1000, 0x2000, 4096)
+        assert dma.start_transfer(0) == 0
+        assert dma.get_channel_status(0) == "ACTIVE"
+        assert dma.transfers_completed == 0
+
+        clock.run()
+        assert dma.get_channel_status(0) == "COMPLETE"
+        assert dma.transfers_completed == 1
+        assert clock.now == 4096
+
+    def test_initialize_cancels_scheduled_completions(self):
+        """Testa que initialize descarta conclusões ainda agendadas"""
+        clock = SimulationClock()
+        dma = DMAController(1, clock=clock, bus_bandwidth=1_000_000_000)
+        dma.initialize()
+        dma.setup_channel(0, 0x1000, 0x2000, 1024)
+        dma.start_transfer(0)
+
+        dma.initialize()
+        dma.setup_channel(0, 0x1000, 0x2000, 64)
+        dma.start_transfer(0)
+        clock.run()
+        assert dma.transfers_completed == 1
+        assert dma.bytes_transferred == 64
+        assert clock.now == 64
+
+        # O mesmo vale para o evento de um lote de submit_many
+        assert dma.submit_many([0], [0], [0x100], [512]) == 0
+        dma.initialize()
+        assert dma.submit_many([0], [0], [0x100], [32]) == 0
+        clock.run()
+        assert (dma.transfers_completed, dma.bytes_transferred) == (1, 32)
+
+    def test_dma_performance_test_on_virtual_clock(self):
+        """Testa teste de performance em tempo virtual"""
+        clock = SimulationClock()
+        dma = DMAController(4, clock=clock, bus_bandwidth=1_000_000_000)
+        dma.initialize()
+
+        results = dma.performance_test()
+
+        assert dma.transfers_completed == 10
+        assert results["total_time"] == pytest.approx(3 * 1024 / 1e9)
+        assert results["bytes_per_second"] > 0
+
+    def test_bus_simulation_on_virtual_clock(self):
+        """Testa simulação de arbitragem em tempo virtual"""
+        clock = SimulationClock()
+        bus = BusController(1, clock=clock, bus_bandwidth=10_000_000)
+
+        results = bus.simulate_arbitration(200)
+
+        assert results["total_requests"] == 200
+        assert results["granted_requests"] == 200
+        assert results["active_transfers"] == 0
+        assert results["pending_requests"] == 0
+        assert results["simulation_time"] >= 199 * 100_000 / 1e9
+
+
+class TestPhysicalMemory:
+    """Testes para a memória física simulada"""
+
+    def test_write_read_and_copy(self):
+        """Testa escrita, leitura e cópia em bloco"""
+        memory = PhysicalMemory(4096)
+        memory.write(0x100, b"ASMPipe DMA")
+        memory.copy(0x100, 0x800, 11)
+
+        assert bytes(memory.read(0x800, 11)) == b"ASMPipe DMA"
+        assert memory.compare(0x100, 0x800, 11) is True
+
+    def test_overlapping_copy(self):
+        """Testa cópia entre regiões sobrepostas (semântica memmove)"""
+        memory = PhysicalMemory(64)
+        memory.write(0, b"abcdefgh")
+        memory.copy(0, 2, 8)
+
+        assert bytes(memory.read(0, 10)) == b"ababcdefgh"
+
+    def test_first_mismatch_and_bounds(self):
+        """Testa localização de divergência e verificação de limites"""
+        memory = PhysicalMemory(1024)
+        memory.fill(0, 256, 0xAA)
+        memory.fill(512, 256, 0xAA)
+        memory.write(512 + 200, b"\x00")
+
+        assert memory.first_mismatch(0, 512, 256) == 200
+        assert memory.first_mismatch(0, 512, 200) is None
+        with pytest.raises(MemoryAccessError):
+            memory.read(1000, 100)
+
+    def test_dma_transfer_moves_bytes(self):
+        """Testa que a transferência DMA copia os dados na memória"""
+        memory = PhysicalMemory(0x4000)
+        memory.write(0x1000, bytes(range(256)) * 4)
+        dma = DMAController(2, memory=memory)
+        dma.initialize()
+
+        assert dma.setup_channel(0, 0x1000, 0x2000, 1024) == 0
+        assert dma.start_transfer(0) == 0
+        assert dma.verify_transfer(0) is True
+        assert bytes(memory.read(0x2000, 4)) == b"\x00\x01\x02\x03"
+
+    def test_dma_rejects_out_of_range_region(self):
+        """Testa rejeição de região fora da memória simulada"""
+        dma = DMAController(2, memory=PhysicalMemory(0x1000))
+        dma.initialize()
+
+        assert dma.setup_channel(0, 0x0F00, 0x0800, 0x200) == -3
+        assert dma.setup_channel(0, 0, 0x100, -5) == -3
+
+    def test_failed_copy_marks_channel_error(self):
+        """Testa que uma cópia inválida deixa o canal em ERROR, não ACTIVE"""
+        dma = DMAController(1, memory=PhysicalMemory(0x1000))
+        dma.initialize()
+        dma.channels[0].configure(0, 0x100, -5, 0)  # Sem a validação do setup
+
+        with pytest.raises(MemoryAccessError):
+            dma.start_transfer(0)
+        assert dma.get_channel_status(0) == "ERROR"
+        assert dma.transfers_completed == 0
+        dma.initialize()
+        assert dma.setup_channel(0, 0, 0x100, 16) == 0
+
+    def test_mapped_memory_persists_between_runs(self, tmp_path):
+        """Testa imagem mapeada em arquivo esparso e reabertura"""
+        image = str(tmp_path / "memoria.img")
+        size = 1 << 32  # 4 GB esparsos: apenas as páginas tocadas ocupam espaço
+
+        with MappedMemory(image, size) as memory:
+            dma = DMAController(1, memory=memory)
+            dma.initialize()
+            memory.write(0x1000, b"dados persistentes")
+            assert dma.setup_channel(0, 0x1000, size - 64, 18) == 0
+            assert dma.start_transfer(0) == 0
+            assert dma.verify_transfer(0) is True
+
+        with MappedMemory(image) as reopened:
+            assert reopened.size == size
+            assert bytes(reopened.read(size - 64, 18)) == b"dados persistentes"
+
+
+class TestBenchmarkSuite:
+    """Testes de fumaça para a suíte de benchmarks"""
+
+    def test_run_suite_and_compare(self):
+        """Testa execução de uma grade mínima e a comparação de resultados"""
+        from benchmark_suite import compare_results, run_suite
+
+        grid = {
+            "channels": [2],
+            "requests": [50],
+            "sizes": ["bimodal"],
+            "max_concurrent": [2],
+            "policy": ["priority", "round_robin"],
+            "seed": [1],
+        }
+        document = run_suite(grid, repetitions=1, warmup=0)
+
+        operations = {(r["benchmark"], r["operation"]) for r in document["results"]}
+        assert ("bus", "request_bus") in operations
+        assert ("dma", "start_transfer") in operations
+        assert ("policy", "pop") in operations
+        for result in document["results"]:
+            assert result["ops_per_sec"] > 0
+            assert result["latency_ns"]["p50"] <= result["latency_ns"]["p99"]
+            assert result["peak_memory_bytes"] > 0
+
+        comparisons = compare_results(document, document)
+        assert len(comparisons) == len(document["results"])
+        assert not any(c["regression"] for c in comparisons)
+
+
+class TestWorkloadGenerator:
+    """Testes para o gerador de carga sintética"""
+
+    def test_same_seed_reproduces_workload(self):
+        """Testa reprodutibilidade e continuidade das chegadas entre blocos"""
+        first = list(WorkloadGenerator(seed=5).generate(1_000, chunk_size=300))
+        second = list(WorkloadGenerator(seed=5).generate(1_000, chunk_size=300))
+        other = list(WorkloadGenerator(seed=6).generate(1_000, chunk_size=300))
+
+        assert first == second
+        assert first != other
+        assert [len(chunk) for chunk in first] == [300, 300, 300, 100]
+        arrivals = [value for chunk in first for value in chunk.arrival_ns]
+        assert arrivals == sorted(arrivals)
+        sizes = [value for chunk in first for value in chunk.sizes]
+        assert min(sizes) >= 64 and max(sizes) <= 4096
+        priorities = {value for chunk in first for value in chunk.priorities}
+        assert priorities == set(range(4))
+
+    def test_size_distributions_and_bursts(self):
+        """Testa Zipf truncado, bimodal e chegadas em rajadas"""
+        zipf = WorkloadGenerator(seed=1, size_distribution="zipf").generate_all(5_000)
+        assert all(size % 64 == 0 and size <= 4096 for size in zipf.sizes)
+        assert zipf.sizes.count(64) > zipf.sizes.count(128) > zipf.sizes.count(4096)
+
+        bimodal = WorkloadGenerator(seed=1, size_distribution="bimodal")
+        sizes = bimodal.generate_all(5_000).sizes
+        assert set(sizes) == {64, 65536}
+        assert 0.85 < sizes.count(64) / len(sizes) < 0.95
+
+        burst = WorkloadGenerator(
+            seed=1, arrival_pattern="burst", burst_on_ns=100_000, burst_off_ns=900_000
+        )
+        arrivals = burst.generate_all(1_000).arrival_ns
+        # Nenhuma chegada nas fases desligadas (tolerância de arredondamento)
+        assert all(arrival % 1_000_000 <= 100_001 for arrival in arrivals)
+
+    def test_feeds_controllers_in_chunks(self):
+        """Testa alimentação dos controladores e simulação com semente"""
+        generator = WorkloadGenerator(seed=9, arrival_pattern="constant")
+        report = replay_bus(generator.generate(500, chunk_size=128))
+        assert report["records"] == 500
+        assert report["simulation_time"] > 0
+
+        first = BusController(2, clock=SimulationClock()).simulate_arbitration(
+            100, seed=3
+        )
+        second = BusController(2, clock=SimulationClock()).simulate_arbitration(
+            100, seed=3
+        )
+        assert first["wait_time_ns"] == second["wait_time_ns"]
+        assert first["simulation_time"] == second["simulation_time"]
+
+
+class TestWorkloadTrace:
+    """Testes para a gravação e reprodução de traces"""
+
+    def _write_trace(self, path, count=10):
+        with TraceWriter(str(path), chunk_records=3) as writer:
+            for i in range(count):
+                writer.write(
+                    i * 1_000, i % 3, BusPriority(i % 4), 64 * (i + 1), i * 256, 0x8000
+                )
+        return str(path)
+
+    def test_round_trip_across_chunks(self, tmp_path):
+        """Testa gravação e leitura em blocos menores que o trace"""
+        path = self._write_trace(tmp_path / "trace.bin")
+        records = list(read_trace(path, chunk_records=4))
+
+        assert len(records) == 10
+        assert records[0] == TraceRecord(0, 0, 0x8000, 0, 64, 0)
+        assert records[9].timestamp_ns == 9_000
+        assert records[9].priority == BusPriority.MEDIUM.value
+        assert os.path.getsize(path) == 16 + 36 * 10
+
+    def test_rejects_invalid_files(self, tmp_path):
+        """Testa arquivos com assinatura inválida ou registro truncado"""
+        path = self._write_trace(tmp_path / "trace.bin", count=2)
+        with open(path, "ab") as trace_file:
+            trace_file.write(b"\x00" * 5)
+        with pytest.raises(TraceFormatError):
+            list(read_trace(path))
+
+        bogus = tmp_path / "bogus.bin"
+        bogus.write_bytes(b"NOTATRACE" * 4)
+        with pytest.raises(TraceFormatError):
+            list(read_trace(str(bogus)))
+
+    def test_replay_is_deterministic(self, tmp_path):
+        """Testa que duas reproduções do mesmo trace produzem o mesmo resultado"""
+        path = self._write_trace(tmp_path / "trace.bin", count=200)
+
+        first = BusController(1, clock=SimulationClock())
+        second = BusController(1, clock=SimulationClock())
+        report = replay_bus(path, first)
+        replay_bus(path, second)
+
+        assert report["records"] == 200
+        assert first.clock.now == second.clock.now
+        assert first.get_latency_snapshot() == second.get_latency_snapshot()
+        assert first.get_bus_status()["granted_requests"] == 200
+        assert len(first.active_transfers) == 0
+
+    def test_replay_dma_counts_rejections(self, tmp_path):
+        """Testa reprodução no DMA com registros fora da memória simulada"""
+        path = self._write_trace(tmp_path / "trace.bin", count=10)
+        memory = PhysicalMemory(0x8000 + 400)
+        dma = DMAController(2, clock=SimulationClock(), memory=memory)
+        dma.initialize()
+
+        report = replay_dma(path, dma)
+        assert report["records"] == 10
+        # Só os registros de até 400 bytes cabem a partir do destino 0x8000
+        assert report["rejected"] == 4
+        assert dma.transfers_completed == 6
+        assert report["bytes"] == 64 * (1 + 2 + 3 + 4 + 5 + 6)
+
+        with pytest.raises(ValueError):
+            replay_dma(path, DMAController(2))
+
+
 # Testes de integração
+class TestParameterSweep:
+    """Testes para a varredura de parâmetros com cache em disco"""
+
+    def test_cache_only_computes_new_points(self, tmp_path):
+        """Testa que acrescentar um valor ao eixo só calcula os pontos novos"""
+        from parameter_sweep import run_sweep
+
+        grid = {"max_concurrent": [1, 2], "requests": [50]}
+        first = run_sweep("bus", grid, seed=3, cache_dir=str(tmp_path))
+        assert (first["computed"], first["cached"]) == (2, 0)
+
+        grid["max_concurrent"].append(4)
+        second = run_sweep("bus", grid, seed=3, cache_dir=str(tmp_path))
+        assert (second["computed"], second["cached"]) == (1, 2)
+        assert [p["cached"] for p in second["points"]] == [True, True, False]
+        assert second["points"][0]["result"] == first["points"][0]["result"]
+
+        reseeded = run_sweep("bus", grid, seed=4, cache_dir=str(tmp_path))
+        assert reseeded["computed"] == 3
+
+    def test_pool_matches_sequential(self):
+        """Testa que o pool produz os mesmos resultados da execução local"""
+        from parameter_sweep import run_sweep
+
+        grid = {"num_channels": [1, 4], "burst_length": [None, 8]}
+        sequential = run_sweep("dma", grid, cache_dir=None, max_workers=0)
+        parallel = run_sweep("dma", grid, cache_dir=None, max_workers=2)
+
+        def strip(report):
+            return [
+                {k: v for k, v in p["result"].items() if k != "wall_time"}
+                for p in report["points"]
+            ]
+
+        assert strip(sequential) == strip(parallel)
+        results = [p["result"] for p in sequential["points"]]
+        # Pontos na ordem dos eixos: (sem burst, 1), (sem burst, 4), (8, 1), (8, 4)
+        assert results[1]["bytes_per_second"] > results[0]["bytes_per_second"]
+        assert results[0]["bytes_per_second"] > results[2]["bytes_per_second"]
+        assert all(r["transfers_completed"] == 100 for r in results)
+
+    def test_grid_expansion_and_parsing(self):
+        """Testa a expansão da grade e a leitura dos eixos da linha de comando"""
+        from parameter_sweep import expand_grid, parse_grid, point_key
+
+        grid = parse_grid(["max_concurrent=1,2", "policy=priority,round_robin"])
+        assert grid["max_concurrent"] == [1, 2]
+        points = expand_grid("bus", grid)
+        assert len(points) == 4
+        assert all(point["requests"] == 1000 for point in points)
+        assert point_key("bus", points[0], 1) == point_key("bus", dict(points[0]), 1)
+        assert point_key("bus", points[0], 1) != point_key("bus", points[0], 2)
+        with pytest.raises(ValueError):
+            expand_grid("bus", {"num_channels": [1]})
+
+
+class TestShardedSimulation:
+    """Testes para a simulação particionada em vários barramentos"""
+
+    def test_pool_matches_sequential_and_merges(self):
+        """Testa que o pool produz o mesmo resumo que a execução sequencial"""
+        from sharded_simulation import run_sharded
+
+        sequential = run_sharded(3, 200, max_workers=0, seed=7)
+        parallel = run_sharded(3, 200, max_workers=2, seed=7)
+
+        assert sequential["bus"] == parallel["bus"]
+        assert sequential["dma"] == parallel["dma"]
+        assert sequential["bus"]["total_requests"] == 600
+        assert sequential["bus"]["granted_requests"] == 600
+        assert sequential["dma"]["transfers_completed"] == 600
+        waits = sequential["wait_histograms"].values()
+        assert sum(histogram.count for histogram in waits) == 600
+
+    def test_merge_combines_shard_results(self):
+        """Testa a mesclagem de contadores, histogramas e tempo simulado"""
+        from sharded_simulation import merge_shard_results, run_shard
+
+        params = {
+            "requests": 50,
+            "seed": 1,
+            "max_concurrent": 2,
+            "channels": 2,
+            "policy": "round_robin",
+            "sizes": "uniform",
+            "arrival": "constant",
+            "interval_ns": 1_000,
+            "requesters": 8,
+        }
+        results = [run_shard(shard, 2, params) for shard in range(2)]
+        summary = merge_shard_results(results)
+
+        assert summary["shards"] == 2
+        assert summary["bus"]["total_requests"] == 100
+        assert summary["dma"]["bytes_transferred"] == sum(
+            result["dma"]["bytes_transferred"] for result in results
+        )
+        assert summary["simulation_time"] == max(
+            result["simulation_time"] for result in results
+        )
+        merged_max = max(h.max for h in summary["hold_histograms"].values())
+        assert merged_max == max(
+            h.max for result in results for h in result["hold_histograms"].values()
+        )
+
+
+class TestAsmRunner:
+    """Testes para o executor paralelo dos binários Assembly"""
+
+    SAMPLE = (
+        "ASMPipe + DMA System inicializado\n"
+        "Transferência DMA iniciada no cana0\n"
+        "Transferência DMA completBarramento concedido ao canal 1\n"
+        "Teste E/S Programada: 3072 ciclos\n"
+        "Teste DMA: 2048 ciclos\n"
+        "Comparação de PerformancDMA é mais eficiente!\n"
+        "Conflito de barramento detectadoArbitragem de barramento em progres"
+    ).encode("utf-8")
+
+    def test_parser_handles_split_chunks(self):
+        """Testa a interpretação da saída entregue em blocos arbitrários"""
+        from asm_runner import OutputParser
+
+        parser = OutputParser()
+        for offset in range(0, len(self.SAMPLE), 7):  # Corta no meio do UTF-8
+            parser.feed(self.SAMPLE[offset : offset + 7])
+        parser.close()
+        result = parser.result("asmpipe_dma", 0, 1000)
+
+        assert result.events["transfers_started"] == 1
+        assert result.events["transfers_completed"] == 1
+        assert result.events["bus_grants"] == 1
+        assert result.events["bus_conflicts"] == 1
+        assert result.events["arbitrations"] == 1
+        assert result.pio_cycles == 3072
+        assert result.dma_cycles == 2048
+        assert result.winner == "dma"
+        assert result.output_bytes == len(self.SAMPLE)
+
+    def test_missing_numbers_are_none(self):
+        """Testa linhas de ciclos sem o número impresso"""
+        from asm_runner import OutputParser
+
+        parser = OutputParser()
+        parser.feed("Teste E/S Programada: ciclos\nTeste DMA:  ciclos\n".encode())
+        result = parser.result("asmpipe_dma", 0, 0)
+        assert result.pio_cycles is None and result.dma_cycles is None
+
+    def test_missing_binaries_are_skipped(self, monkeypatch, tmp_path):
+        """Testa que binários ausentes são ignorados sem falhar"""
+        import asm_runner
+
+        monkeypatch.setitem(asm_runner.BINARIES, "asmpipe", str(tmp_path / "x"))
+        report = asm_runner.run_many(3, ["asmpipe"])
+        assert report["skipped"] == ["asmpipe"]
+        assert report["binaries"] == {}
+
+    def test_runs_binaries_in_parallel(self):
+        """Testa execuções reais agregadas por binário (se compilados)"""
+        from asm_runner import available_binaries, run_many
+
+        if "asmpipe_dma" not in available_binaries():
+            pytest.skip("bin/asmpipe_dma não compilado")
+        report = run_many(20, ["asmpipe_dma"], max_workers=4)
+        summary = report["binaries"]["asmpipe_dma"]
+
+        assert summary["runs"] == 20
+        assert summary["failures"] == 0
+        assert summary["wall_time_ns"]["count"] == 20
+        assert summary["events"]["transfers_completed"] > 0
+        assert summary["winners"] == {"dma": 20}
+
+
 class TestIntegration:
     """Testes de integração entre módulos"""
 
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerador de Carga Sintética - Simulações de Arbitragem
+Sorteia lotes inteiros de prioridades, tamanhos e intervalos de chegada com
+semente fixa, alimentando os controladores em blocos reproduzíveis
+"""
+
+import argparse
+import bisect
+import itertools
+import math
+import random
+import sys
+import time
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele usa random.Random
+    np = None
+
+SIZE_DISTRIBUTIONS = ("uniform", "zipf", "bimodal")
+ARRIVAL_PATTERNS = ("constant", "poisson", "burst")
+
+# Prioridades na mesma ordem de BusPriority (LOW=0 ... CRITICAL=3)
+NUM_PRIORITIES = 4
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class WorkloadChunk(NamedTuple):
+    """Um bloco de solicitações geradas (colunas de mesmo comprimento)"""
+
+    arrival_ns: List[int]
+    requester_ids: List[int]
+    priorities: List[int]
+    sizes: List[int]
+
+    def __len__(self) -> int:
+        return len(self.arrival_ns)
+
+    def records(self) -> Iterator[tuple]:
+        """Registros no formato do trace (timestamp, origem, destino, ...)"""
+        return zip(
+            self.arrival_ns,
+            itertools.repeat(0),
+            itertools.repeat(0),
+            self.requester_ids,
+            self.sizes,
+            self.priorities,
+        )
+
+
+class WorkloadGenerator:
+    """Gerador de solicitações sintéticas com semente fixa
+
+    Cada chamada de generate() produz blocos de colunas sorteadas de uma só
+    vez: com NumPy por um `numpy.random.Generator`, sem ele por métodos em
+    lote de `random.Random`. A mesma semente e os mesmos parâmetros geram
+    sempre a mesma sequência no mesmo backend.
+
+    Tamanhos:
+        uniform - inteiros entre min_size e max_size
+        zipf    - múltiplos de min_size com rank ~ Zipf(zipf_exponent),
+                  truncado em max_size
+        bimodal - small_size com probabilidade small_fraction, senão
+                  large_size
+
+    Chegadas:
+        constant - intervalo fixo de mean_interval_ns
+        poisson  - intervalos exponenciais com média mean_interval_ns
+        burst    - chegadas de Poisson durante burst_on_ns, seguidas de
+                   burst_off_ns sem chegadas
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        size_distribution: str = "uniform",
+        arrival_pattern: str = "poisson",
+        mean_interval_ns: float = 10_000,
+        min_size: int = 64,
+        max_size: int = 4096,
+        zipf_exponent: float = 1.2,
+        small_size: int = 64,
+        large_size: int = 65536,
+        small_fraction: float = 0.9,
+        burst_on_ns: float = 1_000_000,
+        burst_off_ns: float = 4_000_000,
+        num_requesters: int = 64,
+        priority_weights: Optional[Sequence[float]] = None,
+        use_numpy: Optional[bool] = None,
+    ):
+        if size_distribution not in SIZE_DISTRIBUTIONS:
+            raise ValueError(
+                f"Distribuição de tamanhos desconhecida: {size_distribution}"
+            )
+        if arrival_pattern not in ARRIVAL_PATTERNS:
+            raise ValueError(f"Padrão de chegada desconhecido: {arrival_pattern}")
+        if not 0 < min_size <= max_size:
+            raise ValueError("Faixa de tamanhos inválida")
+        if use_numpy and np is None:
+            raise ImportError("NumPy não está instalado")
+
+        self.seed = seed
+        self.size_distribution = size_distribution
+        self.arrival_pattern = arrival_pattern
+        self.mean_interval_ns = mean_interval_ns
+        self.min_size = min_size
+        self.max_size = max_size
+        self.small_size = small_size
+        self.large_size = large_size
+        self.small_fraction = small_fraction
+        self.burst_on_ns = burst_on_ns
+        self.burst_off_ns = burst_off_ns
+        self.num_requesters = num_requesters
+        weights = priority_weights or [1.0] * NUM_PRIORITIES
+        total = float(sum(weights))
+        self.priority_weights = [weight / total for weight in weights]
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+
+        # Zipf truncado: ranks 1..K com peso rank**-s (CDF para busca binária)
+        ranks = max_size // min_size
+        zipf_weights = [rank**-zipf_exponent for rank in range(1, ranks + 1)]
+        zipf_total = sum(zipf_weights)
+        self._zipf_probabilities = [weight / zipf_total for weight in zipf_weights]
+        self._zipf_cdf = list(itertools.accumulate(self._zipf_probabilities))
+        self._priority_cdf = list(itertools.accumulate(self.priority_weights))
+        self.reset()
+
+    def reset(self):
+        """Reinicia a sequência a partir da semente"""
+        if self.use_numpy:
+            self._rng = np.random.default_rng(self.seed)
+        else:
+            self._rng = random.Random(self.seed)
+        self._elapsed_ns = 0.0  # Tempo acumulado (apenas fases ativas)
+
+    def mean_size(self) -> float:
+        """Tamanho médio esperado da distribuição configurada"""
+        if self.size_distribution == "uniform":
+            return (self.min_size + self.max_size) / 2
+        if self.size_distribution == "zipf":
+            return self.min_size * math.fsum(
+                (rank + 1) * probability
+                for rank, probability in enumerate(self._zipf_probabilities)
+            )
+        return (
+            self.small_fraction * self.small_size
+            + (1 - self.small_fraction) * self.large_size
+        )
+
+    def generate(
+        self, count: int, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[WorkloadChunk]:
+        """Gera `count` solicitações em blocos de até `chunk_size`"""
+        draw = self._draw_numpy if self.use_numpy else self._draw_python
+        while count > 0:
+            size = min(chunk_size, count)
+            yield draw(size)
+            count -= size
+
+    def generate_all(self, count: int) -> WorkloadChunk:
+        """Gera `count` solicitações em um único bloco"""
+        return next(self.generate(count, max(count, 1)), WorkloadChunk([], [], [], []))
+
+    def _arrivals(self, elapsed: List[float]) -> List[int]:
+        """Converte o tempo ativo acumulado em instantes de chegada"""
+        if self.arrival_pattern != "burst":
+            return [round(value) for value in elapsed]
+        on, off = self.burst_on_ns, self.burst_off_ns
+        return [round(value + (value // on) * off) for value in elapsed]
+
+    def _draw_python(self, count: int) -> WorkloadChunk:
+        rng = self._rng
+        random_values = rng.random
+
+        priorities = rng.choices(
+            range(NUM_PRIORITIES), cum_weights=self._priority_cdf, k=count
+        )
+        requester_count = self.num_requesters
+        requesters = [int(random_values() * requester_count) for _ in range(count)]
+
+        if self.size_distribution == "uniform":
+            low, span = self.min_size, self.max_size - self.min_size + 1
+            sizes = [low + int(random_values() * span) for _ in range(count)]
+        elif self.size_distribution == "zipf":
+            cdf, last = self._zipf_cdf, len(self._zipf_cdf) - 1
+            low = self.min_size
+            sizes = [
+                low * (min(bisect.bisect_left(cdf, random_values()), last) + 1)
+                for _ in range(count)
+            ]
+        else:
+            small, large = self.small_size, self.large_size
+            fraction = self.small_fraction
+            sizes = [
+                small if random_values() < fraction else large for _ in range(count)
+            ]
+
+        if self.arrival_pattern == "constant":
+            gaps = itertools.repeat(self.mean_interval_ns, count)
+        else:
+            rate = 1.0 / self.mean_interval_ns
+            gaps = [rng.expovariate(rate) for _ in range(count)]
+        # A primeira chegada ocorre um intervalo após o fim do bloco anterior
+        elapsed = list(itertools.accumulate(gaps, initial=self._elapsed_ns))
+        del elapsed[0]
+        self._elapsed_ns = elapsed[-1]
+
+        return WorkloadChunk(self._arrivals(elapsed), requesters, priorities, sizes)
+
+    def _draw_numpy(self, count: int) -> WorkloadChunk:
+        rng = self._rng
+
+        priorities = rng.choice(NUM_PRIORITIES, size=count, p=self.priority_weights)
+        requesters = rng.integers(0, self.num_requesters, size=count)
+
+        if self.size_distribution == "uniform":
+            sizes = rng.integers(self.min_size, self.max_size + 1, size=count)
+        elif self.size_distribution == "zipf":
+            ranks = rng.choice(
+                len(self._zipf_probabilities), size=count, p=self._zipf_probabilities
+            )
+            sizes = (ranks + 1) * self.min_size
+        else:
+            sizes = np.where(
+                rng.random(count) < self.small_fraction,
+                self.small_size,
+                self.large_size,
+            )
+
+        if self.arrival_pattern == "constant":
+            gaps = np.full(count, float(self.mean_interval_ns))
+        else:
+            gaps = rng.exponential(self.mean_interval_ns, size=count)
+        elapsed = self._elapsed_ns + np.cumsum(gaps)
+        self._elapsed_ns = float(elapsed[-1])
+        if self.arrival_pattern == "burst":
+            elapsed = elapsed + np.floor(elapsed / self.burst_on_ns) * self.burst_off_ns
+
+        return WorkloadChunk(
+            np.rint(elapsed).astype(np.int64).tolist(),
+            requesters.tolist(),
+            priorities.tolist(),
+            sizes.tolist(),
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interface de linha de comando: gera um trace ou reproduz direto"""
+    parser = argparse.ArgumentParser(description="Gerador de carga sintética")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sizes", choices=SIZE_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--arrival", choices=ARRIVAL_PATTERNS, default="poisson")
+    parser.add_argument("--interval-ns", type=float, default=10_000)
+    parser.add_argument("--output", help="grava a carga em um arquivo de trace")
+    parser.add_argument("--replay", choices=("bus", "dma"), help="reproduz a carga")
+    args = parser.parse_args(argv)
+
+    from workload_trace import TraceWriter, replay_bus, replay_dma
+
+    generator = WorkloadGenerator(
+        args.seed,
+        size_distribution=args.sizes,
+        arrival_pattern=args.arrival,
+        mean_interval_ns=args.interval_ns,
+    )
+    backend = "NumPy" if generator.use_numpy else "random"
+
+    if args.output:
+        start = time.perf_counter()
+        with TraceWriter(args.output) as writer:
+            for chunk in generator.generate(args.count):
+                writer.write_many(chunk.records())
+        elapsed = time.perf_counter() - start
+        print(f"{args.count:,} solicitações gravadas em {elapsed:.2f} s ({backend})")
+        generator.reset()
+
+    if args.replay:
+        replay = replay_bus if args.replay == "bus" else replay_dma
+        report = replay(generator.generate(args.count))
+        print(f"Tempo simulado: {report['simulation_time']:.6f} s")
+        print(f"Vazão da reprodução: {report['records_per_second']:,.0f} registros/s")
+    elif not args.output:
+        start = time.perf_counter()
+        total = sum(len(chunk) for chunk in generator.generate(args.count))
+        elapsed = time.perf_counter() - start
+        print(f"{total:,} solicitações geradas em {elapsed:.2f} s ({backend})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())